@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""Benchmark of the solving of filters with arguments on long lists, for final filters.
+
+Compares, for some queries using filters with arguments on a list of dates of growing lengths,
+the time needed to solve the parsed resource with ``Registry.solve_resource``, where the
+arguments of the filters are computed for each entry, and the same for the frozen resource
+(see ``dataql.resources.freeze``), whose filters are final so their arguments are computed once.
+
+Run ``./benchmarks/call_args.py --help`` to see usage.
+
+"""
+
+import argparse
+from datetime import date, timedelta
+import os
+import sys
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataql.parsers import DataQLParser  # pylint: disable=wrong-import-position
+from dataql.resources import freeze  # pylint: disable=wrong-import-position
+from dataql.solvers.registry import EntryPoints, Registry  # pylint: disable=wrong-import-position
+
+
+QUERIES = [
+    'dates[strftime("%x")]',
+    'dates[replace(year=2000, month=1).strftime("%x")]',
+    'dates[{a: strftime("%x"), b: strftime("%F"), c: isoformat()}]',
+]
+
+
+def measure(func, repeat_count):
+    """Return the best time, in milliseconds, for one call of ``func``."""
+    return min(repeat(func, number=1, repeat=repeat_count)) * 1e3
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-l', '--lengths', type=int, nargs='+', default=[1000, 10000],
+                        help='Lengths of the list of dates (default: 1000 10000)')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='Number of measures, the best one is kept (default: 5)')
+    args = parser.parse_args()
+
+    registry = Registry()
+    registry.register(date, ['strftime', 'replace', 'isoformat'])
+
+    print('%-8s %-12s %-12s  %s' % ('length', 'parsed', 'frozen', 'query'))
+    for length in args.lengths:
+        entry_points = EntryPoints(registry, dates=[
+            date(2015, 1, 1) + timedelta(days=index) for index in range(length)
+        ])
+        for query in QUERIES:
+            resource = DataQLParser(query).data
+            frozen = freeze(resource)
+            print('%-8d %9.2fms %9.2fms  %s' % (
+                length,
+                measure(lambda: registry.solve_resource(entry_points, resource), args.repeat),
+                measure(lambda: registry.solve_resource(entry_points, frozen), args.repeat),
+                query,
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""Benchmark of the building of resources from dicts, compared to parsing.
+
+Compares, for some queries, the time needed to get the resources by parsing the query with
+``DataQLParser`` and with ``DescentDataQLParser``, and by building them from the JSON version
+of the query, including the call to ``json.loads``.
+
+Run ``./benchmarks/dicts.py --help`` to see usage.
+
+"""
+
+import argparse
+import json
+import os
+import sys
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataql.parsers import (  # pylint: disable=wrong-import-position
+    DataQLParser,
+    DescentDataQLParser,
+)
+from dataql.serializers import from_dict, to_dict  # pylint: disable=wrong-import-position
+
+
+QUERIES = [
+    'foo {bar, baz}',
+    'foo[bar, baz.qux(1, a=2, b=$b)]',
+    'User.get("Elon Musk") {name, birthday.strftime("%x"), '
+    'companies[{name, year:created_year.add(-1, 2.5)}], first:companies.0.name, '
+    'last:companies[-2:].name}',
+]
+
+
+def measure(func, number, repeat_count):
+    """Return the best time, in microseconds, for one call of ``func``."""
+    return min(repeat(func, number=number, repeat=repeat_count)) / number * 1e6
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-n', '--number', type=int, default=200,
+                        help='Number of builds of each query for one measure (default: 200)')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='Number of measures, the best one is kept (default: 5)')
+    args = parser.parse_args()
+
+    grammar_parser, descent_parser = DataQLParser(), DescentDataQLParser()
+
+    print('%-12s %-12s %-12s  %s' % ('grammar', 'descent', 'json', 'query'))
+    for query in QUERIES:
+        text = json.dumps(to_dict(grammar_parser.parse(query)))
+        print('%9.1fus %9.1fus %9.1fus  %s' % (
+            measure(lambda: grammar_parser.parse(query), args.number, args.repeat),
+            measure(lambda: descent_parser.parse(query), args.number, args.repeat),
+            measure(lambda: from_dict(json.loads(text)), args.number, args.repeat),
+            query,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""Benchmark of the memory kept by parsed queries, with and without interning.
+
+Parses a set of generated queries sharing a lot of filters (like queries of a real application
+all asking for the same fields of the same objects) and keeps the resources trees, as a
+``ParseCache`` or a ``PersistedQueries`` would do, then compares the memory they use, with and
+without a ``dataql.resources.Interner``, and the time needed.
+
+The memory is measured with ``tracemalloc``, so it's the memory allocated by python objects.
+
+Run ``./benchmarks/interning.py --help`` to see usage.
+
+"""
+
+import argparse
+import os
+import sys
+from time import perf_counter
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataql.parsers import DataQLParser  # pylint: disable=wrong-import-position
+from dataql.resources import Interner  # pylint: disable=wrong-import-position
+
+
+def make_queries(nb_queries):
+    """Return ``nb_queries`` different queries sharing most of their filters."""
+    return [
+        'user.get(id=$id) {id, name, email.lower(), created.strftime("%%Y-%%m-%%d"), '
+        'friends[:10] {id, name, avatar.url(size=64)}, q%d}' % index
+        for index in range(nb_queries)
+    ]
+
+
+def measure(queries, interner):
+    """Return the memory, in MB, kept by the parsed queries, and the time, in ms, to get them."""
+    parser = DataQLParser()
+    parser.parse('foo')  # Compile the grammar before measuring.
+    tracemalloc.start()
+    start = perf_counter()
+    resources = []
+    for query in queries:
+        resource = parser.parse(query)
+        if interner is not None:
+            interner.intern(resource)
+        resources.append(resource)
+    duration = perf_counter() - start
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return current / 1e6, duration * 1e3
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-n', '--numbers', type=int, nargs='+', default=[100, 1000, 5000],
+                        help='Numbers of queries (default: 100 1000 5000)')
+    args = parser.parse_args()
+
+    print('%-8s %-20s %-20s' % ('queries', 'plain', 'interned'))
+    for number in args.numbers:
+        queries = make_queries(number)
+        print('%-8d' % number + ''.join(
+            ' %6.2fMB %8.1fms  ' % measure(queries, interner)
+            for interner in (None, Interner())
+        ))
+
+
+if __name__ == '__main__':
+    main()
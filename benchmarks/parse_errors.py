@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""Benchmark of the latency of the parser when the query is invalid.
+
+Compares, for some invalid queries, the time needed by ``DataQLParser`` to raise its
+``ParserError``, with the time it needed when the query was parsed a second time with
+``DebugDataQLParser`` to get a better error (simulated here by parsing with both parsers),
+and with the time needed to parse similar valid queries.
+
+Run ``./benchmarks/parse_errors.py --help`` to see usage.
+
+"""
+
+import argparse
+import os
+import sys
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataql.parsers.exceptions import ParserError  # pylint: disable=wrong-import-position
+from dataql.parsers.generic import (  # pylint: disable=wrong-import-position
+    DataQLParser,
+    DebugDataQLParser,
+)
+
+
+QUERIES = [
+    # (valid query, invalid query)
+    ('foo {bar, baz}', 'foo {bar::baz}'),
+    ('foo[bar, baz.qux(1, a=2)]', 'foo[bar, baz.qux(1, a=2)'),
+    (
+        'User.get("Elon Musk") {name, companies[{name, year:created_year}], first:companies.0}',
+        'User.get("Elon Musk") {name, companies[{name, year:created_year}], first:companies.0',
+    ),
+]
+
+
+def parse(parser_class, query):
+    """Parse the query with the given parser class, ignoring any ``ParserError``."""
+    try:
+        parser_class(query)
+    except ParserError:
+        pass
+
+
+def parse_then_debug(query):
+    """Parse the query, then again with ``DebugDataQLParser``, like it was done before."""
+    parse(DataQLParser, query)
+    parse(DebugDataQLParser, query)
+
+
+def measure(func, number, repeat_count):
+    """Return the best time, in microseconds, for one call of ``func``."""
+    return min(repeat(func, number=number, repeat=repeat_count)) / number * 1e6
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-n', '--number', type=int, default=200,
+                        help='Number of parsing of each query for one measure (default: 200)')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='Number of measures, the best one is kept (default: 5)')
+    args = parser.parse_args()
+
+    # Compile the grammars before measuring.
+    parse_then_debug('foo')
+
+    print('%-12s %-12s %-12s  %s' % ('valid', 'invalid', 're-parse', 'query'))
+    for valid, invalid in QUERIES:
+        print('%9.1fus %9.1fus %9.1fus  %s' % (
+            measure(lambda: parse(DataQLParser, valid), args.number, args.repeat),
+            measure(lambda: parse(DataQLParser, invalid), args.number, args.repeat),
+            measure(lambda: parse_then_debug(invalid), args.number, args.repeat),
+            invalid,
+        ))
+
+
+if __name__ == '__main__':
+    main()
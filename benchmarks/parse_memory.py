@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""Benchmark of the peak memory used to parse queries, depending of their size.
+
+Compares, for generated queries of growing sizes, the peak of memory allocated while parsing
+them with ``DataQLParser`` using the different sizes of packrat cache (see
+``BaseParser.packrat_cache_size``), and the time needed. ``DescentDataQLParser``, which uses no
+packrat cache nor parse tree, is included for reference.
+
+The peak is measured with ``tracemalloc``, so it's the memory allocated by python objects,
+which is what makes the RSS of the process grow.
+
+Run ``./benchmarks/parse_memory.py --help`` to see usage.
+
+"""
+
+import argparse
+import os
+import sys
+from time import perf_counter
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataql.parsers import (  # pylint: disable=wrong-import-position
+    DataQLParser,
+    DescentDataQLParser,
+)
+
+
+def make_query(nb_resources):
+    """Return a query with ``nb_resources`` resources in its root object."""
+    return 'root {%s}' % ', '.join(
+        'f%d: foo.bar(%d, "x%d", a=$v) [{x, y.z[1:2]}]' % (index, index, index)
+        for index in range(nb_resources)
+    )
+
+
+def measure(parser, query):
+    """Return the peak of allocated memory, in MB, and the time, in ms, to parse the query."""
+    tracemalloc.start()
+    start = perf_counter()
+    parser.parse(query)
+    duration = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6, duration * 1e3
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-s', '--sizes', type=int, nargs='+', default=[10, 50, 200, 500],
+                        help='Numbers of resources of the queries (default: 10 50 200 500)')
+    args = parser.parse_args()
+
+    parsers = [('descent', DescentDataQLParser())] + [
+        ('cache=%s' % size, type('Parser', (DataQLParser, ), {'packrat_cache_size': size})())
+        for size in (None, 1000, 100, 0)
+    ]
+    for _, instance in parsers:
+        # Compile the grammars before measuring.
+        instance.parse('foo')
+
+    print(('%-8s' % 'length' + ''.join(' %-20s' % name for name, _ in parsers)).rstrip())
+    for size in args.sizes:
+        query = make_query(size)
+        print(('%-8d' % len(query) + ''.join(
+            ' %6.1fMB %8.1fms  ' % measure(instance, query) for _, instance in parsers
+        )).rstrip())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""Benchmark of the solving of resources on long lists, with and without compiled plans.
+
+Compares, for some queries on a list of dates of growing lengths, the time needed to solve
+the parsed resource with ``Registry.solve_resource``, and with a plan returned by
+``Registry.compile`` (compiled once, outside of the measure).
+
+Run ``./benchmarks/solve.py --help`` to see usage.
+
+"""
+
+import argparse
+from datetime import date, timedelta
+import os
+import sys
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataql.parsers import DataQLParser  # pylint: disable=wrong-import-position
+from dataql.solvers.registry import EntryPoints, Registry  # pylint: disable=wrong-import-position
+
+
+QUERIES = [
+    'dates[day]',
+    'dates[strftime("%x")]',
+    'dates[{day, month, year, date:strftime("%x")}]',
+]
+
+
+def measure(func, repeat_count):
+    """Return the best time, in milliseconds, for one call of ``func``."""
+    return min(repeat(func, number=1, repeat=repeat_count)) * 1e3
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-l', '--lengths', type=int, nargs='+', default=[1000, 10000],
+                        help='Lengths of the list of dates (default: 1000 10000)')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='Number of measures, the best one is kept (default: 5)')
+    args = parser.parse_args()
+
+    registry = Registry()
+    registry.register(date, ['day', 'month', 'year', 'strftime'])
+
+    print('%-8s %-12s %-12s  %s' % ('length', 'solve', 'plan', 'query'))
+    for length in args.lengths:
+        entry_points = EntryPoints(registry, dates=[
+            date(2015, 1, 1) + timedelta(days=index) for index in range(length)
+        ])
+        for query in QUERIES:
+            resource = DataQLParser(query).data
+            plan = registry.compile(resource)
+            print('%-8d %9.2fms %9.2fms  %s' % (
+                length,
+                measure(lambda: registry.solve_resource(entry_points, resource), args.repeat),
+                measure(lambda: plan.solve(entry_points), args.repeat),
+                query,
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""Benchmark of the parsing of string literals, with worst-case inputs.
+
+For each kind of literal of the corpus, parses queries with literals of growing lengths with
+``DataQLParser`` and ``DescentDataQLParser``, and prints the time by thousand characters of
+literal, which must stay the same when the length grows: the time is linear in the length.
+
+Invalid literals (unterminated ones) are included: the time to fail must be linear too.
+
+Run ``./benchmarks/string_literals.py --help`` to see usage.
+
+"""
+
+import argparse
+import os
+import sys
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataql.parsers import (  # pylint: disable=wrong-import-position
+    DataQLParser,
+    DescentDataQLParser,
+)
+from dataql.parsers.exceptions import ParserError  # pylint: disable=wrong-import-position
+
+
+CORPUS = [
+    # (name, function returning a literal of about the given length)
+    ('plain', lambda length: '"%s"' % ('a' * length)),
+    ('other quotes', lambda length: '"%s"' % ("'" * length)),
+    ('escaped chars', lambda length: '"%s"' % ('\\a' * (length // 2))),
+    ('escaped quotes', lambda length: '"%s"' % ('\\"' * (length // 2))),
+    ('backslashes', lambda length: '"%s"' % ('\\\\' * (length // 2))),
+    ('mixed', lambda length: '"%s"' % ('ab\\"c\\\\d\'' * (length // 10))),
+    ('unterminated', lambda length: '"%s' % ('a' * length)),
+    ('unterminated escapes', lambda length: '"%s' % ('\\"' * (length // 2))),
+    ('only backslashes', lambda length: '"%s' % ('\\' * length)),
+]
+
+
+def parse(parser, query):
+    """Parse the query with the given parser, ignoring any ``ParserError``."""
+    try:
+        parser.parse(query)
+    except ParserError:
+        pass
+
+
+def measure(func, number, repeat_count):
+    """Return the best time, in seconds, for one call of ``func``."""
+    return min(repeat(func, number=number, repeat=repeat_count)) / number
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-l', '--lengths', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Lengths of the literals (default: 1000 10000 100000)')
+    parser.add_argument('-n', '--number', type=int, default=5,
+                        help='Number of parsing of each query for one measure (default: 5)')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help='Number of measures, the best one is kept (default: 3)')
+    args = parser.parse_args()
+
+    parsers = [('grammar', DataQLParser()), ('descent', DescentDataQLParser())]
+
+    print('Time by thousand characters of literal, in microseconds')
+    print('%-22s %-8s' % ('literal', 'parser') + ''.join(
+        ' %10s' % length for length in args.lengths))
+    for name, make_literal in CORPUS:
+        for parser_name, instance in parsers:
+            times = []
+            for length in args.lengths:
+                query = 'foo(%s)' % make_literal(length)
+                times.append(
+                    measure(lambda: parse(instance, query), args.number, args.repeat)
+                    / length * 1e9
+                )
+            print('%-22s %-8s' % (name, parser_name) + ''.join(' %10.1f' % t for t in times))
+
+
+if __name__ == '__main__':
+    main()
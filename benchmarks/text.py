@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""Benchmark of the rendering of resources trees as text, with ``repr`` and ``to_text``.
+
+Compares, for generated resources trees of growing depths, the time needed to render them
+with ``repr``, whose indentation walks the chain of parents of each resource, and
+with ``dataql.serializers.to_text``, which takes a time linear in the size of the tree.
+
+Run ``./benchmarks/text.py --help`` to see usage.
+
+"""
+
+import argparse
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataql.resources import (  # pylint: disable=wrong-import-position
+    Field,
+    Filter,
+    NamedArg,
+    Object,
+    PosArg,
+    SliceFilter,
+)
+from dataql.serializers import to_text  # pylint: disable=wrong-import-position
+
+
+def make_resource(depth):
+    """Return a tree with objects nested ``depth`` times, each one with some fields.
+
+    It's the tree for ``a.b(1, c="d") {x, y.z[1:], a.b(1, c="d") {x, y.z[1:], ... e}}``.
+
+    """
+    resource = Field('e')
+    for _ in range(depth):
+        resource = Object('a', filters=[
+            Filter('a'),
+            Filter('b', args=[PosArg(1), NamedArg('c', '=', 'd')]),
+        ], resources=[
+            Field('x'),
+            Field('y', filters=[Filter('y'), Filter('z'), SliceFilter(slice(1, None, None))]),
+            resource,
+        ])
+    resource.is_root = True
+    return resource
+
+
+def measure(function, resource, number):
+    """Return the mean time, in ms, to call the function with the resource, as text."""
+    start = perf_counter()
+    try:
+        for _ in range(number):
+            function(resource)
+    except RecursionError:
+        return '%12s' % 'recursion'
+    return '%10.3fms' % ((perf_counter() - start) / number * 1e3)
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-d', '--depths', type=int, nargs='+', default=[10, 50, 100, 150, 1000],
+                        help='Depths of the trees (default: 10 50 100 150 1000)')
+    parser.add_argument('-n', '--number', type=int, default=20,
+                        help='Number of renderings of each tree (default: 20)')
+    args = parser.parse_args()
+
+    print('%-8s %12s %12s' % ('depth', 'repr', 'to_text'))
+    for depth in args.depths:
+        resource = make_resource(depth)
+        print('%-8d %s %s' % (
+            depth,
+            measure(repr, resource, args.number),
+            measure(to_text, resource, args.number),
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,18 @@
 It provides quick access to its parsers:
 
 - DataQLParser: generic parser
+- DescentDataQLParser: same as ``DataQLParser``, but using a faster hand-written parser
+
+And to some tools around them:
+
+- ParseCache: LRU cache of parsed queries
+- PersistedQueries: store of queries parsed in advance, by id
+- RuleProfiler: statistics about the time spent in each rule of the grammar of a parser
 
 """
 
+from dataql.parsers.cache import ParseCache
+from dataql.parsers.descent import DescentDataQLParser
 from dataql.parsers.generic import DataQLParser
+from dataql.parsers.persisted import PersistedQueries
+from dataql.parsers.profiling import RuleProfiler
@@ -12,12 +12,67 @@ from inspect import isfunction
 import re
 import sys
 
-from parsimonious import Grammar, NodeVisitor
-from parsimonious.exceptions import ParseError, UndefinedLabel, VisitationError
+from parsimonious import NodeVisitor
+from parsimonious.exceptions import (
+    IncompleteParseError,
+    ParseError,
+    UndefinedLabel,
+    VisitationError,
+)
 from parsimonious.nodes import RuleDecoratorMeta as BaseRuleDecoratorMeta
 
 from dataql import resources
-from dataql.parsers.exceptions import ParserError
+from dataql.parsers.cache import GrammarCache, compile_grammar, new_packrat_cache
+from dataql.parsers.exceptions import (
+    LiteralTooLong,
+    ParserError,
+    QueryTooLong,
+    TrackingParseError,
+)
+
+
+# Regex matching a quoted string (with single or double quotes), allowing escaped characters (a
+# backslash followed by any character, including quotes) inside. It's an "unrolled loop": at any
+# position, only one part of the regex can match, so it never backtracks more than once on each
+# character, and the time to match a string, or to fail on an unterminated one, is linear in its
+# length. To be compiled with ``re.DOTALL`` (the ``s`` flag in the grammar).
+STR_PATTERN = r'"[^"\\]*(?:\\.[^"\\]*)*"' r"|'[^'\\]*(?:\\.[^'\\]*)*'"
+
+# Regex matching a number, an int or a float, with or without scientific notation. Written so
+# that each digit can only be matched by one part of the regex, so the time to match a number,
+# or to fail on something looking like one, is linear in its length.
+NB_PATTERN = r'[-+]?(?:\d+(?:\.\d+)?|\.\d+)(?:[eE][-+]?\d+)?'
+
+# Regex matching an escaped character in a string matched by ``STR_PATTERN``.
+ESCAPED_CHAR_RE = re.compile(r'\\(.)', re.DOTALL)
+
+
+def unescape(text):
+    """Remove the backslashes used to escape characters in the content of a string.
+
+    Arguments
+    ---------
+    text : str
+        The content of a string matched by ``STR_PATTERN``, without the surrounding quotes.
+
+    Returns
+    -------
+    str
+        The text with each backslash followed by a character replaced by this character.
+
+    Example
+    -------
+
+    >>> unescape('foo')
+    'foo'
+    >>> print(unescape(r'foo \\"bar\\" \\\\ \\\\\\\\ \\n'))
+    foo "bar" \ \\ n
+
+    """
+
+    if '\\' not in text:
+        return text
+    return ESCAPED_CHAR_RE.sub(r'\1', text)
 
 
 def rule(rule_string):
@@ -35,6 +90,64 @@ def rule(rule_string):
     return decorator
 
 
+class LazyGrammar:
+    """Descriptor to compile the grammar of a parser class only when used for the first time.
+
+    Most parser classes are only mixins used to compose the final parsers, so their grammars are
+    never used to parse anything. With this descriptor, they are never compiled.
+
+    On first access, ``parsimonious`` is asked to convert the grammar string in a real ``Grammar``
+    object (or it is read from the on-disk cache if activated), and the result replaces the
+    descriptor on the class, so next accesses cost nothing.
+
+    Attributes
+    ----------
+    grammar_str : str
+        The text of the grammar to compile.
+    default_rule : str
+        The name of the default rule of the grammar. If not set, it will be the first one.
+    grammar_cache : .cache.GrammarCache, optional
+        The on-disk cache of grammars to use, if any.
+
+    Example
+    -------
+
+    >>> class Parser:
+    ...     grammar = LazyGrammar('foo = "foo" / bar\\nbar = "bar"', 'bar')
+    >>> isinstance(Parser.__dict__['grammar'], LazyGrammar)
+    True
+    >>> Parser.grammar.default_rule.name
+    'bar'
+    >>> Parser.__dict__['grammar'] is Parser().grammar
+    True
+
+    """
+
+    __slots__ = (
+        'grammar_str',
+        'default_rule',
+        'grammar_cache',
+    )
+
+    def __init__(self, grammar_str, default_rule=None, grammar_cache=None):
+        """Save attributes. See the definition of the attributes on the class."""
+
+        self.grammar_str = grammar_str
+        self.default_rule = default_rule
+        self.grammar_cache = grammar_cache
+
+    def __get__(self, instance, owner):
+        """Compile the grammar, and save it on the class to replace the descriptor."""
+
+        if self.grammar_cache is None:
+            grammar = compile_grammar(self.grammar_str, self.default_rule)
+        else:
+            grammar = self.grammar_cache.get(self.grammar_str, self.default_rule)
+
+        setattr(owner, 'grammar', grammar)
+        return grammar
+
+
 class RuleDecoratorMeta(BaseRuleDecoratorMeta, ABCMeta):
     """Metaclass to use the @rule decorator.
 
@@ -55,6 +168,10 @@ class RuleDecoratorMeta(BaseRuleDecoratorMeta, ABCMeta):
 
     """
 
+    # On-disk cache of compiled grammars, activated by setting the directory to use in the
+    # ``DATAQL_GRAMMAR_CACHE_DIR`` environment variable. See ``.cache.GrammarCache``.
+    grammar_cache = GrammarCache.from_env()
+
     # Regex to split rules in key/value parts.
     grammar_simple_parser = re.compile(r'^\s*([a-zA-Z_][a-zA-Z_0-9]*)\s+=')
     # Regex to detect rules that are just a synonym to another one composed of only an identifier.
@@ -95,9 +212,6 @@ class RuleDecoratorMeta(BaseRuleDecoratorMeta, ABCMeta):
         # Make one big grammar string.
         grammar_str = '\n'.join(grammar_parts)
 
-        # And ask parsimonious to convert it in a real ``Grammar`` object.
-        namespace['grammar'] = Grammar(grammar_str)
-
         # Get the ``default_rule`` defined in our class, or find one from parents.
         default_rule = namespace.get('default_rule')
         if not default_rule:
@@ -106,9 +220,8 @@ class RuleDecoratorMeta(BaseRuleDecoratorMeta, ABCMeta):
                 if default_rule:
                     break
 
-        if default_rule:
-            # Defining a default rule change the Grammar (immutable, so we get a new one).
-            namespace['grammar'] = namespace['grammar'].default(default_rule)
+        # The real ``Grammar`` object will only be created when used for the first time.
+        namespace['grammar'] = LazyGrammar(grammar_str, default_rule, mcs.grammar_cache)
 
         # Recreate the whole ``grammar_str`` to be inherited by future subclasses.
         # We cannot rely on str(namespace['grammar']) because r'' strings are not managed correctly
@@ -121,7 +234,19 @@ class RuleDecoratorMeta(BaseRuleDecoratorMeta, ABCMeta):
 
         # We don't want to exec the __new__ method of our super class, ie BaseRuleDecoratorMeta
         # because we just rewrite everything it does.
-        return super().__new__(mcs, name, bases, namespace)
+        cls = super().__new__(mcs, name, bases, namespace)
+
+        # Map each rule to its "visit_%s" method, using the lower case version of the rule, to
+        # avoid looking for the method for each node to visit.
+        cls.visitors = {}
+        # Grammars with another default rule, created on demand (see ``BaseParser.get_grammar``).
+        cls.default_grammars = {}
+        for rule_name in grammar_dict:
+            method = getattr(cls, 'visit_%s' % rule_name.lower(), None)
+            if isfunction(method):
+                cls.visitors[rule_name] = method
+
+        return cls
 
 
 class BaseParser(NodeVisitor, metaclass=RuleDecoratorMeta):
@@ -145,16 +270,18 @@ class BaseParser(NodeVisitor, metaclass=RuleDecoratorMeta):
         - COL_OR_EQ   => Rule to assume that colon and equal sign are synonyms
         - IDENT       => An identifier (a valid python one)
         - OPER        => An operator (currently only "=" or ":")
-        - VALUE       => A value (string, number, null, false or true)
+        - VALUE       => A value (string, number, null, false, true or variable)
         - STR         => A string
         - NB          => A number (int, float, with or without scientific notation)
         - OPTIONAL_NB => An optional number (see "NB"). None if not set.
         - NULL        => A ``None`` identifier ("null", "nil", "none", case insensitive)
         - FALSE       => A ``False`` identifier ("false" case insensitive)
         - TRUE        => A ``True`` identifier ("true" case insensitive)
+        - VARIABLE    => A variable: an identifier prefixed by "$"
 
     This base parser also provides a ``__init__`` methods that will take some text and parse it
-    automatically, storing the resulting resource in the ``data`` attribute.
+    automatically, storing the resulting resource in the ``data`` attribute. Or, without text, a
+    parser can be created once and its ``parse`` method used to parse many texts.
 
     Attributes
     ----------
@@ -162,8 +289,15 @@ class BaseParser(NodeVisitor, metaclass=RuleDecoratorMeta):
         Simple rules that don't need any function.
     grammar : Grammar
         Instance of the ``parsimonious.Grammar`` class that holds the compiled grammar.
+        Only compiled when used for the first time (see ``LazyGrammar``).
     grammar_str : str
         String representation of the ``grammar`.
+    visitors : dict
+        The ``visit_*`` method (function) for each rule name of the grammar having one.
+    default_grammars : dict
+        The grammars of the class with another default rule, by rule name. See ``get_grammar``.
+    data : any
+        The result of the parsing of the text given when creating the parser. ``None`` if no text.
     Field : class (class attribute)
         The class to use as a ``Field`` resource. Default to ``dataql.resources.Field``.
     Object : class (class attribute)
@@ -180,6 +314,23 @@ class BaseParser(NodeVisitor, metaclass=RuleDecoratorMeta):
     PosArg : class (class attribute)
         The class to use as a ``PosArg`` (positioned argument). Default to
         ``dataql.resources.PosArg``.
+    Variable : class (class attribute)
+        The class to use as a ``Variable``. Default to ``dataql.resources.Variable``.
+    backend : class (class attribute)
+        An optional class to use instead of the grammar to parse a text with the default rule,
+        like ``dataql.parsers.descent.DescentBackend``. Default to ``None``, to always use
+        the grammar.
+    packrat_cache_size : int (class attribute)
+        The maximum number of matches memoized by ``parsimonious`` while parsing a text with the
+        grammar. Default to ``None`` to keep all of them, so memory grows with the length of the
+        text times the number of rules. ``0`` to keep none, or a number to keep only the last
+        ones, to bound the memory used to parse large texts. See ``new_packrat_cache``.
+    max_query_length : int (class attribute)
+        If set, ``parse`` refuses texts longer than this, raising ``QueryTooLong``. Default to
+        ``None``, for no limit.
+    max_literal_length : int (class attribute)
+        If set, ``parse`` refuses texts with strings longer than this (quotes excluded), raising
+        ``LiteralTooLong``. Default to ``None``, for no limit.
 
 
     Notes
@@ -230,16 +381,30 @@ class BaseParser(NodeVisitor, metaclass=RuleDecoratorMeta):
     SliceFilter = resources.SliceFilter
     NamedArg = resources.NamedArg
     PosArg = resources.PosArg
+    Variable = resources.Variable
+
+    backend = None
+
+    packrat_cache_size = None
+
+    max_query_length = None
+    max_literal_length = None
+
+    # Regex to find strings in the text (see ``visit_str``), for ``max_literal_length``.
+    literal_re = re.compile(STR_PATTERN, re.DOTALL)
 
-    def __init__(self, text, default_rule=None):
-        """Init the parser with some text to parse, and parse it.
+    def __init__(self, text=None, default_rule=None):
+        """Init the parser, and parse the text if given.
 
         The resource resulting in the parsing will be stored in the ``data`` attribute.
 
+        Without text, the parser can be kept to parse many texts, with the ``parse`` method. It
+        can be used this way by many threads at the same time.
+
         Arguments
         ---------
-        text : str
-            The text to parse.
+        text : str, optional
+            The text to parse. If not set, ``data`` is ``None``.
         default_rule : str, optional
             A default rule to use to override the default one.
 
@@ -250,6 +415,12 @@ class BaseParser(NodeVisitor, metaclass=RuleDecoratorMeta):
         >>> parser.data
         'foo'
 
+        >>> parser = BaseParser(default_rule='IDENT')
+        >>> parser.data is None
+        True
+        >>> parser.parse('foo'), parser.parse('bar')
+        ('foo', 'bar')
+
         Raises
         ------
         ParserError
@@ -257,32 +428,296 @@ class BaseParser(NodeVisitor, metaclass=RuleDecoratorMeta):
 
         """
 
-        # If we want another default rule, it will create a new grammar object.
+        # If we want another default rule, use the grammar with this default rule.
         if default_rule:
-            self.grammar = self.grammar.default(default_rule)
+            self.grammar = self.get_grammar(default_rule)
+
+        # The backend only knows how to parse the default rule of the class.
+        self.use_backend = self.backend is not None and not default_rule
 
         # Parse the text and save the resource in the ``data`` attribute.
+        self.data = None if text is None else self.parse(text)
+
+    @classmethod
+    def get_grammar(cls, default_rule=None):
+        """Return the grammar of the class, with the given default rule.
+
+        Each grammar is created only once by class and default rule.
+
+        Arguments
+        ---------
+        default_rule : str, optional
+            The name of the default rule of the grammar. If not set, the grammar of the class is
+            returned, with its default rule.
+
+        Returns
+        -------
+        parsimonious.Grammar
+            The grammar with the given default rule.
+
+        Example
+        -------
+
+        >>> grammar = BaseParser.get_grammar('IDENT')
+        >>> grammar.default_rule.name
+        'IDENT'
+        >>> BaseParser.get_grammar('IDENT') is grammar
+        True
+        >>> BaseParser.get_grammar() is BaseParser.grammar
+        True
+
+        """
+
+        if not default_rule:
+            return cls.grammar
+
         try:
-            self.data = self.parse(text)
+            return cls.default_grammars[default_rule]
+        except KeyError:
+            # Defining a default rule change the Grammar (immutable, so we get a new one).
+            return cls.default_grammars.setdefault(default_rule, cls.grammar.default(default_rule))
+
+    def parse(self, text, pos=0):
+        """Parse the text and return the result (a resource for the ``ROOT`` rule).
+
+        It uses the backend of the parser, if any and if the default rule was not changed, or
+        the grammar (see ``parse_with_grammar``).
+
+        It doesn't change the parser, so it can be called by many threads at the same time.
+
+        Arguments
+        ---------
+        text : str
+            The text to parse.
+        pos : int, optional
+            The position in the text where to start the parsing. Not supported by backends: the
+            grammar is used if set.
+
+        Returns
+        -------
+        (depends on the rule)
+            The result of the parsing.
+
+        Raises
+        ------
+        ParserError
+            When the parser originally raised a ``parsimonious.exceptions.ParseError`` exception.
+        LimitExceeded
+            When the text goes over a limit of the parser (see ``check_limits``).
+
+        Example
+        -------
+
+        >>> parser = BaseParser(default_rule='NB')
+        >>> parser.parse('1'), parser.parse('2.5')
+        (1, 2.5)
+        >>> parser.parse('foo') # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql.parsers.exceptions.ParserError: Problem with parsing at line 1, column 1...
+
+        """
+
+        self.check_limits(text)
+
+        try:
+            if self.use_backend and not pos:
+                return self.backend(self).parse(text)
+            return self.parse_with_grammar(text, pos)
         except ParseError as ex:
             # Raise our own exception with a more user friendly message
             raise ParserError(ex)
 
+    def check_limits(self, text):
+        """Check that the text doesn't go over the limits of the parser, before parsing it.
+
+        The checks are only done for the limits that are set, so they cost nearly nothing when
+        no limit is set.
+
+        Arguments
+        ---------
+        text : str
+            The text to check.
+
+        Raises
+        ------
+        dataql.parsers.exceptions.QueryTooLong
+            If the text is longer than ``max_query_length``.
+        dataql.parsers.exceptions.LiteralTooLong
+            If a string in the text is longer than ``max_literal_length``.
+
+        Example
+        -------
+
+        >>> class Parser(BaseParser):
+        ...     max_query_length = 10
+        ...     max_literal_length = 3
+        >>> parser = Parser(default_rule='STR')
+        >>> parser.parse('"foo"')
+        'foo'
+        >>> parser.parse('"foo bar baz"') # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql...QueryTooLong: Limit exceeded at line 1, column 11: length of 13 is over the...
+        >>> parser.parse('"foobar"') # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql...LiteralTooLong: ...line 1, column 1: literal length of 6 is over the limit of 3
+
+        """
+
+        self.check_query_length(text)
+
+        if self.max_literal_length is not None:
+            for match in self.literal_re.finditer(text):
+                self.check_literal_length(text, match)
+
+    def check_query_length(self, text):
+        """Raise ``QueryTooLong`` if the text is longer than ``max_query_length``."""
+        if self.max_query_length is not None and len(text) > self.max_query_length:
+            raise QueryTooLong(text, self.max_query_length, len(text), self.max_query_length)
+
+    def check_literal_length(self, text, match):
+        """Raise ``LiteralTooLong`` if the string matched is longer than ``max_literal_length``."""
+        length = match.end() - match.start() - 2
+        if length > self.max_literal_length:
+            raise LiteralTooLong(text, match.start(), length, self.max_literal_length)
+
+    def parse_with_grammar(self, text, pos=0):
+        """Parse the text with the grammar, and return the result of the visit of the tree.
+
+        Override the original method to raise a more precise error when the text cannot be
+        parsed: the furthest position where a rule failed, with the names of the rules expected
+        there (see ``.exceptions.TrackingParseError``), all in the same pass.
+
+        Without this, when the default rule matches only the start of the text, parsimonious
+        raises an ``IncompleteParseError`` at the end of what was matched, losing any
+        information about why the parsing couldn't go further.
+
+        Arguments
+        ---------
+        text : str
+            The text to parse.
+        pos : int, optional
+            The position in the text where to start the parsing.
+
+        Returns
+        -------
+        (depends on the rule)
+            The result of the visit of the parsed tree.
+
+        Raises
+        ------
+        parsimonious.exceptions.ParseError
+            If the text cannot be parsed. It will be a ``TrackingParseError`` in most cases, or an
+            ``IncompleteParseError`` if nothing failed after the end of the matched text.
+
+        Example
+        -------
+
+        >>> parser = BaseParser(default_rule='DOT')
+        >>> parser.parse_with_grammar('  .  ')
+        >>> parser.parse_with_grammar('!') # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql.parsers.exceptions.TrackingParseError: Rule 'DOT' didn't match at '!' (line 1, ...
+        >>> parser.parse_with_grammar(' .  !') # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        parsimonious.exceptions.IncompleteParseError: Rule 'DOT' matched in its entirety, ...
+
+        The memory used to memoize the matches can be bounded (see ``packrat_cache_size``):
+
+        >>> class Parser(BaseParser):
+        ...     packrat_cache_size = 0
+        >>> Parser(default_rule='VALUE').parse_with_grammar('"foo"')
+        'foo'
+
+        """
+
+        expression = self.grammar.default_rule
+        error = TrackingParseError(text)
+        node = expression.match_core(text, pos, new_packrat_cache(self.packrat_cache_size), error)
+
+        if node is None:
+            raise error
+
+        if node.end < len(text):
+            if error.pos >= node.end:
+                # Something failed after what was matched: it's the reason why the parsing
+                # stopped here, so it's a more precise error than ``IncompleteParseError``.
+                raise error
+            raise IncompleteParseError(text, node.end, expression)
+
+        return self.visit(node)
+
     def visit(self, node):
-        """Rewrite original method to use lower-case method, and not "generic" function."""
+        """Rewrite original method to use lower-case method, and not "generic" function.
 
-        try:
-            # Get the "visit_%s" method, using the lower case version of the rule.
-            method = getattr(self, 'visit_%s' % node.expr_name.lower())
-        except AttributeError:
+        Nodes are visited using an explicit stack instead of recursive calls, to allow deeply
+        nested queries without hitting the recursion limit. As with the original ``visit``, the
+        children of a node are visited before it, and exceptions raised by a ``visit_*`` method
+        are wrapped in a ``VisitationError`` with the node it failed on.
+
+        Nodes without ``visit_*`` method are not visited, nor are their children: ``None`` is used
+        as the result for them. Methods are found in the ``visitors`` class attribute.
+
+        Example
+        -------
+
+        >>> from parsimonious.nodes import Node
+        >>> class Parser(BaseParser):
+        ...     @rule('"foo" / "fail"')
+        ...     def visit_nested(self, node, children):
+        ...         if node.text == 'fail':
+        ...             raise ValueError('Invalid text')
+        ...         return (children[0] + 1) if children else 1
+        >>> depth = sys.getrecursionlimit() * 2
+        >>> node = Node('NESTED', 'foo', 0, 3)
+        >>> for __ in range(depth - 1):
+        ...     node = Node('NESTED', 'foo', 0, 3, children=[node, Node('NOOP', 'foo', 0, 0)])
+        >>> Parser.visitors['NESTED'] is Parser.visit_nested, 'NOOP' in Parser.visitors
+        (True, False)
+        >>> parser = Parser('foo', default_rule='IDENT')
+        >>> parser.visit(node) == depth
+        True
+        >>> parser.visit(Node('NESTED', 'fail', 0, 4, children=[
+        ...     Node('NESTED', 'fail', 0, 4)
+        ... ])) # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        parsimonious.exceptions.VisitationError: ValueError: Invalid text
+        ...
+
+        """
+
+        visitors = self.visitors
+
+        method = visitors.get(node.expr_name)
+        if method is None:
             # If the method is not defined, we do nothing for this node.
-            return
+            return None
 
-        # Below is untouched code from the original ``visit`` method.
+        # Each entry is a node being visited, with its method, an iterator on its children and
+        # the list of results of the children already visited.
+        stack = [(node, method, iter(node), [])]
 
-        # Call that method, and show where in the tree it failed if it blows up.
         try:
-            return method(node, [self.visit(n) for n in node])
+            while True:
+                node, method, children, results = stack[-1]
+
+                for child in children:
+                    child_method = visitors.get(child.expr_name)
+                    if child_method is None:
+                        results.append(None)
+                    else:
+                        # Visit this child before continuing with the next ones.
+                        stack.append((child, child_method, iter(child), []))
+                        break
+
+                else:
+                    # All children visited, we can call the method for the node.
+                    stack.pop()
+                    result = method(self, node, results)
+                    if not stack:
+                        return result
+                    stack[-1][3].append(result)
+
+        # Below is the same exceptions management as the original ``visit`` method.
         except (VisitationError, UndefinedLabel):
             # Don't catch and re-wrap already-wrapped exceptions.
             raise
@@ -368,9 +803,9 @@ class BaseParser(NodeVisitor, metaclass=RuleDecoratorMeta):
             oper = '='
         return oper
 
-    @rule('STR / NB / NULL / FALSE / TRUE')
+    @rule('STR / NB / NULL / FALSE / TRUE / VARIABLE')
     def visit_value(self, _, children):
-        """Return a value, which is a string, a number, a null/false/true like value.
+        """Return a value, which is a string, a number, a null/false/true like value, or a variable.
 
         Arguments
         ---------
@@ -380,7 +815,7 @@ class BaseParser(NodeVisitor, metaclass=RuleDecoratorMeta):
 
         Result
         ------
-        str or int or float or None or False or True
+        str or int or float or None or False or True or .resources.Variable
 
         Example
         -------
@@ -397,12 +832,14 @@ class BaseParser(NodeVisitor, metaclass=RuleDecoratorMeta):
         False
         >>> BaseParser('true', default_rule='VALUE').data
         True
+        >>> BaseParser('$foo', default_rule='VALUE').data
+        $foo
 
         """
 
         return children[0]
 
-    @rule(r'~"([\'\"])(?:[^\\1\\\\]|\\\\.)*?\\1"')
+    @rule('~"%s"s' % STR_PATTERN.replace('\\', '\\\\').replace('"', '\\"'))
     def visit_str(self, node, _):
         """Regex rule for quoted string allowing escaped quotes inside.
 
@@ -429,23 +866,26 @@ class BaseParser(NodeVisitor, metaclass=RuleDecoratorMeta):
         "foo b'ar"
         >>> BaseParser(r"'foo b\\'ar'", default_rule='STR').data
         "foo b'ar"
+        >>> print(BaseParser(r"'foo \\\\ \\\\\\\\ b\\ar'", default_rule='STR').data)
+        foo \ \\ bar
+        >>> BaseParser('"foo\x01\\\nbar"', default_rule='STR').data
+        'foo\x01\nbar'
 
         Notes
         -----
 
-        The regex works this way:
+        The regex (see ``STR_PATTERN``) works this way:
             Two quotes (single or double, the starting one and the ending one should be the same)
             surrounding zero or more of "any character that's not a quote (same as the
             starting/ending ones) or a backslash" or "a backslash followed by any character".
+            It is written so that the time to match is linear in the length of the string.
 
         """
 
-        # remove surrounding quotes and remove single backslashes
-        return self.visit_str.re_single_backslash.sub('', node.text[1:-1])
-    # regex  to unquote single quote characters
-    visit_str.re_single_backslash = re.compile(r'(?<!\\)\\')
+        # remove surrounding quotes and the backslashes escaping characters
+        return unescape(node.text[1:-1])
 
-    @rule(r'~"[-+]?\d*\.?\d+([eE][-+]?\d+)?"')
+    @rule('~"%s"' % NB_PATTERN)
     def visit_nb(self, node, _):
         """Return a int of float from the given number.
 
@@ -602,6 +1042,35 @@ class BaseParser(NodeVisitor, metaclass=RuleDecoratorMeta):
 
         return True
 
+    @rule('"$" IDENT')
+    def visit_variable(self, _, children):
+        """Return a variable, to be replaced by its value when solving.
+
+        Arguments
+        ---------
+        _ (node) : parsimonious.nodes.Node.
+        children : list
+            - 0: for ``"$"``: ``None``.
+            - 1: for ``IDENT``: the name of the variable.
+
+        Returns
+        -------
+        .resources.Variable
+            Instance of ``.resources.Variable``.
+
+        Example
+        -------
+
+        >>> BaseParser('$foo', default_rule='VARIABLE').data
+        $foo
+        >>> BaseParser('$ foo', default_rule='VARIABLE').data # doctest: +IGNORE_EXCEPTION_DETAIL
+        Traceback (most recent call last):
+        dataql.parsers.exceptions.ParserError:
+
+        """
+
+        return self.Variable(children[1])
+
     @staticmethod
     def convert_nb(text):
         """Tries to convert the given the given text as a number.
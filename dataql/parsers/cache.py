@@ -0,0 +1,565 @@
+"""``cache`` module of ``dataql.parsers``.
+
+It provides the ``ParseCache`` class, a bounded cache of resources parsed from query texts, to
+avoid parsing the same queries again and again.
+
+It also provides the ``GrammarCache`` class, an on-disk cache of compiled grammars, to avoid
+compiling the grammars of all the parsers each time a process starts.
+
+And it provides the "packrat" caches used while matching a text with a grammar, to bound the
+memory used to parse large queries (see ``new_packrat_cache``).
+
+"""
+
+from collections import OrderedDict
+from hashlib import sha256
+import os
+import pickle
+import sys
+from tempfile import NamedTemporaryFile
+from threading import Lock
+
+import parsimonious
+from parsimonious import Grammar
+
+from dataql.resources import Resource
+
+
+class ParseCache:
+    """A bounded and thread-safe LRU cache of resources trees, keyed by query text.
+
+    On a miss, the query is parsed by the parser class given at creation time, and the
+    resulting resource is stored. On a hit, the stored resource is returned as is, without
+    any parsing. When the cache is full, the least recently used entry is discarded.
+
+    Queries that fail to parse are not cached: the ``ParserError`` is simply raised.
+
+    Attributes
+    ----------
+    parser_class : class
+        The parser class (subclass of ``BaseParser``) used to parse queries not in the cache.
+    maxsize : int or None
+        The maximum number of entries to keep. ``None`` means "no limit".
+    hits : int
+        Number of calls to ``parse`` that were answered from the cache.
+    misses : int
+        Number of calls to ``parse`` that needed a real parsing.
+    interner : dataql.resources.Interner or None
+        If set, the resources parsed are interned with it, to share their equal filters and
+        arguments.
+
+    Notes
+    -----
+    The same resource instance is returned for every hit, so it may be shared by many requests
+    (and threads): it must not be altered by the code using it. Solvers never alter resources.
+
+    Example
+    -------
+
+    >>> from dataql.parsers import DataQLParser
+    >>> cache = ParseCache(DataQLParser, maxsize=2)
+    >>> cache
+    <ParseCache DataQLParser (0/2, hits=0, misses=0)>
+    >>> resource = cache.parse('foo {bar}')
+    >>> resource
+    <Object[foo]>
+      <Field[bar] />
+    </Object[foo]>
+    >>> cache.parse('foo {bar}') is resource
+    True
+    >>> cache.hits, cache.misses
+    (1, 1)
+    >>> cache.parse('baz') is cache.parse('baz')
+    True
+    >>> cache.parse('qux')
+    <Field[qux] />
+    >>> len(cache)  # ``foo {bar}`` was discarded
+    2
+    >>> 'foo {bar}' in cache, 'baz' in cache, 'qux' in cache
+    (False, True, True)
+    >>> cache
+    <ParseCache DataQLParser (2/2, hits=2, misses=3)>
+    >>> cache.clear()
+    >>> len(cache), cache.hits, cache.misses
+    (0, 0, 0)
+
+    """
+
+    def __init__(self, parser_class, maxsize=128, interner=None):
+        """Create an empty cache.
+
+        Arguments
+        ---------
+        parser_class : class
+            The parser class (subclass of ``BaseParser``) to use to parse queries.
+        maxsize : int or None, default ``128``
+            The maximum number of entries to keep. ``None`` means "no limit".
+        interner : dataql.resources.Interner, optional
+            If set, the resources parsed are interned with it. See ``dataql.resources.Interner``.
+
+        Raises
+        ------
+        ValueError
+            If ``maxsize`` is negative.
+
+        Example
+        -------
+
+        >>> from dataql.parsers import DataQLParser
+        >>> from dataql.resources import Interner
+        >>> cache = ParseCache(DataQLParser, interner=Interner())
+        >>> first = cache.parse('foo {date.strftime("%x")}')
+        >>> second = cache.parse('bar {date.strftime("%x")}')
+        >>> first.resources[0].filters[1] is second.resources[0].filters[1]
+        True
+
+        >>> ParseCache(DataQLParser, maxsize=0).parse('foo')
+        <Field[foo] />
+        >>> ParseCache(DataQLParser, maxsize=-1)
+        Traceback (most recent call last):
+        ValueError: maxsize must be None or a positive or zero integer, not -1
+
+        """
+
+        if maxsize is not None and maxsize < 0:
+            raise ValueError('maxsize must be None or a positive or zero integer, not %r' % maxsize)
+
+        self.parser_class = parser_class
+        self.maxsize = maxsize
+        self.interner = interner
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        # One reusable parser by default rule.
+        self._parsers = {}
+
+    def __repr__(self):
+        """String representation of a ``ParseCache`` instance.
+
+        Returns
+        -------
+        str
+            The string representation of the current ``ParseCache`` instance.
+
+        Example
+        -------
+
+        >>> from dataql.parsers import DataQLParser
+        >>> ParseCache(DataQLParser, maxsize=None)
+        <ParseCache DataQLParser (0/-, hits=0, misses=0)>
+
+        """
+
+        return '<%s %s (%s/%s, hits=%s, misses=%s)>' % (
+            self.__class__.__name__,
+            self.parser_class.__name__,
+            len(self),
+            '-' if self.maxsize is None else self.maxsize,
+            self.hits,
+            self.misses,
+        )
+
+    def __len__(self):
+        """Return the number of entries actually in the cache."""
+
+        return len(self._entries)
+
+    def __contains__(self, text):
+        """Tells if the given text, parsed with the default rule, is in the cache."""
+
+        return (text, None) in self._entries
+
+    def parse(self, text, default_rule=None):
+        """Return the resource for the given text, parsing it only if not in the cache.
+
+        Arguments
+        ---------
+        text : str
+            The query to parse.
+        default_rule : str, optional
+            A default rule to use to override the default one of the parser.
+
+        Returns
+        -------
+        (depends on the rule, a ``Resource`` for the default rule of ``DataQLParser``)
+            The result of the parsing, maybe from the cache.
+
+        Raises
+        ------
+        dataql.parsers.exceptions.ParserError
+            If the text was not in the cache and could not be parsed.
+
+        Example
+        -------
+
+        >>> from dataql.parsers import DataQLParser
+        >>> cache = ParseCache(DataQLParser)
+        >>> cache.parse('foo', default_rule='IDENT')
+        'foo'
+        >>> 'foo' in cache
+        False
+        >>> cache.parse('foo {') # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql.parsers.exceptions.ParserError: ...
+        >>> len(cache), cache.misses
+        (1, 2)
+
+        """
+
+        key = (text, default_rule)
+
+        with self._lock:
+            try:
+                result = self._entries[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+
+        try:
+            parser = self._parsers[default_rule]
+        except KeyError:
+            parser = self._parsers.setdefault(default_rule, self.parser_class(None, default_rule))
+
+        # Parse outside of the lock to not block other threads during the parsing.
+        result = parser.parse(text)
+        if self.interner is not None and isinstance(result, Resource):
+            self.interner.intern(result)
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+        return result
+
+    def clear(self):
+        """Remove all entries from the cache and reset the ``hits`` and ``misses`` counters."""
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class GrammarCache:
+    """An on-disk cache of compiled ``parsimonious`` grammars, keyed by the grammar text.
+
+    Each grammar is stored in its own pickle file, named by a hash of the grammar text, the
+    default rule, and the versions of python and parsimonious. So a grammar is compiled again
+    only if one of them changes. Stale files are never deleted: the directory can be removed at
+    any time to clean it.
+
+    Errors while reading or writing the files are ignored: the grammar is simply compiled.
+
+    Attributes
+    ----------
+    directory : str
+        The path of the directory where to store the compiled grammars. It is created if needed.
+    env_var : str (class attribute)
+        The name of the environment variable to use to activate the cache used by the parsers.
+        See ``from_env``.
+
+    Notes
+    -----
+    Files are loaded with ``pickle``, so the directory must only be writable by trusted users.
+
+    Example
+    -------
+
+    >>> from tempfile import TemporaryDirectory
+    >>> with TemporaryDirectory() as directory:
+    ...     cache = GrammarCache(directory)
+    ...     grammar = cache.get('foo = "foo" / bar\\nbar = "bar"', 'bar')
+    ...     print(len(os.listdir(directory)))
+    ...     grammar_again = cache.get('foo = "foo" / bar\\nbar = "bar"', 'bar')
+    1
+    >>> grammar_again is grammar
+    False
+    >>> grammar_again.default_rule.name, grammar_again.parse('bar').text
+    ('bar', 'bar')
+
+    """
+
+    env_var = 'DATAQL_GRAMMAR_CACHE_DIR'
+
+    def __init__(self, directory):
+        """Save the directory where to store the compiled grammars.
+
+        Arguments
+        ---------
+        directory : str
+            The path of the directory where to store the compiled grammars.
+
+        """
+
+        self.directory = directory
+
+    def __repr__(self):
+        """String representation of a ``GrammarCache`` instance.
+
+        Returns
+        -------
+        str
+            The string representation of the current ``GrammarCache`` instance.
+
+        Example
+        -------
+
+        >>> GrammarCache('/tmp/dataql')
+        <GrammarCache /tmp/dataql>
+
+        """
+
+        return '<%s %s>' % (self.__class__.__name__, self.directory)
+
+    @classmethod
+    def from_env(cls):
+        """Return a cache using the directory defined in the environment, if any.
+
+        Returns
+        -------
+        GrammarCache or None
+            A ``GrammarCache`` instance if the environment variable named by ``env_var`` is
+            set and not empty, or ``None``.
+
+        Example
+        -------
+
+        >>> os.environ[GrammarCache.env_var] = '/tmp/dataql'
+        >>> GrammarCache.from_env()
+        <GrammarCache /tmp/dataql>
+        >>> os.environ[GrammarCache.env_var] = ''
+        >>> GrammarCache.from_env() is None
+        True
+        >>> del os.environ[GrammarCache.env_var]
+
+        """
+
+        directory = os.environ.get(cls.env_var)
+        if not directory:
+            return None
+        return cls(directory)
+
+    @staticmethod
+    def get_key(grammar_str, default_rule=None):
+        """Compute the key used to identify a compiled grammar.
+
+        Arguments
+        ---------
+        grammar_str : str
+            The text of the grammar.
+        default_rule : str, optional
+            The name of the default rule of the grammar.
+
+        Returns
+        -------
+        str
+            An hexadecimal hash, changing with the grammar, the default rule, and the versions
+            of python and parsimonious (based on the last modification of its files).
+
+        Example
+        -------
+
+        >>> key = GrammarCache.get_key('foo = "foo"')
+        >>> len(key)
+        64
+        >>> key == GrammarCache.get_key('foo = "foo"')
+        True
+        >>> key == GrammarCache.get_key('foo = "foo"', 'foo')
+        False
+
+        """
+
+        try:
+            parsimonious_version = str(os.stat(parsimonious.__file__).st_mtime)
+        except OSError:
+            parsimonious_version = ''
+
+        return sha256('\0'.join((
+            sys.version,
+            getattr(parsimonious, '__version__', parsimonious_version),
+            default_rule or '',
+            grammar_str,
+        )).encode('utf-8')).hexdigest()
+
+    def get_path(self, key):
+        """Return the path of the file for the given key."""
+
+        return os.path.join(self.directory, 'grammar-%s.pickle' % key)
+
+    def get(self, grammar_str, default_rule=None):
+        """Return the compiled grammar, from the cache if available, or compile and store it.
+
+        Arguments
+        ---------
+        grammar_str : str
+            The text of the grammar.
+        default_rule : str, optional
+            The name of the default rule of the grammar.
+
+        Returns
+        -------
+        parsimonious.Grammar
+            The compiled grammar, with the given default rule.
+
+        """
+
+        path = self.get_path(self.get_key(grammar_str, default_rule))
+
+        try:
+            with open(path, 'rb') as file:
+                return pickle.load(file)
+        except Exception:  # pylint: disable=broad-except
+            # Missing or invalid file: we'll compile the grammar.
+            pass
+
+        grammar = compile_grammar(grammar_str, default_rule)
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write in a temporary file then move it, for other processes to never read a
+            # partial file.
+            with NamedTemporaryFile(dir=self.directory, delete=False) as file:
+                pickle.dump(grammar, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(file.name, path)
+        except Exception:  # pylint: disable=broad-except
+            # We have a valid grammar, it's only the cache that doesn't work.
+            pass
+
+        return grammar
+
+
+def compile_grammar(grammar_str, default_rule=None):
+    """Compile the given grammar text into a ``parsimonious`` grammar.
+
+    Arguments
+    ---------
+    grammar_str : str
+        The text of the grammar.
+    default_rule : str, optional
+        The name of the default rule of the grammar. If not set, it will be the first one.
+
+    Returns
+    -------
+    parsimonious.Grammar
+        The compiled grammar.
+
+    Example
+    -------
+
+    >>> compile_grammar('foo = "foo" / bar\\nbar = "bar"').default_rule.name
+    'foo'
+    >>> compile_grammar('foo = "foo" / bar\\nbar = "bar"', 'bar').default_rule.name
+    'bar'
+
+    """
+
+    grammar = Grammar(grammar_str)
+    if default_rule:
+        # Defining a default rule change the Grammar (immutable, so we get a new one).
+        grammar = grammar.default(default_rule)
+    return grammar
+
+
+class NoPackratCache(dict):
+    """A packrat cache that keeps nothing, for ``parsimonious`` to never memoize matches.
+
+    Memory doesn't grow with the size of the text, but a rule may be matched many times at the
+    same position when alternatives backtrack.
+
+    Example
+    -------
+
+    >>> cache = NoPackratCache()
+    >>> cache[(1, 0)] = 'foo'
+    >>> len(cache), cache.get((1, 0))
+    (0, None)
+
+    """
+
+    __slots__ = ()
+
+    def __setitem__(self, key, value):
+        """Ignore the value to store."""
+        pass
+
+
+class BoundedPackratCache(OrderedDict):
+    """A packrat cache keeping only the last matches, for ``parsimonious``.
+
+    As the text is matched from left to right, the last stored matches are the ones near the
+    current position, the ones most likely to be needed again when alternatives backtrack.
+
+    Attributes
+    ----------
+    maxsize : int
+        The maximum number of matches to keep.
+
+    Example
+    -------
+
+    >>> cache = BoundedPackratCache(2)
+    >>> for pos in range(3):
+    ...     cache[(1, pos)] = pos
+    >>> list(cache.items())
+    [((1, 1), 1), ((1, 2), 2)]
+
+    """
+
+    def __init__(self, maxsize):
+        """Create an empty cache.
+
+        Arguments
+        ---------
+        maxsize : int
+            The maximum number of matches to keep.
+
+        """
+
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __setitem__(self, key, value):  # pylint: disable=arguments-differ
+        """Store the value, and discard the oldest one if the cache is full."""
+        super().__setitem__(key, value)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+def new_packrat_cache(size=None):
+    """Return a new packrat cache to give to ``parsimonious`` to match a text.
+
+    Arguments
+    ---------
+    size : int, optional
+        The maximum number of matches to keep. ``None`` (the default) to keep all of them (the
+        default behavior of ``parsimonious``), ``0`` to keep none.
+
+    Returns
+    -------
+    dict
+        The new cache.
+
+    Example
+    -------
+
+    >>> new_packrat_cache()
+    {}
+    >>> new_packrat_cache(0)
+    {}
+    >>> type(new_packrat_cache(0)).__name__, type(new_packrat_cache(1000)).__name__
+    ('NoPackratCache', 'BoundedPackratCache')
+
+    """
+
+    if size is None:
+        return {}
+    if not size:
+        return NoPackratCache()
+    return BoundedPackratCache(size)
@@ -0,0 +1,553 @@
+"""``descent`` module of ``dataql.parsers``.
+
+It provides ``DescentBackend``, a hand-written recursive-descent parser for the grammar of
+``DataQLParser``, and ``DescentDataQLParser``, a ``DataQLParser`` using it.
+
+The backend directly creates the resources while reading the text, without creating a
+``parsimonious`` node for each rule matched, nor visiting them later, so it is a lot faster.
+
+It follows exactly the same (PEG) rules as the grammar, and produces exactly the same resources.
+When the text cannot be parsed, the grammar of the parser is used to parse it again, to get the
+exact same ``ParserError`` as without the backend.
+
+Example
+-------
+
+Below, a conformance corpus to check that both parsers produce exactly the same resources,
+including classes, names, filters, arguments and parents.
+
+>>> from dataql.parsers.generic import DataQLParser
+>>> corpus = [
+...     'foo', ' foo ', 'foo()', 'foo.bar', 'foo . bar ( ) ', 'foo:bar', 'foo : bar.baz',
+...     'foo(1)', 'foo(1, 2.5, -3, 1e+5, -2.5e33, .5)', 'foo("bar", \\'baz\\', "q\\\\"ux")',
+...     'foo("a\\\\\\\\b\\\\\\\\\\\\\\\\", \\'c\\\\\\nd\\x01\\')',
+...     'foo(null, Nil, NONE, false, True)', 'foo(a=1)', 'foo(a:1, b = "c")', 'foo(1, a=2)',
+...     'foo(1, 2, a=null, b=true)', 'foo ( 1 , a = 2 )', 'foo.bar(1).baz(x=2)',
+...     'foo($bar)', 'foo(1, $bar, a=$baz, b = $qux)', 'foo.bar($x)[baz($y)]',
+...     'foo.0', 'foo.1.bar', 'foo.1.2', 'foo[1]', 'foo[1:]', 'foo[:2]', 'foo[::3]', 'foo[1:2:3]',
+...     'foo[ 1 : 2 : ]', 'foo[-1].bar', 'foo [0].bar[1:2]', '0', '0.foo', '[1]', '[0:2].foo',
+...     'foo{bar}', 'foo {bar, baz}', 'foo{bar,}', 'foo{ bar , baz , }', 'foo{a:bar, b:baz.qux}',
+...     'foo{bar{baz{qux}}}', 'foo[bar]', 'foo[bar, baz]', 'foo(1)[bar]', 'foo[1][bar]',
+...     'foo.bar[baz, qux]', 'foo[[bar, baz], qux{quz}, corge]', 'foo[{bar}]', 'foo[[1]]',
+...     'foo[bar[baz], qux{quz, corge}, grault]', 'foo[bar.0, baz[1:2], qux]', '1{foo}', '.5[foo]',
+...     'a:foo{b:bar[baz]}', r'''
+...     User.get('Elon Musk') {
+...         name,
+...         birthday.strftime('%x'),
+...         companies[{
+...             name,
+...             year:created_year,
+...         }],
+...         company_names: companies[name],
+...         first_company:companies.0.name,
+...     }
+...     ''',
+... ]
+>>> all(describe(DescentDataQLParser(q).data) == describe(DataQLParser(q).data) for q in corpus)
+True
+
+>>> errors = ['', 'foo {', 'foo {bar::baz}', 'foo[bar', 'foo(', 'foo.', 'foo(1', '1foo', '{}',
+...           'foo(true=1)', 'foo[bar, qux:quz]', 'foo($)', 'foo($ bar)', 'foo($1)',
+...           '1{\\n1e3}1(', '.5{a})a', '0{\\nbar},-2.5(}']
+>>> def get_error(parser_class, query):
+...     try:
+...         parser_class(query)
+...     except ParserError as ex:
+...         return str(ex)
+>>> all(get_error(DescentDataQLParser, q) == get_error(DataQLParser, q) for q in errors)
+True
+>>> all(get_error(DescentDataQLParser, q) for q in errors)
+True
+
+"""
+
+import re
+
+from dataql.parsers.base import STR_PATTERN, unescape
+from dataql.parsers.exceptions import ParserError
+from dataql.parsers.generic import DataQLParser
+
+
+def describe(resource):
+    """Return a structure describing a resource and everything it holds. Used to compare trees.
+
+    Arguments
+    ---------
+    resource : dataql.resources.Resource
+        The resource to describe.
+
+    Returns
+    -------
+    tuple
+        A (nested) tuple describing the classes and attributes of the resource, its filters and
+        their arguments, its sub-resources, and if the parent of each of them is set or not.
+
+    Example
+    -------
+
+    >>> from dataql.resources import Field, Filter, PosArg
+    >>> describe(Field('foo', filters=[Filter('bar', args=[PosArg(1)])]))
+    ('Field', 'foo', False, False, (('Filter', 'bar', True, (('PosArg', None, None, 1, True),)),))
+
+    """
+
+    def describe_value(value):
+        """Describe a value, keeping its type (to differentiate ``1`` from ``1.0`` or ``True``)."""
+        return value if value is None else (type(value).__name__, value)
+
+    def describe_filter(filter_):
+        """Describe a filter or a slice filter, with its arguments."""
+        has_parent = filter_.parent is not None
+        if hasattr(filter_, 'args'):
+            args = None if filter_.args is None else tuple(
+                (arg.__class__.__name__, arg.arg, arg.type, arg.value, arg.parent is filter_)
+                for arg in filter_.args
+            )
+            return (filter_.__class__.__name__, filter_.name, has_parent, args)
+        if filter_.slice is not None:
+            info = tuple(describe_value(getattr(filter_.slice, attr))
+                         for attr in ('start', 'stop', 'step'))
+        else:
+            info = describe_value(filter_.index)
+        return (filter_.__class__.__name__, info, has_parent)
+
+    result = (
+        resource.__class__.__name__,
+        resource.name,
+        resource.is_root,
+        resource.parent is not None,
+        tuple(describe_filter(filter_) for filter_ in resource.filters),
+    )
+    if hasattr(resource, 'resources'):
+        result += (tuple(describe(sub_resource) for sub_resource in resource.resources), )
+    return result
+
+
+class DescentBackend:
+    """A recursive-descent parser for the ``ROOT`` rule of the ``DataQLParser`` grammar.
+
+    The text is read only once, from left to right, using a few precompiled regular expressions
+    for the terminal rules (identifiers, numbers, strings...). Like the grammar, choices are
+    ordered and the first one that matches is used.
+
+    Each ``_rule`` method tries to match its rule at the given position, and returns a tuple
+    with the result and the position after the match, or ``None`` if it doesn't match.
+
+    It is meant to be used as the ``backend`` of a parser having the same grammar as
+    ``DataQLParser``: the classes to use for resources, filters and arguments are the ones
+    defined on the parser.
+
+    Attributes
+    ----------
+    parser : dataql.parsers.base.BaseParser
+        The parser using this backend.
+    text : str
+        The text being parsed.
+
+    Example
+    -------
+
+    >>> backend = DescentBackend(DescentDataQLParser())
+    >>> backend.parse('foo.bar(1)[baz]')
+    <List[foo] .foo.bar(1)>
+      <Field[baz] />
+    </List[foo]>
+    >>> backend.parse('foo.bar(1)[baz') # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql.parsers.exceptions.TrackingParseError: Rule 'BRA_C' didn't match at '' (line 1, ...
+
+    """
+
+    re_ws = re.compile(r'\s*')
+    re_ident = re.compile(r'[_A-Z][_A-Z0-9]*', re.I)
+    re_nb = re.compile(r'[-+]?\d*\.?\d+([eE][-+]?\d+)?')
+    re_str = re.compile(STR_PATTERN, re.DOTALL)
+    re_null = re.compile(r'(?:null|nil|none)', re.I)
+    re_false = re.compile(r'(?:false)', re.I)
+    re_true = re.compile(r'(?:true)', re.I)
+
+    def __init__(self, parser):
+        """Save the parser using this backend.
+
+        Arguments
+        ---------
+        parser : dataql.parsers.base.BaseParser
+            The parser using this backend.
+
+        """
+
+        self.parser = parser
+        self.text = None
+
+    def parse(self, text):
+        """Parse the given text and return the root resource.
+
+        Arguments
+        ---------
+        text : str
+            The text to parse.
+
+        Returns
+        -------
+        .resources.Resource
+            An instance of a subclass of ``.resources.Resource``, with ``is_root`` set to ``True``.
+
+        Raises
+        ------
+        parsimonious.exceptions.ParseError
+            When the text cannot be parsed. It is raised by the grammar of the parser that
+            is used in this case to get the exact same error as when not using the backend.
+
+        """
+
+        self.text = text
+
+        result = self._named_resource(self._ws(0))
+        if result is None or self._ws(result[1]) != len(text):
+            # Let the grammar raise the correct exception.
+            return self.parser.parse_with_grammar(text)
+
+        resource = result[0]
+        resource.is_root = True
+        return resource
+
+    def _ws(self, pos):
+        """Return the position after the optional white spaces at the given position."""
+        return self.re_ws.match(self.text, pos).end()
+
+    def _char(self, pos, char):
+        """Match a character surrounded by optional white spaces (``PAR_O``, ``COM``...)."""
+        pos = self._ws(pos)
+        if self.text.startswith(char, pos):
+            return self._ws(pos + 1)
+        return None
+
+    def _named_resource(self, pos):
+        """Match ``NAMED_RESOURCE``: a resource with an optional name (``name:``)."""
+        name = None
+        match = self.re_ident.match(self.text, pos)
+        if match:
+            after_name = self._ws(match.end())
+            if self.text.startswith(':', after_name):
+                name, pos = match.group(), self._ws(after_name + 1)
+
+        result = self._resource(pos, False)
+        if result is not None and name:
+            result[0].name = name
+        return result
+
+    def _resource(self, pos, in_list):
+        """Match ``RESOURCE`` (or ``LIST_RESOURCE`` if ``in_list`` is ``True``).
+
+        ``RESOURCE`` is ``NAMED_LIST / NAMED_OBJECT / FIELD``, and ``LIST_RESOURCE`` is
+        ``NAMED_LIST / LIST / NAMED_OBJECT / OBJECT / FIELD``, all named ones starting with
+        ``FILTERS``.
+
+        """
+
+        filters = self._filters(pos)
+
+        if filters is not None:
+            result = self._list(filters[1])
+            if result is not None:
+                return self._named(result, filters[0])
+
+        if in_list:
+            result = self._list(pos)
+            if result is not None:
+                return result
+
+        if filters is not None:
+            result = self._object(filters[1])
+            if result is not None:
+                return self._named(result, filters[0])
+
+        if in_list:
+            result = self._object(pos)
+            if result is not None:
+                return result
+
+        if filters is not None:
+            filters, pos = filters
+            return self.parser.Field(getattr(filters[0], 'name', None), filters=filters), pos
+
+        return None
+
+    @staticmethod
+    def _named(result, filters):
+        """Set the name and filters of a list or object, like for ``NAMED_LIST/NAMED_OBJECT``."""
+        resource = result[0]
+        resource.name = getattr(filters[0], 'name', None)
+        resource.filters = filters
+        return result
+
+    def _object(self, pos):
+        """Match ``OBJECT``: named resources in curly brackets."""
+        pos = self._char(pos, '{')
+        if pos is None:
+            return None
+        resources = self._content(pos, False)
+        if resources is None:
+            return None
+        resources, pos = resources
+        pos = self._char(pos, '}')
+        if pos is None:
+            return None
+        return self.parser.Object(name=None, resources=resources), pos
+
+    def _list(self, pos):
+        """Match ``LIST``: resources in brackets."""
+        pos = self._char(pos, '[')
+        if pos is None:
+            return None
+        resources = self._content(pos, True)
+        if resources is None:
+            return None
+        resources, pos = resources
+        pos = self._char(pos, ']')
+        if pos is None:
+            return None
+        return self.parser.List(name=None, resources=resources), pos
+
+    def _content(self, pos, in_list):
+        """Match ``NAMED_CONTENT`` (or ``LIST_CONTENT`` if ``in_list`` is ``True``).
+
+        It's a list of resources separated by commas, with an optional trailing one.
+
+        """
+
+        def match_resource(pos):
+            """Match one resource, depending of the kind of content."""
+            return self._resource(pos, True) if in_list else self._named_resource(pos)
+
+        result = match_resource(pos)
+        if result is None:
+            return None
+        resources = [result[0]]
+        pos = result[1]
+
+        while True:
+            after_comma = self._char(pos, ',')
+            if after_comma is None:
+                break
+            result = match_resource(after_comma)
+            if result is None:
+                break
+            resources.append(result[0])
+            pos = result[1]
+
+        # Optional trailing comma.
+        after_comma = self._char(pos, ',')
+        if after_comma is not None:
+            pos = after_comma
+
+        return resources, pos
+
+    def _filters(self, pos):
+        """Match ``FILTERS``: a first filter and optional next ones."""
+        result = self._slice_filter(pos) or self._nb_filter(pos) or self._filter(pos)
+        if result is None:
+            return None
+        filters = [result[0]]
+        pos = result[1]
+
+        while True:
+            result = self._slice_filter(pos)
+            if result is None:
+                after_dot = self._char(pos, '.')
+                if after_dot is None:
+                    break
+                result = self._nb_filter(after_dot) or self._filter(after_dot)
+                if result is None:
+                    break
+            filters.append(result[0])
+            pos = result[1]
+
+        return filters, pos
+
+    def _filter(self, pos):
+        """Match ``FILTER``: an identifier with optional arguments."""
+        match = self.re_ident.match(self.text, pos)
+        if match is None:
+            return None
+        args, pos = None, match.end()
+        result = self._optional_args(pos)
+        if result is not None:
+            args, pos = result
+        filter_ = self.parser.Filter(name=match.group(), args=args)
+        filter_.call_args = filter_.compute_call_args()
+        return filter_, pos
+
+    def _nb_filter(self, pos):
+        """Match ``NB_FILTER``: a number used as an index."""
+        result = self._nb(pos)
+        if result is None:
+            return None
+        return self.parser.SliceFilter(result[0]), result[1]
+
+    def _slice_filter(self, pos):
+        """Match ``SLICE_FILTER``: a slice or an index, in brackets."""
+        pos = self._char(pos, '[')
+        if pos is None:
+            return None
+        result = self._full_slice(pos) or self._nb(pos)
+        if result is None:
+            return None
+        slice_info, pos = result
+        pos = self._char(pos, ']')
+        if pos is None:
+            return None
+        return self.parser.SliceFilter(slice_info), pos
+
+    def _full_slice(self, pos):
+        """Match ``FULL_SLICE``: at least a colon, with optional start, stop and step."""
+        start, pos = self._optional_nb(pos)
+        pos = self._ws(pos)
+        if not self.text.startswith(':', pos):
+            return None
+        stop, pos = self._optional_nb(self._ws(pos + 1))
+        pos = self._ws(pos)
+        step = None
+        if self.text.startswith(':', pos):
+            step, pos = self._optional_nb(self._ws(pos + 1))
+        return slice(start, stop, step), pos
+
+    def _optional_nb(self, pos):
+        """Match ``OPTIONAL_NB``: return the number, or ``None``, and the new position."""
+        return self._nb(pos) or (None, pos)
+
+    def _nb(self, pos):
+        """Match ``NB``: a number, converted to an int or a float."""
+        match = self.re_nb.match(self.text, pos)
+        if match is None:
+            return None
+        return self.parser.convert_nb(match.group()), match.end()
+
+    def _optional_args(self, pos):
+        """Match ``OPTIONAL_ARGS``: optional arguments in parentheses."""
+        pos = self._char(pos, '(')
+        if pos is None:
+            return None
+        args = []
+        result = self._args(pos)
+        if result is not None:
+            args, pos = result
+        pos = self._char(pos, ')')
+        if pos is None:
+            return None
+        return args, pos
+
+    def _args(self, pos):
+        """Match ``ARGS``: ``ALL_ARGS / UNNAMED_ARGS / NAMED_ARGS``."""
+        unnamed = self._args_list(pos, self._unnamed_arg)
+        if unnamed is not None:
+            after_comma = self._char(unnamed[1], ',')
+            if after_comma is not None:
+                named = self._args_list(after_comma, self._named_arg)
+                if named is not None:
+                    return unnamed[0] + named[0], named[1]
+            return unnamed
+        return self._args_list(pos, self._named_arg)
+
+    def _args_list(self, pos, match_arg):
+        """Match ``UNNAMED_ARGS`` or ``NAMED_ARGS``, depending of ``match_arg``."""
+        result = match_arg(pos)
+        if result is None:
+            return None
+        args = [result[0]]
+        pos = result[1]
+
+        while True:
+            after_comma = self._char(pos, ',')
+            if after_comma is None:
+                break
+            result = match_arg(after_comma)
+            if result is None:
+                break
+            args.append(result[0])
+            pos = result[1]
+
+        return args, pos
+
+    def _unnamed_arg(self, pos):
+        """Match ``UNNAMED_ARG``: a value."""
+        result = self._value(pos)
+        if result is None:
+            return None
+        return self.parser.PosArg(value=result[0]), result[1]
+
+    def _named_arg(self, pos):
+        """Match ``NAMED_ARG``: an identifier, an operator and a value."""
+        match = self.re_ident.match(self.text, pos)
+        if match is None:
+            return None
+        pos = self._ws(match.end())
+        if not self.text.startswith((':', '='), pos):
+            return None
+        result = self._value(self._ws(pos + 1))
+        if result is None:
+            return None
+        return self.parser.NamedArg(arg=match.group(), arg_type='=', value=result[0]), result[1]
+
+    def _value(self, pos):
+        """Match ``VALUE``: ``STR / NB / NULL / FALSE / TRUE / VARIABLE``."""
+        text = self.text
+
+        match = self.re_str.match(text, pos)
+        if match is not None:
+            return unescape(match.group()[1:-1]), match.end()
+
+        result = self._nb(pos)
+        if result is not None:
+            return result
+
+        for regex, value in ((self.re_null, None), (self.re_false, False),
+                             (self.re_true, True)):
+            match = regex.match(text, pos)
+            if match is not None:
+                return value, match.end()
+
+        if text.startswith('$', pos):
+            match = self.re_ident.match(text, pos + 1)
+            if match is not None:
+                return self.parser.Variable(match.group()), match.end()
+
+        return None
+
+
+class DescentDataQLParser(DataQLParser):
+    """A ``DataQLParser`` using the ``DescentBackend`` to parse texts with its default rule.
+
+    Example
+    -------
+
+    >>> DescentDataQLParser(r'''
+    ... current_user {
+    ...     name,
+    ...     email.lowercase(),
+    ...     friends.sorted(by='date').limit(10) [
+    ...         name,
+    ...         email
+    ...     ],
+    ... }
+    ... ''').data
+    <Object[current_user]>
+      <Field[name] />
+      <Field[email] .email.lowercase() />
+      <List[friends] .friends.sorted(by="date").limit(10)>
+        <Field[name] />
+        <Field[email] />
+      </List[friends]>
+    </Object[current_user]>
+
+    >>> DescentDataQLParser('foo {bar::baz}') # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...ParserError:...line 1, column 10...text begins with: ":baz}"
+
+    # Other rules are still parsed with the grammar
+    >>> DescentDataQLParser('foo(1)', default_rule='FILTER').data
+    .foo(1)
+
+    """
+
+    backend = DescentBackend
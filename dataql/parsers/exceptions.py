@@ -4,6 +4,10 @@ It holds all the exception that may be raised by this module.
 
 """
 
+from abc import ABCMeta
+
+from parsimonious.exceptions import ParseError
+
 from dataql.exceptions import DataQLException
 
 
@@ -20,11 +24,15 @@ class ParserError(DataQLException):
     ----------
     original_exception : parsimonious.exceptions.ParseError
         The original exception, with everything needed for the display: text, position...
+    expected : tuple
+        The names of the rules that failed to match at the position of the error, if known
+        (see ``TrackingParseError``), the most specific first.
 
     """
 
     def __init__(self, original_exception):
         self.original_exception = original_exception
+        self.expected = tuple(getattr(original_exception, 'expected', ()))
 
         super().__init__(str(self))
 
@@ -39,3 +47,193 @@ class ParserError(DataQLException):
             self.original_exception.column(),
             self.original_exception.text[pos:pos + 20],
         )
+
+
+class LimitExceeded(ParserError, metaclass=ABCMeta):
+    """Base for exceptions raised when a query goes over a limit of the parser.
+
+    These limits (see ``BaseParser.check_limits``) are checked before parsing the query, to
+    reject abusive queries early.
+
+    The exception string exposes the line and column where the limit was exceeded, the value and
+    the limit.
+
+    Attributes
+    ----------
+    description : str (class attribute)
+        What is limited, used in the exception string.
+    value : int
+        The value that exceeded the limit.
+    limit : int
+        The limit defined on the parser.
+
+    """
+
+    description = None
+
+    def __init__(self, text, pos, value, limit):
+        self.value = value
+        self.limit = limit
+        super().__init__(ParseError(text, pos))
+
+    def __str__(self):
+        return 'Limit exceeded at line %s, column %s: %s of %s is over the limit of %s' % (
+            self.original_exception.line(),
+            self.original_exception.column(),
+            self.description,
+            self.value,
+            self.limit,
+        )
+
+
+class QueryTooLong(LimitExceeded):
+    """Exception raised when a query is longer than ``max_query_length``.
+
+    Example
+    -------
+
+    >>> raise QueryTooLong('foo {bar}', 5, 9, 5) # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...QueryTooLong: Limit exceeded at line 1, column 6: length of 9 is over the limit of 5
+
+    """
+
+    description = 'length'
+
+
+class LiteralTooLong(LimitExceeded):
+    """Exception raised when a string in a query is longer than ``max_literal_length``."""
+
+    description = 'literal length'
+
+
+class QueryTooDeep(LimitExceeded):
+    """Exception raised when objects and lists are nested deeper than ``max_depth``."""
+
+    description = 'depth'
+
+
+class TooManyResources(LimitExceeded):
+    """Exception raised when a query has more resources than ``max_resources``."""
+
+    description = 'number of resources'
+
+
+class TooManyFilters(LimitExceeded):
+    """Exception raised when a resource has more filters than ``max_filters``."""
+
+    description = 'number of filters'
+
+
+class PersistedQueryException(DataQLException, metaclass=ABCMeta):
+    """Base for exceptions raised by a ``PersistedQueries`` object."""
+    pass
+
+
+class PersistedQueryNotFound(PersistedQueryException, KeyError):
+    """Exception raised when a query id is not in a ``PersistedQueries`` object.
+
+    The exception string only exposes the unknown query id.
+
+    Attributes
+    ----------
+    query_id : str
+        The id of the query that was not found.
+
+    Example
+    -------
+
+    >>> raise PersistedQueryNotFound('abc')
+    Traceback (most recent call last):
+    dataql.parsers.exceptions.PersistedQueryNotFound: The `abc` query is not persisted.
+
+    """
+
+    def __init__(self, query_id):
+        self.query_id = query_id
+        super().__init__(str(self))
+
+    def __str__(self):
+        return 'The `%s` query is not persisted.' % self.query_id
+
+
+class QueryNotAllowed(PersistedQueryException):
+    """Exception raised when a query text is given but only persisted queries are allowed.
+
+    The exception string exposes the start of the query.
+
+    Attributes
+    ----------
+    text : str
+        The query that is not allowed.
+
+    Example
+    -------
+
+    >>> raise QueryNotAllowed('foo {bar}')
+    Traceback (most recent call last):
+    dataql.parsers.exceptions.QueryNotAllowed: Only persisted queries are allowed, got: "foo {bar}"
+
+    """
+
+    def __init__(self, text):
+        self.text = text
+        super().__init__(str(self))
+
+    def __str__(self):
+        return 'Only persisted queries are allowed, got: "%s"' % self.text[:20]
+
+
+class TrackingParseError(ParseError):
+    """A ``ParseError`` keeping the names of all the rules that failed at the furthest position.
+
+    ``parsimonious`` updates the ``expr`` and ``pos`` attributes of the error passed to
+    ``Expression.match_core`` each time an expression fails at (or after) the furthest position
+    seen so far. When ``pos`` is set, we collect the name of ``expr`` (unnamed expressions
+    are ignored), starting a new list each time the position moves forward.
+
+    So, after an unsuccessful parsing, this error tells where the parsing stopped to progress,
+    and what was expected at this position, without having to parse the text again.
+
+    Attributes
+    ----------
+    expected : list
+        The names of the rules that failed at ``pos``, in the order they failed.
+
+    Example
+    -------
+
+    >>> from parsimonious import Grammar
+    >>> grammar = Grammar('''
+    ...     root = "foo" ws (bar / baz)
+    ...     ws = " "
+    ...     bar = "bar"
+    ...     baz = "baz"
+    ... ''')
+    >>> error = TrackingParseError('foo qux')
+    >>> grammar['root'].match_core('foo qux', 0, {}, error) is None
+    True
+    >>> error.pos, error.expected
+    (4, ['bar', 'baz'])
+
+    """
+
+    expr = None
+    expected = ()
+    _pos = -1
+
+    @property
+    def pos(self):
+        """The furthest position where an expression failed to match."""
+        return self._pos
+
+    @pos.setter
+    def pos(self, pos):
+        """Save the position, and the name of the rule (in ``expr``) that failed there."""
+        if pos != self._pos:
+            self.expected = []
+            self._pos = pos
+
+        name = getattr(self.expr, 'name', None)
+        if name and name not in self.expected:
+            self.expected.append(name)
@@ -5,8 +5,10 @@ provided by the ``dataql`` library.
 
 """
 
-from dataql.parsers.base import BaseParser, rule
-from dataql.parsers.exceptions import ParserError
+import re
+
+from dataql.parsers.base import NB_PATTERN, STR_PATTERN, BaseParser, rule
+from dataql.parsers.exceptions import QueryTooDeep, TooManyFilters, TooManyResources
 from dataql.parsers.mixins import FiltersWithSlicingParserMixin
 
 
@@ -35,44 +37,253 @@ class DataQLParser(FiltersWithSlicingParserMixin, BaseParser):
       </List[friends]>
     </Object[current_user]>
 
+    When the query is invalid, the error points to the furthest position the parsing could
+    reach, with the rules that were expected there.
+
+    >>> from dataql.parsers.exceptions import ParserError
+    >>> try:
+    ...     DataQLParser('foo {bar(1,)}')
+    ... except ParserError as ex:
+    ...     error = ex
+    >>> error # doctest: +ELLIPSIS
+    ParserError('Problem with parsing at line 1, column 12. ... begins with: ")}"')
+    >>> error.expected[:6]
+    ('STR', 'NB', 'NULL', 'FALSE', 'TRUE', 'VARIABLE')
+
+    The furthest position may be after some white spaces, where ``DebugDataQLParser`` pointed
+    to the start of these spaces. Here, it's the ``(`` where a ``.``, a ``[`` or a ``{`` (not
+    named rules) could follow ``.5``, at column 4 (it was column 3 with ``DebugDataQLParser``):
+
+    >>> DataQLParser('.5 (bar]foo') # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...ParserError: Problem with parsing at line 1, column 4. ... begins with: "(bar]foo"
+
+    Limits can be set in subclasses to reject abusive queries before parsing them (see
+    ``check_limits``).
+
+    >>> class LimitedParser(DataQLParser):
+    ...     max_depth = 3
+    ...     max_resources = 10
+    ...     max_filters = 3
+    >>> LimitedParser('foo {bar [{baz.qux(1)}]}').data
+    <Object[foo]>
+      <List[bar]>
+        <Object>
+          <Field[baz] .baz.qux(1) />
+        </Object>
+      </List[bar]>
+    </Object[foo]>
+    >>> LimitedParser('foo {bar [{baz {qux}}]}') # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...QueryTooDeep: ...line 1, column 16: depth of 4 is over the limit of 3
+
+    Attributes
+    ----------
+    max_depth : int (class attribute)
+        If set, ``parse`` refuses texts with objects and lists nested deeper than this, raising
+        ``QueryTooDeep``. Default to ``None``, for no limit.
+    max_resources : int (class attribute)
+        If set, ``parse`` refuses texts with more resources than this, raising
+        ``TooManyResources``. Default to ``None``, for no limit.
+    max_filters : int (class attribute)
+        If set, ``parse`` refuses texts with resources having more filters than this (slices
+        included), raising ``TooManyFilters``. Default to ``None``, for no limit.
+
     """
 
     default_rule = 'ROOT'
 
-    def __init__(self, text, default_rule=None):
-        """Override to try to get better error message.
+    max_depth = None
+    max_resources = None
+    max_filters = None
+
+    # Regex to find the parts of the text needed to check the limits (see ``check_limits``).
+    limits_re = re.compile(r'''
+        (?P<str>%(str)s)
+      | (?P<slice>\[\s*(?:(?:%(nb)s)?\s*:\s*(?:%(nb)s)?\s*(?::\s*(?:%(nb)s)?)?|%(nb)s)\s*\])
+      | (?P<name>[_A-Z][_A-Z0-9]*\s*:)
+      | (?P<dotted>\.\s*%(nb)s)
+      | (?P<filter>[_A-Z][_A-Z0-9]*|%(nb)s)
+      | (?P<char>[][{}(),])
+    ''' % {'str': STR_PATTERN, 'nb': NB_PATTERN}, re.I | re.X | re.S)
+    # Regex of a number used as a filter, to find the one starting a resource, like ``.5``.
+    number_re = re.compile(NB_PATTERN, re.I)
+    # Regex of the end of a resource in a list, to find an index alone in it, like ``[1]``.
+    list_resource_end_re = re.compile(r'\s*[],]')
+
+    def check_limits(self, text):
+        """Check that the text doesn't go over the limits of the parser, before parsing it.
+
+        In addition to the limits of ``BaseParser``, if any of ``max_depth``, ``max_resources``
+        or ``max_filters`` is set, the text is scanned once with a regex to find the nested
+        objects and lists, the resources and their filters, and the strings, without parsing
+        it, to raise as soon as a limit is exceeded.
 
-        Below an example of the better message
+        Arguments
+        ---------
+        text : str
+            The text to check.
+
+        Raises
+        ------
+        dataql.parsers.exceptions.LimitExceeded
+            The subclass depending of the limit exceeded.
 
         Example
         -------
 
-        # First with a parser that will not try to get a better error message
-        >>> query = 'foo {bar::baz}'
-        >>> class WillNotDebugParser(DataQLParser):
-        ...     debugging = True  # Will not try to debug, because marked as debugging
-        >>> WillNotDebugParser(query) # doctest: +ELLIPSIS
+        >>> class Parser(DataQLParser):
+        ...     max_depth = 1
+        ...     max_resources = 4
+        ...     max_filters = 2
+        ...     max_literal_length = 5
+        >>> parser = Parser()
+        >>> parser.check_limits('foo {a: bar.baz("(,{[", 1.5), b[1:2], c.0, }')
+        >>> parser.check_limits('foo {a: bar.baz.qux}') # doctest: +ELLIPSIS
         Traceback (most recent call last):
-        dataql...ParserError:...line 1, column 5...text begins with: "{bar::baz}"
-
-        # Now with a parser that will try to get a better error message
-        >>> DataQLParser(query) # doctest: +ELLIPSIS
+        dataql...TooManyFilters: ...line 1, column 17: number of filters of 3 is over the limit of 2
+        >>> parser.check_limits('foo {a, b, c, d}') # doctest: +ELLIPSIS
         Traceback (most recent call last):
-        dataql...ParserError:...line 1, column 10...text begins with: ":baz}"
-
+        dataql...TooManyResources: ...line 1, column 15: number of resources of 5 is over the...
+        >>> parser.check_limits('foo {bar("foobar")}') # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql...LiteralTooLong: ...line 1, column 10: literal length of 6 is over the limit of 5
+
+        Brackets are a slice or an index only with a number or a colon, else it's a list, and
+        numbers are read like the parser does (``foo.1.2`` is ``foo[1.2]`` but ``.1.2.3`` is
+        ``[0.1][2.3]``). An index starting a resource is a filter, except alone in a list:
+        ``foo{[1]}`` is an object with a field ``[1]``, but ``foo[[1]]`` is a list in a list
+        (while ``[:]`` is always a slice, and ``foo[[1][a]]`` is a list with ``[1]`` as filter):
+
+        >>> class Parser(DataQLParser):
+        ...     max_depth = 1
+        ...     max_resources = 2
+        ...     max_filters = 2
+        >>> parser = Parser()
+        >>> for text in ('foo[e]', 'foo[E]', 'foo[ee]', 'foo[E1]', 'foo.1.2', 'foo[:]', 'foo[1]',
+        ...              '.1.2', 'foo[[:].x]'):
+        ...     parser.check_limits(text)
+        >>> parser.check_limits('x{a:foo[e]}') # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql...QueryTooDeep: ...line 1, column 8: depth of 2 is over the limit of 1
+        >>> parser.check_limits('foo.1.2.3') # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql...TooManyFilters: ...line 1, column 8: number of filters of 3 is over the limit of 2
+        >>> parser.check_limits('.1.2.3.4') # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql...TooManyFilters: ...line 1, column 7: number of filters of 3 is over the limit of 2
+        >>> for text in ('foo{[1]}', 'foo{a:[0]}', 'foo[[1:]]'):
+        ...     parser.check_limits(text)
+        >>> parser.check_limits('foo[[1]]') # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql...QueryTooDeep: ...line 1, column 5: depth of 2 is over the limit of 1
+        >>> class Parser(DataQLParser):
+        ...     max_depth = 1
+        ...     max_resources = 3
+        ...     max_filters = 1
+        >>> Parser().check_limits('foo{x, [0].name}') # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql...TooManyFilters: ...line 1, column 12: number of filters of 2 is over the limit of 1
+        >>> Parser().check_limits('foo{[1].bar}') # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql...TooManyFilters: ...line 1, column 9: number of filters of 2 is over the limit of 1
+        >>> Parser.max_filters = 2
+        >>> Parser().check_limits('foo{x, [0].name}')
 
         """
-        try:
-            super().__init__(text, default_rule)
-        except ParserError as ex:
-            # If we are not yet in debugging mode, and the problem is at ROOT,
-            # enter the debugging mode to expect a better error
-            if not getattr(self, 'debugging', False) and ex.original_exception.expr.name == 'ROOT':
-                DebugDataQLParser(text, default_rule)
-
-            # If we were already in debugging mode, or the error happened not at the ROOT,
-            # or the debugger didn't raise an exception, raise the original error.
-            raise
+
+        if self.max_depth is None and self.max_resources is None and self.max_filters is None:
+            super().check_limits(text)
+            return
+
+        self.check_query_length(text)
+
+        max_depth, max_resources, max_filters = self.max_depth, self.max_resources, self.max_filters
+        check_literals = self.max_literal_length is not None
+
+        # For the current "segment" of the text (between two commas, or a bracket and a comma),
+        # the number of filters found, and if it's a resource (counted as soon as it's known).
+        filters, is_resource = 0, False
+        # If the current segment is in a list (else in an object, or the root resource).
+        in_list = False
+        # The number of filters of each parent segment, and if it's in a list.
+        stack = []
+        nb_resources = 0
+        parens = 0
+
+        position = 0
+        while True:
+            match = self.limits_re.search(text, position)
+            if match is None:
+                break
+            kind = match.lastgroup
+            if kind == 'dotted' and not filters and not parens:
+                # Not a dot followed by a number, but a number starting a resource, like ``.5``.
+                match = self.number_re.match(text, match.start())
+                kind = 'filter'
+            position = match.end()
+
+            if kind == 'str':
+                if check_literals:
+                    self.check_literal_length(text, match)
+                continue
+
+            if kind == 'name':
+                continue
+
+            char = match.group()
+
+            if parens:
+                # Arguments of a filter: only strings and parentheses matter.
+                if char == '(':
+                    parens += 1
+                elif char == ')':
+                    parens -= 1
+                continue
+
+            if char == '(':
+                parens += 1
+                continue
+
+            if char == ',':
+                filters, is_resource = 0, False
+                continue
+
+            if char in '}]':
+                if stack:
+                    (filters, in_list), is_resource = stack.pop(), True
+                continue
+
+            if (kind == 'slice' and in_list and not is_resource and ':' not in char
+                    and self.list_resource_end_re.match(text, position)):
+                # Not an index but a list with a resource having a number as filter, like ``[1]``
+                # alone in a list (an index starting a resource in an object is a filter, and in
+                # a list, it's one only if followed by other filters and a list, like ``[1][a]``).
+                if max_depth is not None and len(stack) + 1 > max_depth:
+                    raise QueryTooDeep(text, match.start(), len(stack) + 1, max_depth)
+                nb_resources += 2
+                if max_resources is not None and nb_resources > max_resources:
+                    raise TooManyResources(text, match.start(), nb_resources, max_resources)
+                is_resource = True
+                continue
+
+            # A filter, a slice, or an object or list: the segment is a resource.
+            if not is_resource:
+                is_resource = True
+                nb_resources += 1
+                if max_resources is not None and nb_resources > max_resources:
+                    raise TooManyResources(text, match.start(), nb_resources, max_resources)
+
+            if kind != 'char':
+                filters += 1
+                if max_filters is not None and filters > max_filters:
+                    raise TooManyFilters(text, match.start(), filters, max_filters)
+                continue
+
+            stack.append((filters, in_list))
+            filters, is_resource, in_list = 0, False, char == '['
+            if max_depth is not None and len(stack) > max_depth:
+                raise QueryTooDeep(text, match.start(), len(stack), max_depth)
 
     @rule('WS NAMED_RESOURCE WS')
     def visit_root(self, _, children):
@@ -422,7 +633,7 @@ class DataQLParser(FiltersWithSlicingParserMixin, BaseParser):
         """
 
         filters, resource = children
-        resource.name = filters[0].name
+        resource.name = getattr(filters[0], 'name', None)
         resource.filters = filters
 
         return resource
@@ -476,7 +687,7 @@ class DataQLParser(FiltersWithSlicingParserMixin, BaseParser):
         """
 
         filters, resource = children
-        resource.name = filters[0].name
+        resource.name = getattr(filters[0], 'name', None)
         resource.filters = filters
 
         return resource
@@ -684,7 +895,7 @@ class DataQLParser(FiltersWithSlicingParserMixin, BaseParser):
 
 
 class DebugDataQLParser(DataQLParser):
-    """Parser to use to get better error for ``IncompleteParseError`` exceptions.
+    """Parser that was used to get better error for ``IncompleteParseError`` exceptions.
 
     If the root resource is a list or an object but there is an error, ``parsimonious``
     choose the third resource type, the field, and ignore the rest of the query starting at
@@ -693,6 +904,19 @@ class DebugDataQLParser(DataQLParser):
     This parser extends the ``DataQLParser`` by allowing only list or object as the first
     resource, to try to get a better error.
 
+    Notes
+    -----
+    It is not used anymore by ``DataQLParser``, which now directly raises an error at the
+    furthest position reached during the parsing (see ``BaseParser.parse``), but it is kept
+    for compatibility.
+
+    Example
+    -------
+
+    >>> DebugDataQLParser('foo {bar::baz}') # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...ParserError:...line 1, column 10...text begins with: ":baz}"
+
     """
 
     debugging = True
@@ -880,12 +880,23 @@ class FiltersParserMixin(ArgsParserMixin, BaseParser, metaclass=ABCMeta):
         >>> FiltersParserMixin(r'foo(1, bar="baz")', default_rule='FILTER').data
         .foo(1, bar="baz")
 
+        The arguments to pass are computed once, to be reused each time the filter is solved:
+
+        >>> filter_ = FiltersParserMixin(r'foo(1, bar="baz")', default_rule='FILTER').data
+        >>> filter_.get_call_args() is filter_.get_call_args()
+        True
+        >>> filter_.get_call_args()[0]
+        (1,)
+        >>> FiltersParserMixin(r'foo($bar)', default_rule='FILTER').data.call_args
+
         """
 
-        return self.Filter(
+        filter_ = self.Filter(
             name=children[0],
             args=children[1],
         )
+        filter_.call_args = filter_.compute_call_args()
+        return filter_
 
     @rule('OPTIONAL_ARGS?')
     def visit_filter_args(self, _, children):
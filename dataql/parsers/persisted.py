@@ -0,0 +1,489 @@
+"""``persisted`` module of ``dataql.parsers``.
+
+It provides the ``PersistedQueries`` class, a store of queries parsed in advance, each one
+identified by an id, to allow clients to send only the id of a query instead of its text.
+
+"""
+
+from hashlib import sha256
+import json
+from threading import Lock
+
+from dataql.parsers.exceptions import PersistedQueryNotFound, QueryNotAllowed
+from dataql.resources import Resource
+from dataql.serializers.binary import BinaryDecoder, BinaryEncoder
+from dataql.serializers.canonical import fingerprint
+from dataql.serializers.exceptions import DecodeError
+
+# Names of the classes of the resources created by a ``BinaryDecoder``, taken from the parser.
+DECODED_CLASSES = ('Field', 'List', 'Object', 'Filter', 'SliceFilter', 'NamedArg', 'PosArg',
+                   'Variable')
+
+class PersistedQueries:
+    """A store of parsed queries, by id.
+
+    Queries are parsed when added to the store (for example when loaded from a file at
+    startup), so getting one from its id never uses the parser.
+
+    By default the id of a query is the hexadecimal SHA-256 hash of its text, or, with
+    ``fingerprint_ids``, the fingerprint of the parsed query (see
+    ``dataql.serializers.canonical.fingerprint``) so that texts only differing by their formatting
+    share the same id. But any id can be used.
+
+    Attributes
+    ----------
+    parser_class : class
+        The parser class (subclass of ``BaseParser``) used to parse the queries.
+    only_persisted : bool
+        If ``True``, ``resolve`` refuses to parse texts of queries not in the store.
+    fingerprint_ids : bool
+        If ``True``, the default id of a query is the fingerprint of the parsed query instead
+        of the hash of its text. Only for parsers returning resources (like ``DataQLParser``).
+    interner : dataql.resources.Interner or None
+        If set, the resources of the queries added to the store are interned with it, to share
+        their equal filters and arguments.
+
+    Example
+    -------
+
+    >>> from dataql.parsers import DataQLParser
+    >>> queries = PersistedQueries(DataQLParser)
+    >>> query_id = queries.add('foo {bar}')
+    >>> query_id
+    '50aae24c28527b2013978f8d08871be9932937c8113fa267b24f215dbb043caf'
+    >>> queries.add('baz.qux($x)', query_id='qux')
+    'qux'
+    >>> queries
+    <PersistedQueries DataQLParser (2 queries)>
+    >>> queries[query_id]
+    <Object[foo]>
+      <Field[bar] />
+    </Object[foo]>
+    >>> queries['qux']
+    <Field[baz] .baz.qux($x) />
+    >>> 'qux' in queries, 'quux' in queries
+    (True, False)
+    >>> queries['quux']
+    Traceback (most recent call last):
+    dataql.parsers.exceptions.PersistedQueryNotFound: The `quux` query is not persisted.
+
+    """
+
+    def __init__(self, parser_class, only_persisted=False, fingerprint_ids=False, interner=None):
+        """Create an empty store.
+
+        Arguments
+        ---------
+        parser_class : class
+            The parser class (subclass of ``BaseParser``) to use to parse the queries.
+        only_persisted : bool, default ``False``
+            If ``True``, ``resolve`` refuses to parse texts of queries not in the store.
+        fingerprint_ids : bool, default ``False``
+            If ``True``, the default id of a query is the fingerprint of the parsed query.
+        interner : dataql.resources.Interner, optional
+            If set, the resources of the queries added to the store are interned with it. See
+            ``dataql.resources.Interner``.
+
+        """
+
+        self.parser_class = parser_class
+        self.only_persisted = only_persisted
+        self.fingerprint_ids = fingerprint_ids
+        self.interner = interner
+        self._parser = parser_class()
+        # Text and resource of each query, by id.
+        self._queries = {}
+        self._lock = Lock()
+
+    def __repr__(self):
+        """String representation of a ``PersistedQueries`` instance.
+
+        Returns
+        -------
+        str
+            The string representation of the current ``PersistedQueries`` instance.
+
+        Example
+        -------
+
+        >>> from dataql.parsers import DataQLParser
+        >>> PersistedQueries(DataQLParser, only_persisted=True)
+        <PersistedQueries DataQLParser (0 queries, only persisted)>
+
+        """
+
+        return '<%s %s (%s queries%s)>' % (
+            self.__class__.__name__,
+            self.parser_class.__name__,
+            len(self),
+            ', only persisted' if self.only_persisted else '',
+        )
+
+    def __len__(self):
+        """Return the number of queries in the store."""
+
+        return len(self._queries)
+
+    def __contains__(self, query_id):
+        """Tells if a query with the given id is in the store."""
+
+        return query_id in self._queries
+
+    def __getitem__(self, query_id):
+        """Return the parsed query for the given id.
+
+        Raises
+        ------
+        dataql.parsers.exceptions.PersistedQueryNotFound
+            If there is no query with this id.
+
+        """
+
+        try:
+            return self._queries[query_id][1]
+        except KeyError:
+            raise PersistedQueryNotFound(query_id)
+
+    @staticmethod
+    def get_id(text):
+        """Return the default id of a query: the hexadecimal SHA-256 hash of its text.
+
+        Arguments
+        ---------
+        text : str
+            The text of the query.
+
+        Returns
+        -------
+        str
+            The id of the query.
+
+        Example
+        -------
+
+        >>> PersistedQueries.get_id('foo {bar}')
+        '50aae24c28527b2013978f8d08871be9932937c8113fa267b24f215dbb043caf'
+
+        """
+
+        return sha256(text.encode('utf-8')).hexdigest()
+
+    def add(self, text, query_id=None):
+        """Parse a query and add it to the store.
+
+        Arguments
+        ---------
+        text : str
+            The text of the query.
+        query_id : str, optional
+            The id of the query. If not set, the one from ``get_id`` is used, or the fingerprint
+            of the parsed query if ``fingerprint_ids`` is ``True``.
+
+        Returns
+        -------
+        str
+            The id of the query.
+
+        Raises
+        ------
+        dataql.parsers.exceptions.ParserError
+            If the query could not be parsed. The store is left unchanged.
+
+        Example
+        -------
+
+        >>> from dataql.parsers import DataQLParser
+        >>> queries = PersistedQueries(DataQLParser, fingerprint_ids=True)
+        >>> queries.add('foo {bar(a=1, b=2)}')
+        '410d232c6ec8b40917b367ca5fdff21940f8b1bc8dbadf0d7e4931374e472fe7'
+        >>> queries.add('foo{ bar(b:2, a:1), }')
+        '410d232c6ec8b40917b367ca5fdff21940f8b1bc8dbadf0d7e4931374e472fe7'
+        >>> len(queries)
+        1
+
+        """
+
+        resource = self.intern(self._parser.parse(text))
+
+        if query_id is None:
+            query_id = fingerprint(resource) if self.fingerprint_ids else self.get_id(text)
+
+        with self._lock:
+            self._queries[query_id] = (text, resource)
+
+        return query_id
+
+    def intern(self, resource):
+        """Intern the resource with the ``interner``, if any, and return it.
+
+        Example
+        -------
+
+        >>> from dataql.parsers import DataQLParser
+        >>> from dataql.resources import Interner
+        >>> queries = PersistedQueries(DataQLParser, interner=Interner())
+        >>> queries.add('foo.bar(1)', query_id='foo')
+        'foo'
+        >>> queries.add('baz.bar(1)', query_id='baz')
+        'baz'
+        >>> queries['foo'].filters[1] is queries['baz'].filters[1]
+        True
+
+        """
+
+        if self.interner is not None and isinstance(resource, Resource):
+            self.interner.intern(resource)
+        return resource
+
+    def resolve(self, query_id=None, text=None):
+        """Return the parsed query for the given id, or text if allowed.
+
+        Arguments
+        ---------
+        query_id : str, optional
+            The id of the query to use.
+        text : str, optional
+            The text of the query to use if no id given or if the query is not persisted.
+            It is parsed, but not added to the store.
+
+        Returns
+        -------
+        (depends on the default rule of the parser, a ``Resource`` for ``DataQLParser``)
+            The parsed query.
+
+        Raises
+        ------
+        dataql.parsers.exceptions.PersistedQueryNotFound
+            If there is no query with this id (or no id), and no text given.
+        dataql.parsers.exceptions.QueryNotAllowed
+            If the text had to be used, but ``only_persisted`` is ``True``.
+        dataql.parsers.exceptions.ParserError
+            If the text had to be used, and could not be parsed.
+
+        Example
+        -------
+
+        >>> from dataql.parsers import DataQLParser
+        >>> queries = PersistedQueries(DataQLParser)
+        >>> queries.add('foo', query_id='foo')
+        'foo'
+        >>> queries.resolve('foo')
+        <Field[foo] />
+        >>> queries.resolve('bar', 'bar')
+        <Field[bar] />
+        >>> queries.resolve(text='baz')
+        <Field[baz] />
+        >>> 'bar' in queries, len(queries)
+        (False, 1)
+        >>> queries.resolve('bar')
+        Traceback (most recent call last):
+        dataql.parsers.exceptions.PersistedQueryNotFound: The `bar` query is not persisted.
+        >>> queries.only_persisted = True
+        >>> queries.resolve('foo', 'foo')
+        <Field[foo] />
+        >>> queries.resolve('bar', 'bar')
+        Traceback (most recent call last):
+        dataql.parsers.exceptions.QueryNotAllowed: Only persisted queries are allowed, got: "bar"
+
+        """
+
+        if query_id is not None:
+            try:
+                return self._queries[query_id][1]
+            except KeyError:
+                pass
+
+        if text is None:
+            raise PersistedQueryNotFound(query_id)
+
+        if self.only_persisted:
+            raise QueryNotAllowed(text)
+
+        return self._parser.parse(text)
+
+    def load(self, path):
+        """Parse and add all the queries from a JSON file.
+
+        Arguments
+        ---------
+        path : str
+            The path of a JSON file containing an object with ids as keys and texts of queries
+            as values, like the one written by ``dump``.
+
+        Returns
+        -------
+        int
+            The number of queries loaded.
+
+        Raises
+        ------
+        dataql.parsers.exceptions.ParserError
+            If a query could not be parsed. Queries before it in the file are added.
+
+        Example
+        -------
+
+        >>> import os
+        >>> from tempfile import TemporaryDirectory
+        >>> from dataql.parsers import DataQLParser
+        >>> queries = PersistedQueries(DataQLParser)
+        >>> queries.add('foo {bar}', query_id='foo')
+        'foo'
+        >>> queries.add('baz')
+        'baa5a0964d3320fbc0c6a922140453c8513ea24ab8fd0577034804a967248096'
+        >>> with TemporaryDirectory() as directory:
+        ...     path = os.path.join(directory, 'queries.json')
+        ...     queries.dump(path)
+        ...     other_queries = PersistedQueries(DataQLParser, only_persisted=True)
+        ...     other_queries.load(path)
+        2
+        >>> other_queries.resolve('foo')
+        <Object[foo]>
+          <Field[bar] />
+        </Object[foo]>
+
+        """
+
+        with open(path, encoding='utf-8') as file:
+            texts = json.load(file)
+
+        for query_id, text in texts.items():
+            self.add(text, query_id)
+
+        return len(texts)
+
+    def dump(self, path):
+        """Write all the queries in a JSON file, to be loaded by ``load``.
+
+        Arguments
+        ---------
+        path : str
+            The path of the JSON file to write.
+
+        """
+
+        with self._lock:
+            texts = {query_id: query[0] for query_id, query in self._queries.items()}
+
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(texts, file, indent=2, sort_keys=True)
+
+    def load_binary(self, path):
+        """Add all the queries from a binary file, without parsing them.
+
+        The resources are decoded with a ``BinaryDecoder``, which is a lot faster than parsing
+        the texts of the queries, to load a lot of them at startup. It creates the resources with
+        the classes of ``parser_class``, like the parser does.
+
+        Arguments
+        ---------
+        path : str
+            The path of a binary file written by ``dump_binary``.
+
+        Returns
+        -------
+        int
+            The number of queries loaded.
+
+        Raises
+        ------
+        dataql.serializers.exceptions.DecodeError
+            If the file is not valid. Queries before the invalid one are added.
+
+        Example
+        -------
+
+        >>> import os
+        >>> from tempfile import TemporaryDirectory
+        >>> from dataql.parsers import DataQLParser
+        >>> queries = PersistedQueries(DataQLParser)
+        >>> queries.add('foo {bar}', query_id='foo')
+        'foo'
+        >>> queries.add('baz.qux($x)', query_id='baz')
+        'baz'
+        >>> with TemporaryDirectory() as directory:
+        ...     path = os.path.join(directory, 'queries.bin')
+        ...     queries.dump_binary(path)
+        ...     other_queries = PersistedQueries(DataQLParser, only_persisted=True)
+        ...     other_queries.load_binary(path)
+        2
+        >>> other_queries.resolve('foo')
+        <Object[foo]>
+          <Field[bar] />
+        </Object[foo]>
+        >>> other_queries.resolve('baz')
+        <Field[baz] .baz.qux($x) />
+
+        Resources are created with the classes of the parser, like when parsing the texts:
+
+        >>> from dataql.resources import Field
+        >>> class MyField(Field):
+        ...     pass
+        >>> class MyParser(DataQLParser):
+        ...     Field = MyField
+        >>> queries = PersistedQueries(MyParser)
+        >>> queries.add('foo.bar', query_id='foo')
+        'foo'
+        >>> with TemporaryDirectory() as directory:
+        ...     path = os.path.join(directory, 'queries.bin')
+        ...     queries.dump_binary(path)
+        ...     other_queries = PersistedQueries(MyParser)
+        ...     other_queries.load_binary(path)
+        1
+        >>> other_queries.resolve('foo')
+        <MyField[foo] .foo.bar />
+
+        """
+
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        decoder = BinaryDecoder()
+        # Create the resources with the same classes as the ones the parser uses.
+        for name in DECODED_CLASSES:
+            setattr(decoder, name, getattr(self.parser_class, name))
+        count = 0
+        pos = 0
+        try:
+            while pos < len(data):
+                query_id, pos = decoder.read_str(data, pos)
+                text, pos = decoder.read_str(data, pos)
+                length, pos = decoder.read_uint(data, pos)
+                resource = self.intern(decoder.decode(data[pos:pos + length]))
+                pos += length
+                with self._lock:
+                    self._queries[query_id] = (text, resource)
+                count += 1
+        except IndexError:
+            raise DecodeError('Truncated data', len(data)) from None
+
+        return count
+
+    def dump_binary(self, path):
+        """Write all the queries in a binary file, to be loaded by ``load_binary``.
+
+        For each query, the file holds its id, its text, and its resource encoded with a
+        ``BinaryEncoder``, so only parsers returning resources (like ``DataQLParser``) can be
+        used.
+
+        Arguments
+        ---------
+        path : str
+            The path of the binary file to write.
+
+        """
+
+        with self._lock:
+            queries = list(self._queries.items())
+
+        encoder = BinaryEncoder()
+        out = bytearray()
+        for query_id, (text, resource) in queries:
+            data = encoder.encode(resource)
+            encoder.write_str(out, query_id)
+            encoder.write_str(out, text)
+            encoder.write_uint(out, len(data))
+            out += data
+
+        with open(path, 'wb') as file:
+            file.write(out)
@@ -0,0 +1,310 @@
+"""``profiling`` module of ``dataql.parsers``.
+
+It provides the ``RuleProfiler`` class, to know which rules of the grammar of a parser are
+responsible for the time spent to parse queries, in both the match phase (``parsimonious``
+matching the text with the grammar) and the visit phase (the ``visit_*`` methods).
+
+"""
+
+from time import perf_counter
+
+from dataql.parsers.cache import compile_grammar
+
+
+class RuleStats:
+    """Statistics about one rule of a grammar, collected by a ``RuleProfiler``.
+
+    Attributes
+    ----------
+    name : str
+        The name of the rule.
+    attempts : int
+        Number of times the rule was tried to match the text at some position (including the
+        times the match was found in the packrat cache).
+    matches : int
+        Number of these attempts that matched.
+    match_time : float
+        Time, in seconds, spent to match the rule, without the time spent in other named rules
+        tried by this one.
+    total_match_time : float
+        Time, in seconds, spent to match the rule, including the time spent in other named rules
+        tried by this one. For recursive rules, only the outermost attempts are counted.
+    visits : int
+        Number of calls to the ``visit_*`` method of the rule.
+    visit_time : float
+        Time, in seconds, spent in the ``visit_*`` method of the rule.
+
+    """
+
+    __slots__ = (
+        'name',
+        'attempts',
+        'matches',
+        'match_time',
+        'total_match_time',
+        'visits',
+        'visit_time',
+        'depth',
+    )
+
+    def __init__(self, name):
+        """Create empty statistics for the rule with the given name."""
+
+        self.name = name
+        self.attempts = self.matches = self.visits = 0
+        self.match_time = self.total_match_time = self.visit_time = 0.0
+        # Number of attempts of the rule currently running, to manage recursion.
+        self.depth = 0
+
+    def __repr__(self):
+        """String representation of a ``RuleStats`` instance.
+
+        Returns
+        -------
+        str
+            The string representation of the current ``RuleStats`` instance.
+
+        Example
+        -------
+
+        >>> RuleStats('IDENT')
+        <RuleStats IDENT: 0/0 matches, 0 visits>
+
+        """
+
+        return '<%s %s: %s/%s matches, %s visits>' % (
+            self.__class__.__name__,
+            self.name,
+            self.matches,
+            self.attempts,
+            self.visits,
+        )
+
+
+class RuleProfiler:
+    """Parse texts with a parser class while collecting statistics for each rule.
+
+    The profiler uses its own copy of the grammar of the parser class, with each named rule
+    wrapped to measure its matches, and its own parser instance, with each ``visit_*`` method
+    wrapped to measure its visits. So profiling doesn't slow down other parsers, but a profiler
+    must not be used by many threads at the same time.
+
+    The grammar is always used, even if the parser class has a ``backend``.
+
+    Attributes
+    ----------
+    parser_class : class
+        The parser class (subclass of ``BaseParser``) to profile.
+    parser : BaseParser
+        The instance of ``parser_class`` used to parse the texts.
+    stats : dict
+        The ``RuleStats`` of each rule, by name.
+
+    Example
+    -------
+
+    >>> from dataql.parsers import DataQLParser
+    >>> profiler = RuleProfiler(DataQLParser)
+    >>> profiler.parse('foo {bar, baz.qux(1)}')
+    <Object[foo]>
+      <Field[bar] />
+      <Field[baz] .baz.qux(1) />
+    </Object[foo]>
+    >>> profiler.stats['NAMED_OBJECT']
+    <RuleStats NAMED_OBJECT: 1/3 matches, 1 visits>
+    >>> profiler.stats['IDENT']
+    <RuleStats IDENT: 7/7 matches, 4 visits>
+    >>> profiler.stats['ROOT'].total_match_time >= profiler.stats['ROOT'].match_time
+    True
+    >>> print(profiler.report(limit=2)) # doctest: +ELLIPSIS
+    rule                  attempts  matches   match (ms)   total (ms)   visits   visit (ms)
+    ...
+    <BLANKLINE>
+    ...
+
+    """
+
+    def __init__(self, parser_class, default_rule=None):
+        """Create the profiler, with its own grammar and parser.
+
+        Arguments
+        ---------
+        parser_class : class
+            The parser class (subclass of ``BaseParser``) to profile.
+        default_rule : str, optional
+            A default rule to use to override the default one of the parser class.
+
+        """
+
+        self.parser_class = parser_class
+        self.stats = {}
+        # Stack of the time spent in named rules tried by each rule currently running.
+        self._children_times = []
+
+        self.parser = parser_class(None, default_rule)
+        self.parser.use_backend = False
+
+        grammar = compile_grammar(
+            parser_class.grammar_str,
+            default_rule or getattr(parser_class, 'default_rule', None)
+        )
+        wrapped = set()
+        for expression in grammar.values():
+            if id(expression) not in wrapped and expression.name:
+                wrapped.add(id(expression))
+                self.wrap_expression(expression)
+        self.parser.grammar = grammar
+
+        self.parser.visitors = {
+            name: self.wrap_visitor(name, method)
+            for name, method in parser_class.visitors.items()
+        }
+
+    def __repr__(self):
+        """String representation of a ``RuleProfiler`` instance.
+
+        Returns
+        -------
+        str
+            The string representation of the current ``RuleProfiler`` instance.
+
+        Example
+        -------
+
+        >>> from dataql.parsers import DataQLParser
+        >>> RuleProfiler(DataQLParser)
+        <RuleProfiler DataQLParser>
+
+        """
+
+        return '<%s %s>' % (self.__class__.__name__, self.parser_class.__name__)
+
+    def get_stats(self, name):
+        """Return the ``RuleStats`` of the rule with the given name, created if needed."""
+        try:
+            return self.stats[name]
+        except KeyError:
+            stats = self.stats[name] = RuleStats(name)
+            return stats
+
+    def wrap_expression(self, expression):
+        """Replace ``match_core`` of the expression of a named rule to collect its statistics."""
+        stats = self.get_stats(expression.name)
+        match_core = expression.match_core
+        children_times = self._children_times
+
+        def profiled_match_core(text, pos, cache, error):
+            """Call the original ``match_core``, and update the statistics of the rule."""
+            children_times.append(0.0)
+            stats.depth += 1
+            start = perf_counter()
+            try:
+                node = match_core(text, pos, cache, error)
+            finally:
+                duration = perf_counter() - start
+                stats.depth -= 1
+                stats.match_time += duration - children_times.pop()
+                if not stats.depth:
+                    stats.total_match_time += duration
+                if children_times:
+                    children_times[-1] += duration
+            stats.attempts += 1
+            if node is not None:
+                stats.matches += 1
+            return node
+
+        expression.match_core = profiled_match_core
+
+    def wrap_visitor(self, name, method):
+        """Return the ``visit_*`` method wrapped to collect the statistics of the rule."""
+        stats = self.get_stats(name)
+
+        def profiled_visitor(parser, node, children):
+            """Call the original method, and update the statistics of the rule."""
+            start = perf_counter()
+            try:
+                return method(parser, node, children)
+            finally:
+                stats.visit_time += perf_counter() - start
+                stats.visits += 1
+
+        return profiled_visitor
+
+    def parse(self, text):
+        """Parse the text with the parser, collecting statistics.
+
+        Arguments
+        ---------
+        text : str
+            The text to parse.
+
+        Returns
+        -------
+        (depends on the rule)
+            The result of the parsing, like ``BaseParser.parse``.
+
+        """
+
+        return self.parser.parse(text)
+
+    def reset(self):
+        """Reset the statistics of all rules.
+
+        Example
+        -------
+
+        >>> from dataql.parsers import DataQLParser
+        >>> profiler = RuleProfiler(DataQLParser)
+        >>> profiler.parse('foo')
+        <Field[foo] />
+        >>> profiler.reset()
+        >>> profiler.stats['IDENT']
+        <RuleStats IDENT: 0/0 matches, 0 visits>
+
+        """
+
+        for stats in self.stats.values():
+            stats.__init__(stats.name)
+
+    def report(self, limit=None):
+        """Return a report of the statistics, as a table, the most expensive rules first.
+
+        Rules are sorted by the time spent in the match phase (without the time spent in other
+        rules) and the visit phase. Rules never tried are not included.
+
+        Arguments
+        ---------
+        limit : int, optional
+            The maximum number of rules to include. All by default.
+
+        Returns
+        -------
+        str
+            The report, one line by rule, with a header line and a line with the totals.
+
+        """
+
+        rules = sorted(
+            (stats for stats in self.stats.values() if stats.attempts or stats.visits),
+            key=lambda stats: (-(stats.match_time + stats.visit_time), stats.name)
+        )
+
+        line = '%-20s %9s %8s %12s %12s %8s %12s'
+        lines = [line % ('rule', 'attempts', 'matches', 'match (ms)', 'total (ms)', 'visits',
+                         'visit (ms)')]
+        for stats in rules[:limit]:
+            lines.append(line % (
+                stats.name,
+                stats.attempts,
+                stats.matches,
+                '%.3f' % (stats.match_time * 1e3),
+                '%.3f' % (stats.total_match_time * 1e3),
+                stats.visits,
+                '%.3f' % (stats.visit_time * 1e3),
+            ))
+        lines.append('')
+        lines.append('total: %.3f ms to match, %.3f ms to visit' % (
+            sum(stats.match_time for stats in rules) * 1e3,
+            sum(stats.visit_time for stats in rules) * 1e3,
+        ))
+        return '\n'.join(lines)
@@ -18,6 +18,7 @@ previous filter).
 A ``Filter`` may be an attribute, that may be callable (which can have arguments if any
 (``NamedArg`` and ``PosArg``), but it could also be a standalone function (taking the value
 as first argument, and then the other arguments)
+The value of an argument may be a ``Variable``, replaced by its real value when solving.
 A ``SliceFilter`` allows to retrieve one or more entries of an iterable.
 When all filters are applied, the final value is coerced (number, string... for ``Field``,
 dictionary for ``Object`` and list for ``List``).
@@ -33,9 +34,12 @@ To use subclasses of the classes defined here, they must be set on the parser:
 
 """
 
-__all__ = ('Field', 'List', 'Object', 'Filter', 'NamedArg', 'PosArg')
+__all__ = ('Field', 'List', 'Object', 'Filter', 'NamedArg', 'PosArg', 'Variable', 'Interner',
+           'Frozen', 'freeze')
 
 from abc import ABCMeta
+from weakref import WeakValueDictionary
+from types import MappingProxyType
 
 
 class WithParent(metaclass=ABCMeta):
@@ -160,7 +164,8 @@ class Resource(WithParent, metaclass=ABCMeta):
 
         filters = ''
         if len(self.filters) > 1 or self.filters and (
-                self.filters[0].name != self.name or self.filters[0].args):
+                not isinstance(self.filters[0], Filter)
+                or self.filters[0].name != self.name or self.filters[0].args):
             filters = ' ' + ''.join(map(str, self.filters))
 
         result = '%(indent)s<%(cls)s%(name)s%(filters)s />' % {
@@ -171,6 +176,21 @@ class Resource(WithParent, metaclass=ABCMeta):
         }
         return result
 
+    def get_key(self):
+        """Return a tuple identifying the content of the resource (but not its parent).
+
+        It's used by frozen resources (see ``Frozen``) to compare and hash them.
+
+        Example
+        -------
+
+        >>> Field('foo', filters=[Filter('bar')], is_root=True).get_key()
+        ('foo', True, (.bar,))
+
+        """
+
+        return (self.name, self.is_root, tuple(self.filters))
+
 
 class Field(Resource):
     """A simple field to retrieve from a value by using its filters."""
@@ -263,6 +283,20 @@ class MultiResources(Resource, metaclass=ABCMeta):
         else:
             return parent_repr
 
+    def get_key(self):
+        """Return a tuple identifying the content of the resource, including its sub-resources.
+
+        Example
+        -------
+
+        >>> key = MultiResources('foo', resources=[Field('bar')]).get_key()
+        >>> key[:3], key[3][0].name
+        (('foo', False, (.foo,)), 'bar')
+
+        """
+
+        return super().get_key() + (tuple(self.resources), )
+
 
 class List(MultiResources):
     """A ``MultiResources`` subclass to represent list of values."""
@@ -295,12 +329,18 @@ class Filter(BaseFilter):
     args : list, optional
         List of arguments to pass to the attribute if callable. If ``None``, the attribute is
         assumed not to be callable.
+    call_args : tuple, optional
+        The positioned and named arguments returned by ``get_call_args``, computed once by
+        ``compute_call_args`` when the filter is final (it's done for frozen filters, and for
+        filters created by the parsers). ``None`` if not computed, or if some arguments are
+        variables. Must be reset to ``None`` (or computed again) if ``args`` is modified.
 
     """
 
     __slots__ = BaseFilter.__slots__ + (
         'name',
         'args',
+        'call_args',
     )
 
     def __init__(self, name, args=None):
@@ -325,6 +365,8 @@ class Filter(BaseFilter):
             for arg in self.args:
                 arg.set_parent(self)
 
+        self.call_args = None
+
     def __repr__(self):
         """String representation of a ``Filter`` instance.
 
@@ -352,18 +394,58 @@ class Filter(BaseFilter):
             'args': ', '.join(map(str, self.args)) if self.args else '',
         }
 
-    def get_args_and_kwargs(self):
+    def get_key(self):
+        """Return a tuple identifying the filter by its name and arguments (not its parent).
+
+        Example
+        -------
+
+        >>> Filter('foo').get_key()
+        ('foo', None)
+        >>> Filter('foo', args=[PosArg(1)]).get_key()
+        ('foo', (1,))
+
+        """
+
+        return (self.name, None if self.args is None else tuple(self.args))
+
+    def get_args_and_kwargs(self, variables=None):
         """Return a list and a dict usable as ``*args, **kwargs`` to pass to a callable."
 
         If the entity is known to not accept arguments (``self.args`` is ``None``), then this
         method returns ``None`` for both args and kwargs.
 
+        Arguments
+        ---------
+        variables : dict, optional
+            The values to use for the arguments having a ``Variable`` as value, by name of the
+            variables.
+
         Returns
         -------
         tuple (list or None, dict or None)
             A tuple with as first value, the list of positioned arguments (or ``None``), and as
             second value the dict of named arguments (or ``None``)
 
+        Raises
+        ------
+        KeyError
+            If a variable is not defined in ``variables``.
+
+        Example
+        -------
+
+        >>> Filter('foo', args=[PosArg(1), NamedArg('a', '=', 2)]).get_args_and_kwargs()
+        ([1], {'a': 2})
+        >>> Filter('foo', args=[
+        ...     PosArg(Variable('bar')),
+        ...     NamedArg('a', '=', Variable('baz'))
+        ... ]).get_args_and_kwargs({'bar': 1, 'baz': 2})
+        ([1], {'a': 2})
+        >>> Filter('foo', args=[PosArg(Variable('bar'))]).get_args_and_kwargs()
+        Traceback (most recent call last):
+        KeyError: 'bar'
+
         """
 
         args = None
@@ -373,13 +455,95 @@ class Filter(BaseFilter):
             args = []
             kwargs = {}
             for arg in self.args:
+                value = arg.value
+                if isinstance(value, Variable):
+                    value = value.resolve(variables)
                 if arg.is_named:
-                    kwargs[arg.arg] = arg.value
+                    kwargs[arg.arg] = value
                 else:
-                    args.append(arg.value)
+                    args.append(value)
 
         return args, kwargs
 
+    def compute_call_args(self):
+        """Return the arguments of ``get_args_and_kwargs`` in containers that cannot be modified.
+
+        The result is meant to be saved in ``call_args`` when the filter is final, ie it will
+        not be modified anymore, to be used by ``get_call_args`` each time the filter is solved.
+
+        Returns
+        -------
+        tuple (tuple or None, mappingproxy or None) or None
+            A tuple with the positioned arguments as a tuple, and the named arguments as a
+            read-only dict (or ``None`` for both if the filter has no arguments), or ``None`` if
+            some arguments are variables.
+
+        Example
+        -------
+
+        >>> filter_ = Filter('foo', args=[PosArg(1), NamedArg('a', '=', 2)])
+        >>> args, kwargs = filter_.compute_call_args()
+        >>> args, dict(kwargs)
+        ((1,), {'a': 2})
+        >>> kwargs['a'] = 3
+        Traceback (most recent call last):
+        TypeError: 'mappingproxy' object does not support item assignment
+        >>> Filter('foo').compute_call_args()
+        (None, None)
+        >>> Filter('foo', args=[PosArg(Variable('bar'))]).compute_call_args()
+
+        """
+
+        if self.args and any(isinstance(arg.value, Variable) for arg in self.args):
+            return None
+
+        args, kwargs = self.get_args_and_kwargs()
+        return (
+            None if args is None else tuple(args),
+            None if kwargs is None else MappingProxyType(kwargs),
+        )
+
+    def get_call_args(self, variables=None):
+        """Return the arguments to pass to a callable, like ``get_args_and_kwargs``.
+
+        If ``call_args`` is set, it is returned without computing anything, else the result of
+        ``get_args_and_kwargs`` is returned. In both cases, the arguments must not be modified.
+
+        Arguments
+        ---------
+        variables : dict, optional
+            The values to use for the arguments having a ``Variable`` as value, by name of the
+            variables.
+
+        Returns
+        -------
+        tuple
+            A tuple with the positioned arguments (or ``None``), and the named arguments (or
+            ``None``).
+
+        Raises
+        ------
+        KeyError
+            If a variable is not defined in ``variables``.
+
+        Example
+        -------
+
+        >>> filter_ = Filter('foo', args=[PosArg(1), NamedArg('a', '=', 2)])
+        >>> filter_.get_call_args()
+        ([1], {'a': 2})
+        >>> filter_.call_args = filter_.compute_call_args()
+        >>> filter_.get_call_args() is filter_.call_args
+        True
+        >>> freeze(filter_).get_call_args()[0]
+        (1,)
+
+        """
+
+        if self.call_args is not None:
+            return self.call_args
+        return self.get_args_and_kwargs(variables)
+
 
 class SliceFilter(BaseFilter):
     """A slice used as a filter to get one or many entries from an iterable.
@@ -469,6 +633,28 @@ class SliceFilter(BaseFilter):
                 self.slice.step,
             )
 
+    def get_key(self):
+        """Return a tuple identifying the index or slice (not its parent).
+
+        The types of the values are included, as ``1``, ``1.0`` and ``True`` are equal in python.
+
+        Example
+        -------
+
+        >>> SliceFilter(1).get_key()
+        (<class 'int'>, 1)
+        >>> SliceFilter(slice(1, None, None)).get_key()
+        (None, <class 'int'>, 1, <class 'NoneType'>, None, <class 'NoneType'>, None)
+
+        """
+
+        if self.slice is None:
+            return (self.index.__class__, self.index)
+        return (None, ) + sum((
+            (value.__class__, value)
+            for value in (self.slice.start, self.slice.stop, self.slice.step)
+        ), ())
+
 
 class Arg(WithParent):
     """Base class for resource or filter arguments.
@@ -543,6 +729,21 @@ class Arg(WithParent):
             'value': value,
         }
 
+    def get_key(self):
+        """Return a tuple identifying the argument by its name, type and value (not its parent).
+
+        The type of the value is included, as ``1``, ``1.0`` and ``True`` are equal in python.
+
+        Example
+        -------
+
+        >>> NamedArg('foo', '=', 1).get_key()
+        ('foo', '=', <class 'int'>, 1)
+
+        """
+
+        return (self.arg, self.type, self.value.__class__, self.value)
+
     @property
     def is_named(self):
         """Property telling if the argument is named or not.
@@ -569,3 +770,529 @@ class PosArg(Arg):
 class NamedArg(Arg):
     """Named argument. It has a name and a type."""
     pass
+
+
+class Variable:
+    """A variable used as the value of an argument, to be replaced by a real value when solving.
+
+    It allows to parse a query once and to solve it many times with different values.
+
+    Attributes
+    ----------
+    name : string
+        The name of the variable, used to find its value.
+
+    Example
+    -------
+
+    >>> Variable('foo')
+    $foo
+    >>> Variable('foo') == Variable('foo'), Variable('foo') == Variable('bar')
+    (True, False)
+    >>> PosArg(Variable('foo')), NamedArg('bar', '=', Variable('foo'))
+    ($foo, bar=$foo)
+
+    """
+
+    __slots__ = (
+        'name',
+    )
+
+    def __init__(self, name):
+        """Save attributes.
+
+        Arguments
+        ---------
+        name : string
+
+        """
+
+        self.name = name
+
+    def __repr__(self):
+        """String representation of a ``Variable`` instance: its name prefixed by ``$``."""
+
+        return '$%s' % self.name
+
+    def __eq__(self, other):
+        """Two variables are equal if they have the same class and name."""
+
+        return self.__class__ is other.__class__ and self.name == other.name
+
+    def __hash__(self):
+        """Hash based on the name of the variable."""
+
+        return hash((self.__class__, self.name))
+
+    def resolve(self, variables):
+        """Return the value of the variable.
+
+        Arguments
+        ---------
+        variables : dict, or None
+            The values of the variables, by name.
+
+        Returns
+        -------
+        ?
+            The value for the name of the variable.
+
+        Raises
+        ------
+        KeyError
+            If the variable is not defined in ``variables``.
+
+        Example
+        -------
+
+        >>> Variable('foo').resolve({'foo': 1})
+        1
+        >>> Variable('foo').resolve(None)
+        Traceback (most recent call last):
+        KeyError: 'foo'
+
+        """
+
+        if variables is None:
+            raise KeyError(self.name)
+        return variables[self.name]
+
+
+class Interner:
+    """Share equal filters and arguments between resources trees, to save memory.
+
+    Large queries often repeat the same filters (``.name``, ``.strftime('%x')``, ``[0]``...).
+    When a tree is interned, each of its filters is replaced by the first equal filter seen by
+    the interner (same class, name and arguments, or same slice), and the arguments of the
+    filters are shared the same way. Equal filters are then detected by identity.
+
+    The interner only keeps weak references to the shared filters and arguments, so they are
+    forgotten when no tree uses them anymore, like the trees evicted from a ``ParseCache``.
+
+    Notes
+    -----
+    As they may be used in many places, interned filters and arguments have no parent. And they
+    must not be modified.
+
+    Frozen trees (see ``freeze``) are left as they are: they cannot be modified, and can already
+    be compared and hashed.
+
+    Example
+    -------
+
+    >>> interner = Interner()
+    >>> first = Object('foo', resources=[
+    ...     Field('bar', filters=[Filter('bar'), Filter('strftime', args=[PosArg('%x')])]),
+    ...     Field('baz', filters=[Filter('baz'), Filter('strftime', args=[PosArg('%x')])]),
+    ... ])
+    >>> interner.intern(first) is first
+    True
+    >>> first.resources[0].filters[1] is first.resources[1].filters[1]
+    True
+    >>> first.resources[0].filters[1].parent is None
+    True
+    >>> second = Field('bar', filters=[Filter('bar'), Filter('strftime', args=[PosArg('%y')])])
+    >>> interner.intern(second).filters[0] is first.resources[0].filters[0]
+    True
+    >>> second.filters[1].args[0] is first.resources[0].filters[1].args[0]
+    False
+    >>> len(interner)  # foo, bar, baz, strftime('%x'), '%x', strftime('%y'), '%y'
+    7
+
+    Values of arguments of different types are never shared, even if equal:
+
+    >>> third = Field('foo', filters=[Filter('foo', args=[PosArg(1), PosArg(True)])])
+    >>> interner.intern(third).filters[0].args
+    [1, True]
+
+    Filters and arguments not used anymore are forgotten:
+
+    >>> fourth = Field('qux', filters=[Filter('qux', args=[PosArg('%z')])])
+    >>> interner.intern(fourth) is fourth
+    True
+    >>> size = len(interner)
+    >>> del fourth
+    >>> len(interner) == size - 2
+    True
+
+    And frozen trees are not modified:
+
+    >>> frozen = freeze(Field('bar', filters=[Filter('bar')]))
+    >>> interner.intern(frozen).filters[0] is first.resources[0].filters[0]
+    False
+
+    """
+
+    def __init__(self):
+        """Create an empty interner."""
+
+        # The shared filters and arguments, by key (see ``get_filter_key`` and ``get_arg_key``),
+        # only kept while used by a tree.
+        self._nodes = WeakValueDictionary()
+
+    def __len__(self):
+        """Return the number of shared filters and arguments."""
+
+        return len(self._nodes)
+
+    def clear(self):
+        """Forget all the shared filters and arguments. Interned trees are left unchanged."""
+
+        self._nodes.clear()
+
+    def intern(self, resource):
+        """Replace, in place, the filters of the resource and its sub-resources by shared ones.
+
+        Arguments
+        ---------
+        resource : Resource
+            The resource to intern, with all its sub-resources.
+
+        Returns
+        -------
+        Resource
+            The given resource.
+
+        """
+
+        stack = [resource]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, Frozen):
+                continue
+            current.filters = [self.intern_filter(filter_) for filter_ in current.filters]
+            if isinstance(current, MultiResources):
+                stack.extend(current.resources)
+        return resource
+
+    def intern_filter(self, filter_):
+        """Return the shared filter equal to the given one. It's the given one if it's new.
+
+        A frozen filter is returned as is, as it cannot be modified to be shared.
+
+        """
+
+        if isinstance(filter_, Frozen):
+            return filter_
+
+        try:
+            key = self.get_filter_key(filter_)
+        except TypeError:
+            # An unhashable value: this filter cannot be shared.
+            return filter_
+
+        try:
+            return self._nodes[key]
+        except KeyError:
+            pass
+
+        if isinstance(filter_, Filter) and filter_.args:
+            filter_.args = [self.intern_arg(arg) for arg in filter_.args]
+        filter_.parent = None
+        # ``setdefault`` in case another thread added an equal one in the meantime.
+        return self._nodes.setdefault(key, filter_)
+
+    def intern_arg(self, arg):
+        """Return the shared argument equal to the given one. It's the given one if it's new."""
+
+        if isinstance(arg, Frozen):
+            return arg
+
+        key = self.get_arg_key(arg)
+
+        try:
+            return self._nodes[key]
+        except KeyError:
+            pass
+
+        arg.parent = None
+        return self._nodes.setdefault(key, arg)
+
+    @staticmethod
+    def get_value_key(value):
+        """Return a key for a value, including its type (so ``1``, ``1.0`` and ``True`` differ)."""
+
+        return (value.__class__, value)
+
+    def get_arg_key(self, arg):
+        """Return a key identifying an argument by its class, name, type and value."""
+
+        return (arg.__class__, arg.arg, arg.type, self.get_value_key(arg.value))
+
+    def get_filter_key(self, filter_):
+        """Return a key identifying a filter by its class and content.
+
+        Raises
+        ------
+        TypeError
+            If a value in the filter is not hashable.
+
+        """
+
+        if isinstance(filter_, SliceFilter):
+            if filter_.slice is None:
+                return (filter_.__class__, self.get_value_key(filter_.index))
+            return (filter_.__class__, None) + tuple(
+                self.get_value_key(value)
+                for value in (filter_.slice.start, filter_.slice.stop, filter_.slice.step)
+            )
+
+        return (
+            filter_.__class__,
+            filter_.name,
+            None if filter_.args is None else tuple(self.get_arg_key(arg) for arg in filter_.args)
+        )
+
+
+class Frozen(metaclass=ABCMeta):
+    """Mixin to make resources, filters and arguments immutable, hashable, and comparable.
+
+    Frozen objects are created by ``freeze``, which uses subclasses of the usual classes with
+    this mixin: ``FrozenField``, ``FrozenObject``, ``FrozenList``, ``FrozenFilter``,
+    ``FrozenSliceFilter``, ``FrozenPosArg`` and ``FrozenNamedArg`` (created on the fly for other
+    subclasses), so solvers handle them like the usual ones.
+
+    Once created, a frozen object cannot be modified: its ``filters``, ``resources`` and ``args``
+    are tuples of frozen objects, and setting an attribute raises an ``AttributeError``. So a
+    frozen tree can safely be shared by many threads, and used as a key in a dict.
+
+    Two frozen objects are equal if they have the same class and content (see the ``get_key``
+    methods), whatever their parents. The hash is computed once, at creation time, using the
+    ones of the children, so unequal trees are compared in constant time most of the time.
+
+    Notes
+    -----
+    The parent of a frozen object can only be set once, by the frozen resource or filter using
+    it when created: a frozen object should not be used in many frozen trees.
+
+    Example
+    -------
+
+    >>> resource = freeze(Object('foo', resources=[Field('bar', filters=[Filter('bar')])]))
+    >>> resource
+    <FrozenObject[foo]>
+      <FrozenField[bar] />
+    </FrozenObject[foo]>
+    >>> resource.resources.__class__, resource.resources[0].filters
+    (<class 'tuple'>, (.bar,))
+    >>> resource.resources[0].parent is resource
+    True
+    >>> resource == freeze(Object('foo', resources=[Field('bar')]))
+    True
+    >>> resource == freeze(Object('foo', resources=[Field('baz')]))
+    False
+    >>> len({resource, freeze(Object('foo', resources=[Field('bar')]))})
+    1
+    >>> resource.name = 'baz'
+    Traceback (most recent call last):
+    AttributeError: Cannot set `name` on the immutable `FrozenObject` object.
+    >>> freeze(PosArg(1)) == freeze(PosArg(True))
+    False
+
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        """Create the object, then freeze its children and compute its hash.
+
+        The arguments are the ones of the usual class. Children that are not frozen are replaced
+        by frozen copies.
+
+        """
+
+        super().__init__(*args, **kwargs)
+
+        for name in ('filters', 'resources', 'args'):
+            children = getattr(self, name, None)
+            if children is not None:
+                children = tuple(freeze(child) for child in children)
+                for child in children:
+                    child.set_parent(self)
+                setattr(self, name, children)
+
+        if isinstance(self, Filter):
+            # Frozen filters are final, so their arguments can be computed once.
+            self.call_args = self.compute_call_args()
+
+        self._hash = hash((self.__class__, self.get_key()))
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        """Refuse to set an attribute once the object is created."""
+
+        if getattr(self, '_frozen', False):
+            raise AttributeError('Cannot set `%s` on the immutable `%s` object.' % (
+                name, self.__class__.__name__))
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        """Refuse to delete an attribute once the object is created."""
+
+        if getattr(self, '_frozen', False):
+            raise AttributeError('Cannot delete `%s` on the immutable `%s` object.' % (
+                name, self.__class__.__name__))
+        super().__delattr__(name)
+
+    def set_parent(self, parent):
+        """Set the parent, only if not already set (parents are not part of the content)."""
+
+        if self.parent is None:
+            object.__setattr__(self, 'parent', parent)
+
+    def __eq__(self, other):
+        """Two frozen objects are equal if they have the same class and content."""
+
+        if self is other:
+            return True
+        if not isinstance(other, Frozen) or self._hash != other._hash:
+            return False
+        return self.__class__ is other.__class__ and self.get_key() == other.get_key()
+
+    def __hash__(self):
+        """Return the hash computed at creation time."""
+
+        return self._hash
+
+
+# Slots to add to the frozen classes for the attributes set by ``Frozen``.
+FROZEN_SLOTS = ('_frozen', '_hash')
+
+
+class FrozenField(Frozen, Field):
+    """An immutable ``Field``. See ``Frozen``."""
+
+    __slots__ = FROZEN_SLOTS
+
+
+class FrozenObject(Frozen, Object):
+    """An immutable ``Object``. See ``Frozen``."""
+
+    __slots__ = FROZEN_SLOTS
+
+
+class FrozenList(Frozen, List):
+    """An immutable ``List``. See ``Frozen``."""
+
+    __slots__ = FROZEN_SLOTS
+
+
+class FrozenFilter(Frozen, Filter):
+    """An immutable ``Filter``. See ``Frozen``."""
+
+    __slots__ = FROZEN_SLOTS
+
+
+class FrozenSliceFilter(Frozen, SliceFilter):
+    """An immutable ``SliceFilter``. See ``Frozen``."""
+
+    __slots__ = FROZEN_SLOTS
+
+
+class FrozenPosArg(Frozen, PosArg):
+    """An immutable ``PosArg``. See ``Frozen``."""
+
+    __slots__ = FROZEN_SLOTS
+
+
+class FrozenNamedArg(Frozen, NamedArg):
+    """An immutable ``NamedArg``. See ``Frozen``."""
+
+    __slots__ = FROZEN_SLOTS
+
+
+# The frozen class to use for each class, completed by ``get_frozen_class``.
+FROZEN_CLASSES = {
+    frozen_class.__bases__[1]: frozen_class
+    for frozen_class in (FrozenField, FrozenObject, FrozenList, FrozenFilter, FrozenSliceFilter,
+                         FrozenPosArg, FrozenNamedArg)
+}
+
+
+def get_frozen_class(cls):
+    """Return the frozen subclass of the given class, created if needed.
+
+    Example
+    -------
+
+    >>> get_frozen_class(Field)
+    <class 'dataql.resources.FrozenField'>
+    >>> class MyField(Field):
+    ...     pass
+    >>> get_frozen_class(MyField).__name__, issubclass(get_frozen_class(MyField), MyField)
+    ('FrozenMyField', True)
+    >>> get_frozen_class(MyField) is get_frozen_class(MyField)
+    True
+
+    """
+
+    try:
+        return FROZEN_CLASSES[cls]
+    except KeyError:
+        frozen_class = type('Frozen%s' % cls.__name__, (Frozen, cls), {
+            '__slots__': FROZEN_SLOTS,
+            '__module__': cls.__module__,
+            '__doc__': 'An immutable ``%s``. See ``Frozen``.' % cls.__name__,
+        })
+        return FROZEN_CLASSES.setdefault(cls, frozen_class)
+
+
+def freeze(obj):
+    """Return an immutable and hashable copy of a resource, filter or argument. See ``Frozen``.
+
+    Arguments
+    ---------
+    obj : Resource, BaseFilter or Arg
+        The object to freeze, with all its children. It is not modified.
+
+    Returns
+    -------
+    Frozen
+        The frozen copy, an instance of the frozen subclass of the class of ``obj``, or ``obj``
+        itself if already frozen.
+
+    Example
+    -------
+
+    >>> resource = List('foo', filters=[
+    ...     Filter('foo', args=[NamedArg('a', '=', Variable('x'))]),
+    ...     SliceFilter(slice(1, None, None)),
+    ... ], resources=[Field('bar')])
+    >>> frozen = freeze(resource)
+    >>> frozen
+    <FrozenList[foo] .foo(a=$x)[1:]>
+      <FrozenField[bar] />
+    </FrozenList[foo]>
+    >>> frozen.filters
+    (.foo(a=$x), [1:])
+    >>> freeze(frozen) is frozen
+    True
+    >>> isinstance(frozen, List), frozen.__class__ is freeze(resource).__class__
+    (True, True)
+
+    """
+
+    if isinstance(obj, Frozen):
+        return obj
+
+    frozen_class = get_frozen_class(obj.__class__)
+
+    if isinstance(obj, Resource):
+        filters = [freeze(filter_) for filter_ in obj.filters]
+        if isinstance(obj, MultiResources):
+            return frozen_class(obj.name, filters=filters, is_root=obj.is_root,
+                                resources=[freeze(resource) for resource in obj.resources])
+        return frozen_class(obj.name, filters=filters, is_root=obj.is_root)
+
+    if isinstance(obj, Filter):
+        return frozen_class(obj.name, args=None if obj.args is None else [
+            freeze(arg) for arg in obj.args
+        ])
+
+    if isinstance(obj, SliceFilter):
+        return frozen_class(obj.index if obj.slice is None else obj.slice)
+
+    if isinstance(obj, PosArg):
+        return frozen_class(obj.value)
+
+    return frozen_class(obj.arg, obj.type, obj.value)
@@ -0,0 +1,15 @@
+"""``serializers`` module of ``dataql``.
+
+It provides ways to convert resources trees to other formats and back, without using a parser:
+
+- binary: compact binary encoding, with ``encode`` and ``decode``
+- dicts: dicts and lists that can be used with JSON, with ``to_dict`` and ``from_dict``
+- canonical: canonical form of resources trees, with ``normalize``, and their ``fingerprint``
+- text: text of DataQL queries, with ``to_text`` (use a parser to get resources back)
+
+"""
+
+from dataql.serializers.binary import decode, encode
+from dataql.serializers.canonical import fingerprint, normalize
+from dataql.serializers.dicts import from_dict, to_dict
+from dataql.serializers.text import to_text
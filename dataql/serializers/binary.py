@@ -0,0 +1,523 @@
+"""``binary`` module of ``dataql.serializers``.
+
+It provides a compact binary encoding of resources trees, to ship parsed queries between
+processes or store them, and get them back a lot faster than by parsing the queries again.
+
+The encoding covers resources (with their name, filters, and sub-resources), filters (with
+their arguments), slice filters, and values of arguments (``None``, booleans, integers, floats,
+strings and variables).
+
+Format
+------
+
+Data starts with the ``MAGIC`` bytes and the ``VERSION`` of the format on one byte, then the
+root resource. Integers used as lengths are encoded as unsigned "varints" (7 bits by byte, the
+high bit telling if there are more bytes), and strings as their utf-8 length then bytes.
+
+- Resource: one byte with the kind of resource (``Field``, ``Object`` or ``List``) and flags
+  (``is_root``, has a name), the name if any, the number of filters and the filters, and for
+  ``Object`` and ``List``, the number of sub-resources and the sub-resources.
+- Filter: one byte with the kind of filter (``Filter`` without or with arguments, or
+  ``SliceFilter`` with an index or a slice), then for a ``Filter``: its name, and the number of
+  arguments and the arguments if any, and for a ``SliceFilter``: the index, or the three values
+  of the slice.
+- Argument: one byte for the kind of argument (``PosArg`` or ``NamedArg``), for a ``NamedArg``
+  its name and type, then the value.
+- Value: one byte for the type of value, then for an integer its "zigzag" varint, for a float
+  its 8 bytes (IEEE 754, little endian), and for a string or a variable, the string or the name.
+
+Example
+-------
+
+>>> from dataql.parsers import DataQLParser
+>>> resource = DataQLParser(r'''
+... User.get("Elon Musk") {
+...     name,
+...     birthday.strftime('%x'),
+...     companies[{
+...         name,
+...         year:created_year.add(-1, 2.5, nb=$nb),
+...     }],
+...     first_company:companies.0.name,
+...     last_companies:companies[-2:].name,
+... }
+... ''').data
+>>> data = encode(resource)
+>>> data[:4]
+b'DQL\\x01'
+>>> len(data)
+251
+>>> decoded = decode(data)
+>>> decoded
+<Object[User] .User.get("Elon Musk")>
+  <Field[name] />
+  <Field[birthday] .birthday.strftime("%x") />
+  <List[companies]>
+    <Object>
+      <Field[name] />
+      <Field[year] .created_year.add(-1, 2.5, nb=$nb) />
+    </Object>
+  </List[companies]>
+  <Field[first_company] .companies[0].name />
+  <Field[last_companies] .companies[-2:].name />
+</Object[User]>
+>>> decoded.is_root, decoded.resources[0].is_root
+(True, False)
+>>> encode(decoded) == data
+True
+
+"""
+
+from struct import Struct
+
+from dataql import resources
+from dataql.serializers.exceptions import DecodeError, EncodeError
+
+
+MAGIC = b'DQL'
+VERSION = 1
+
+# Kinds of resources, in the 4 lower bits of the first byte of a resource.
+FIELD, OBJECT, LIST = 0, 1, 2
+# Flags for resources, in the 4 upper bits of the first byte of a resource.
+IS_ROOT, HAS_NAME = 0x10, 0x20
+
+# Kinds of filters.
+FILTER, FILTER_WITH_ARGS, SLICE_INDEX, SLICE = 0, 1, 2, 3
+
+# Kinds of arguments.
+POS_ARG, NAMED_ARG = 0, 1
+
+# Types of values.
+NONE, FALSE, TRUE, INT, FLOAT, STR, VARIABLE = 0, 1, 2, 3, 4, 5, 6
+
+FLOAT_STRUCT = Struct('<d')
+
+
+class BinaryEncoder:
+    """Encoder of resources trees in the binary format described in this module.
+
+    Subclasses of the resources classes can be encoded, but they will be decoded as instances
+    of the classes defined in the decoder.
+
+    Example
+    -------
+
+    >>> encoder = BinaryEncoder()
+    >>> encoder.encode(resources.Field('foo', is_root=True))
+    b'DQL\\x010\\x03foo\\x01\\x00\\x03foo'
+    >>> encoder.encode(resources.Field(None, filters=[
+    ...     resources.Filter('foo', args=[resources.PosArg({'foo': 1})])
+    ... ]))
+    Traceback (most recent call last):
+    dataql.serializers.exceptions.EncodeError: Cannot encode `{'foo': 1}` (dict)
+
+    """
+
+    def encode(self, resource):
+        """Encode the given resource, and everything it holds.
+
+        Arguments
+        ---------
+        resource : dataql.resources.Resource
+            The resource to encode, usually a root one.
+
+        Returns
+        -------
+        bytes
+            The encoded resource, starting with the ``MAGIC`` bytes and the ``VERSION``.
+
+        Raises
+        ------
+        dataql.serializers.exceptions.EncodeError
+            If something cannot be encoded (for example an argument with an unsupported value).
+
+        """
+
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        self.write_resource(out, resource)
+        return bytes(out)
+
+    @staticmethod
+    def write_uint(out, number):
+        """Write a positive integer as a varint."""
+        while number > 0x7F:
+            out.append((number & 0x7F) | 0x80)
+            number >>= 7
+        out.append(number)
+
+    def write_str(self, out, text):
+        """Write a string: its length in bytes then the utf-8 bytes."""
+        data = text.encode('utf-8')
+        self.write_uint(out, len(data))
+        out += data
+
+    def write_resource(self, out, resource):
+        """Write a resource, its filters and its sub-resources.
+
+        Sub-resources are written using an explicit stack instead of recursive calls, so deeply
+        nested resources don't hit the recursion limit (like for ``BinaryDecoder``).
+
+        """
+
+        stack = [resource]
+        while stack:
+            resource = stack.pop()
+
+            if isinstance(resource, resources.Field):
+                kind = FIELD
+            elif isinstance(resource, resources.Object):
+                kind = OBJECT
+            elif isinstance(resource, resources.List):
+                kind = LIST
+            else:
+                raise EncodeError(resource)
+
+            if resource.is_root:
+                kind |= IS_ROOT
+            if resource.name is not None:
+                kind |= HAS_NAME
+            out.append(kind)
+
+            if resource.name is not None:
+                self.write_str(out, resource.name)
+
+            self.write_uint(out, len(resource.filters))
+            for filter_ in resource.filters:
+                self.write_filter(out, filter_)
+
+            if not isinstance(resource, resources.Field):
+                self.write_uint(out, len(resource.resources))
+                stack.extend(reversed(resource.resources))
+
+    def write_filter(self, out, filter_):
+        """Write a filter with its arguments, or a slice filter."""
+        if isinstance(filter_, resources.Filter):
+            if filter_.args is None:
+                out.append(FILTER)
+                self.write_str(out, filter_.name)
+            else:
+                out.append(FILTER_WITH_ARGS)
+                self.write_str(out, filter_.name)
+                self.write_uint(out, len(filter_.args))
+                for arg in filter_.args:
+                    self.write_arg(out, arg)
+
+        elif isinstance(filter_, resources.SliceFilter):
+            if filter_.slice is None:
+                out.append(SLICE_INDEX)
+                self.write_value(out, filter_.index)
+            else:
+                out.append(SLICE)
+                self.write_value(out, filter_.slice.start)
+                self.write_value(out, filter_.slice.stop)
+                self.write_value(out, filter_.slice.step)
+
+        else:
+            raise EncodeError(filter_)
+
+    def write_arg(self, out, arg):
+        """Write a named or positioned argument with its value."""
+        if arg.is_named:
+            out.append(NAMED_ARG)
+            self.write_str(out, arg.arg)
+            self.write_str(out, arg.type)
+        else:
+            out.append(POS_ARG)
+        self.write_value(out, arg.value)
+
+    def write_value(self, out, value):
+        """Write a value: its type then the value itself if needed."""
+        if value is None:
+            out.append(NONE)
+        elif value is False:
+            out.append(FALSE)
+        elif value is True:
+            out.append(TRUE)
+        elif isinstance(value, int):
+            out.append(INT)
+            # "zigzag" encoding to have small varints for small negative numbers too.
+            self.write_uint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+        elif isinstance(value, float):
+            out.append(FLOAT)
+            out += FLOAT_STRUCT.pack(value)
+        elif isinstance(value, str):
+            out.append(STR)
+            self.write_str(out, value)
+        elif isinstance(value, resources.Variable):
+            out.append(VARIABLE)
+            self.write_str(out, value.name)
+        else:
+            raise EncodeError(value)
+
+
+class BinaryDecoder:
+    """Decoder of resources trees encoded in the binary format described in this module.
+
+    Like for parsers, the classes to use to create the resources can be changed in subclasses.
+
+    Each ``read_*`` method reads something from the data at the given position, and returns a
+    tuple with it and the position after it.
+
+    Attributes
+    ----------
+    Field : class (class attribute)
+        The class to use as a ``Field`` resource. Default to ``dataql.resources.Field``.
+    Object : class (class attribute)
+        The class to use as a ``Object`` resource. Default to ``dataql.resources.Object``.
+    List : class (class attribute)
+        The class to use as a ``List`` resource. Default to ``dataql.resources.List``.
+    Filter : class (class attribute)
+        The class to use as a ``Filter``. Default to ``dataql.resources.Filter``.
+    SliceFilter : class (class attribute)
+        The class to use as a ``SliceFilter``. Default to ``dataql.resources.SliceFilter``.
+    NamedArg : class (class attribute)
+        The class to use as a ``NamedArg`` (named argument). Default to
+        ``dataql.resources.NamedArg``.
+    PosArg : class (class attribute)
+        The class to use as a ``PosArg`` (positioned argument). Default to
+        ``dataql.resources.PosArg``.
+    Variable : class (class attribute)
+        The class to use as a ``Variable``. Default to ``dataql.resources.Variable``.
+
+    Example
+    -------
+
+    >>> decoder = BinaryDecoder()
+    >>> decoder.decode(b'DQL\\x01\\x30\\x03foo\\x01\\x00\\x03foo')
+    <Field[foo] />
+    >>> decoder.decode(b'DQL\\x02\\x30\\x03foo\\x01\\x00\\x03foo') # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...DecodeError: Cannot decode data at position 3: Unsupported version 2
+    >>> decoder.decode(b'DQL\\x01\\x30\\x03foo\\x01\\x00\\x03fo') # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...DecodeError: Cannot decode data at position 14: Truncated data
+    >>> decoder.decode(b'DQL\\x01\\x30\\x03foo\\x01\\x00\\x03foo!') # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...DecodeError: Cannot decode data at position 15: Unexpected data
+
+    """
+
+    Field = resources.Field
+    List = resources.List
+    Object = resources.Object
+    Filter = resources.Filter
+    SliceFilter = resources.SliceFilter
+    NamedArg = resources.NamedArg
+    PosArg = resources.PosArg
+    Variable = resources.Variable
+
+    def decode(self, data):
+        """Decode the given data into a resource.
+
+        Arguments
+        ---------
+        data : bytes
+            Data produced by ``BinaryEncoder.encode``.
+
+        Returns
+        -------
+        dataql.resources.Resource
+            The decoded resource, and everything it holds.
+
+        Raises
+        ------
+        dataql.serializers.exceptions.DecodeError
+            If the data is not valid.
+
+        """
+
+        if data[:len(MAGIC)] != MAGIC:
+            raise DecodeError('Invalid data', 0)
+
+        pos = len(MAGIC)
+        if len(data) <= pos or data[pos] != VERSION:
+            raise DecodeError('Unsupported version %s' % (data[pos:pos + 1] or b'\0')[0], pos)
+
+        try:
+            resource, pos = self.read_resource(data, pos + 1)
+        except IndexError:
+            raise DecodeError('Truncated data', len(data)) from None
+
+        if pos != len(data):
+            raise DecodeError('Unexpected data', pos)
+
+        return resource
+
+    @staticmethod
+    def read_uint(data, pos):
+        """Read a positive integer encoded as a varint."""
+        number = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            number |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return number, pos
+            shift += 7
+
+    def read_str(self, data, pos):
+        """Read a string: its length in bytes then the utf-8 bytes."""
+        length, pos = self.read_uint(data, pos)
+        end = pos + length
+        if end > len(data):
+            raise IndexError(end)
+        try:
+            return data[pos:end].decode('utf-8'), end
+        except UnicodeDecodeError:
+            raise DecodeError('Invalid string', pos)
+
+    def read_resource(self, data, pos):
+        """Read a resource, its filters and its sub-resources.
+
+        Sub-resources are read using an explicit stack instead of recursive calls, so deeply
+        nested data doesn't hit the recursion limit.
+
+        Example
+        -------
+
+        >>> import sys
+        >>> depth = sys.getrecursionlimit() * 2
+        >>> data = b'DQL\\x01' + b'\\x01\\x00\\x01' * depth + b'\\x00\\x00'
+        >>> resource = BinaryDecoder().decode(data)
+        >>> for __ in range(depth):
+        ...     resource = resource.resources[0]
+        >>> resource.__class__.__name__, resource.name, resource.filters
+        ('Field', None, [])
+        >>> encode(BinaryDecoder().decode(data)) == data
+        True
+
+        """
+
+        # Objects and lists whose sub-resources are being read, each with the class, name,
+        # filters, and ``is_root`` flag of the resource, the number of sub-resources to read,
+        # and the ones already read.
+        stack = []
+
+        while True:
+            start = pos
+            kind = data[pos]
+            pos += 1
+
+            name = None
+            if kind & HAS_NAME:
+                name, pos = self.read_str(data, pos)
+
+            nb_filters, pos = self.read_uint(data, pos)
+            filters = []
+            for __ in range(nb_filters):
+                filter_, pos = self.read_filter(data, pos)
+                filters.append(filter_)
+
+            resource_kind = kind & 0x0F
+            if resource_kind == FIELD:
+                resource = self.Field(name, filters=filters, is_root=bool(kind & IS_ROOT))
+
+            elif resource_kind in (OBJECT, LIST):
+                nb_resources, pos = self.read_uint(data, pos)
+                resource_class = self.Object if resource_kind == OBJECT else self.List
+                if nb_resources:
+                    stack.append((resource_class, name, filters, bool(kind & IS_ROOT),
+                                  nb_resources, []))
+                    continue
+                resource = resource_class(
+                    name, filters=filters, is_root=bool(kind & IS_ROOT), resources=[])
+
+            else:
+                raise DecodeError('Unknown resource kind %s' % resource_kind, start)
+
+            # Add the resource to its parent, and create the parents having all theirs.
+            while stack:
+                resource_class, name, filters, is_root, nb_resources, sub_resources = stack[-1]
+                sub_resources.append(resource)
+                if len(sub_resources) < nb_resources:
+                    break
+                stack.pop()
+                resource = resource_class(
+                    name, filters=filters, is_root=is_root, resources=sub_resources)
+            else:
+                return resource, pos
+
+    def read_filter(self, data, pos):
+        """Read a filter with its arguments, or a slice filter."""
+        kind = data[pos]
+        pos += 1
+
+        if kind == FILTER:
+            name, pos = self.read_str(data, pos)
+            return self.Filter(name=name), pos
+
+        if kind == FILTER_WITH_ARGS:
+            name, pos = self.read_str(data, pos)
+            nb_args, pos = self.read_uint(data, pos)
+            args = []
+            for __ in range(nb_args):
+                arg, pos = self.read_arg(data, pos)
+                args.append(arg)
+            return self.Filter(name=name, args=args), pos
+
+        if kind == SLICE_INDEX:
+            index, pos = self.read_value(data, pos)
+            return self.SliceFilter(index), pos
+
+        if kind == SLICE:
+            start, pos = self.read_value(data, pos)
+            stop, pos = self.read_value(data, pos)
+            step, pos = self.read_value(data, pos)
+            return self.SliceFilter(slice(start, stop, step)), pos
+
+        raise DecodeError('Unknown filter kind %s' % kind, pos - 1)
+
+    def read_arg(self, data, pos):
+        """Read a named or positioned argument with its value."""
+        kind = data[pos]
+        pos += 1
+
+        if kind == POS_ARG:
+            value, pos = self.read_value(data, pos)
+            return self.PosArg(value=value), pos
+
+        if kind == NAMED_ARG:
+            name, pos = self.read_str(data, pos)
+            arg_type, pos = self.read_str(data, pos)
+            value, pos = self.read_value(data, pos)
+            return self.NamedArg(arg=name, arg_type=arg_type, value=value), pos
+
+        raise DecodeError('Unknown argument kind %s' % kind, pos - 1)
+
+    def read_value(self, data, pos):
+        """Read a value: its type then the value itself if needed."""
+        value_type = data[pos]
+        pos += 1
+
+        if value_type == NONE:
+            return None, pos
+        if value_type == FALSE:
+            return False, pos
+        if value_type == TRUE:
+            return True, pos
+        if value_type == INT:
+            number, pos = self.read_uint(data, pos)
+            return (-((number + 1) >> 1) if number & 1 else number >> 1), pos
+        if value_type == FLOAT:
+            if pos + FLOAT_STRUCT.size > len(data):
+                raise IndexError(pos)
+            return FLOAT_STRUCT.unpack_from(data, pos)[0], pos + FLOAT_STRUCT.size
+        if value_type == STR:
+            return self.read_str(data, pos)
+        if value_type == VARIABLE:
+            name, pos = self.read_str(data, pos)
+            return self.Variable(name), pos
+
+        raise DecodeError('Unknown value type %s' % value_type, pos - 1)
+
+
+def encode(resource):
+    """Encode the given resource with a ``BinaryEncoder``. See ``BinaryEncoder.encode``."""
+    return BinaryEncoder().encode(resource)
+
+
+def decode(data):
+    """Decode the given data with a ``BinaryDecoder``. See ``BinaryDecoder.decode``."""
+    return BinaryDecoder().decode(data)
@@ -0,0 +1,143 @@
+"""``canonical`` module of ``dataql.serializers``.
+
+It provides a canonical form of resources trees, and a stable fingerprint computed from it, to
+identify queries by what they mean instead of by their text: whitespaces, trailing commas,
+quotes, ``:`` or ``=`` for named arguments, order of named arguments, and default slice values
+don't change the fingerprint.
+
+Example
+-------
+
+>>> from dataql.parsers import DataQLParser
+>>> parser = DataQLParser()
+>>> first = parser.parse('foo { bar.baz(1, a="x", b=2), qux[0:], }')
+>>> second = parser.parse("foo{bar.baz(1,b:2,a:'x'),qux[::1]}")
+>>> fingerprint(first) == fingerprint(second)
+True
+>>> fingerprint(first)
+'73454db241e4ca7ff066023b5c5f351b641153bfd162f3367e7a478b72cf50f4'
+>>> fingerprint(first) == fingerprint(parser.parse('foo {bar.baz(1, a="x", b=3), qux[0:]}'))
+False
+
+"""
+
+from hashlib import sha256
+
+from dataql.resources import Filter, MultiResources
+from dataql.serializers.binary import BinaryEncoder
+
+
+class Normalizer:
+    """Create canonical copies of resources trees.
+
+    The canonical form of a resources tree is a copy of it where:
+
+    - named arguments of filters are sorted by name, after positioned ones, and use ``=``
+    - slices have their default values set to ``None`` (a ``1`` step, and a ``0`` start when
+      the step is positive)
+
+    Resources are not sorted, as their order is the order of the solved values.
+
+    Example
+    -------
+
+    >>> from dataql.parsers import DataQLParser
+    >>> resource = DataQLParser('foo {bar.baz(1, b=2, a="x"), qux[0:10:1]}').data
+    >>> Normalizer().normalize(resource)
+    <Object[foo]>
+      <Field[bar] .bar.baz(1, a="x", b=2) />
+      <Field[qux] .qux[:10] />
+    </Object[foo]>
+    >>> resource
+    <Object[foo]>
+      <Field[bar] .bar.baz(1, b=2, a="x") />
+      <Field[qux] .qux[0:10:1] />
+    </Object[foo]>
+
+    """
+
+    def normalize(self, resource):
+        """Return a canonical copy of the given resource, and everything it holds.
+
+        Arguments
+        ---------
+        resource : dataql.resources.Resource
+            The resource to normalize. It is not modified.
+
+        Returns
+        -------
+        dataql.resources.Resource
+            A new resource, of the same class, in its canonical form.
+
+        """
+
+        filters = [self.normalize_filter(filter_) for filter_ in resource.filters]
+        if isinstance(resource, MultiResources):
+            return resource.__class__(
+                resource.name,
+                filters=filters,
+                is_root=resource.is_root,
+                resources=[self.normalize(sub_resource) for sub_resource in resource.resources],
+            )
+        return resource.__class__(resource.name, filters=filters, is_root=resource.is_root)
+
+    def normalize_filter(self, filter_):
+        """Return a canonical copy of the given filter or slice filter."""
+        if isinstance(filter_, Filter):
+            if filter_.args is None:
+                return filter_.__class__(filter_.name)
+            pos_args = [arg for arg in filter_.args if not arg.is_named]
+            named_args = sorted(
+                (arg for arg in filter_.args if arg.is_named),
+                key=lambda arg: arg.arg
+            )
+            return filter_.__class__(filter_.name, args=[
+                arg.__class__(arg.value) if not arg.is_named
+                else arg.__class__(arg.arg, '=', arg.value)
+                for arg in pos_args + named_args
+            ])
+
+        if filter_.slice is None:
+            return filter_.__class__(filter_.index)
+
+        start, stop, step = filter_.slice.start, filter_.slice.stop, filter_.slice.step
+        if step == 1:
+            step = None
+        if start == 0 and step is None:
+            start = None
+        return filter_.__class__(slice(start, stop, step))
+
+
+def normalize(resource):
+    """Return a canonical copy of a resource with a ``Normalizer``. See ``Normalizer.normalize``."""
+    return Normalizer().normalize(resource)
+
+
+def fingerprint(resource):
+    """Return a stable fingerprint of the canonical form of a resource.
+
+    The fingerprint is the hexadecimal SHA-256 hash of the binary encoding of the canonical form
+    of the resource, so it stays the same across processes and versions of python.
+
+    Arguments
+    ---------
+    resource : dataql.resources.Resource
+        The resource to fingerprint.
+
+    Returns
+    -------
+    str
+        The fingerprint of the resource.
+
+    Example
+    -------
+
+    >>> from dataql.resources import Field, Filter
+    >>> fingerprint(Field('foo')) == fingerprint(Field('foo', filters=[Filter('foo')]))
+    True
+    >>> fingerprint(Field('foo')) == fingerprint(Field('foo', is_root=True))
+    False
+
+    """
+
+    return sha256(BinaryEncoder().encode(normalize(resource))).hexdigest()
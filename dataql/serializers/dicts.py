@@ -0,0 +1,464 @@
+"""``dicts`` module of ``dataql.serializers``.
+
+It provides a representation of resources trees with dicts, lists and simple values, to be
+used for example with JSON, so that clients already holding a structured form of a query can
+send it without rendering it as text: the resources are built directly from the dict, without
+using a parser.
+
+Schema
+------
+
+- Resource: a dict with these keys:
+
+  - ``type`` (required): ``"field"``, ``"object"`` or ``"list"``.
+  - ``name``: the name of the resource. Default to the name of its first filter, if it has one,
+    like for a parsed query.
+  - ``filters``: a list of filters. Default to one filter with the name of the resource.
+  - ``resources`` (required for objects and lists, not allowed for fields): a non-empty list of
+    resources. Resources of objects, like fields, must have a name or filters.
+
+- Filter: a dict with one of these sets of keys:
+
+  - ``name``, and optionally ``args``, a list of arguments: a ``Filter``, without arguments if
+    ``args`` is not set (``foo``), else with them, even if empty (``foo()``).
+  - ``index``, a number: a ``SliceFilter`` with this index (``foo.0``).
+  - ``slice``, a list of two or three numbers or ``None``: a ``SliceFilter`` with this slice
+    (``foo[1:]``).
+
+  Like in the text of a query, numbers may be floats (``foo.1.5``), and the first filter of a
+  resource may be a ``SliceFilter`` (``[1:2]``), making a resource without name.
+
+- Argument: a dict with a ``value``, and optionally a ``name`` for a named argument.
+
+- Value: ``None``, a boolean, a number, a string, or a dict with the ``variable`` key to use
+  the variable with this name.
+
+Names of resources, filters, arguments and variables must be valid identifiers, like in the
+text of a query.
+
+Example
+-------
+
+>>> import json
+>>> data = json.loads('''{
+...     "type": "object",
+...     "filters": [{"name": "User"}, {"name": "get", "args": [{"value": "Elon Musk"}]}],
+...     "resources": [
+...         {"type": "field", "name": "name"},
+...         {"type": "field", "name": "birthday", "filters": [
+...             {"name": "birthday"}, {"name": "strftime", "args": [{"value": "%x"}]}
+...         ]},
+...         {"type": "list", "name": "companies", "resources": [
+...             {"type": "object", "resources": [
+...                 {"type": "field", "name": "name"},
+...                 {"type": "field", "name": "year", "filters": [
+...                     {"name": "created_year"},
+...                     {"name": "add", "args": [
+...                         {"value": -1}, {"name": "nb", "value": {"variable": "nb"}}
+...                     ]}
+...                 ]}
+...             ]}
+...         ]},
+...         {"type": "field", "name": "first_company", "filters": [
+...             {"name": "companies"}, {"index": 0}, {"name": "name"}
+...         ]},
+...         {"type": "field", "name": "last_companies", "filters": [
+...             {"name": "companies"}, {"slice": [-2, null]}, {"name": "name"}
+...         ]}
+...     ]
+... }''')
+>>> resource = from_dict(data)
+>>> resource
+<Object[User] .User.get("Elon Musk")>
+  <Field[name] />
+  <Field[birthday] .birthday.strftime("%x") />
+  <List[companies]>
+    <Object>
+      <Field[name] />
+      <Field[year] .created_year.add(-1, nb=$nb) />
+    </Object>
+  </List[companies]>
+  <Field[first_company] .companies[0].name />
+  <Field[last_companies] .companies[-2:].name />
+</Object[User]>
+>>> from dataql.parsers import DataQLParser
+>>> parsed = DataQLParser(r'''
+... User.get("Elon Musk") {
+...     name,
+...     birthday.strftime('%x'),
+...     companies[{
+...         name,
+...         year:created_year.add(-1, nb=$nb),
+...     }],
+...     first_company:companies.0.name,
+...     last_companies:companies[-2:].name,
+... }
+... ''').data
+>>> repr(parsed) == repr(resource), parsed.is_root, resource.is_root
+(True, True, True)
+>>> to_dict(resource)['resources'][3] == data['resources'][3]
+True
+>>> to_dict(resource)['resources'][4]['filters'][1]
+{'slice': [-2, None, None]}
+>>> from_dict({'type': 'object', 'name': 'foo', 'resources': [{'type': 'field'}]})
+... # doctest: +ELLIPSIS
+Traceback (most recent call last):
+dataql...ValidationError: Invalid query at `/resources/0`: A name or filters are required
+
+"""
+
+import re
+
+from dataql import resources
+from dataql.serializers.exceptions import ValidationError
+
+
+IDENT_RE = re.compile(r'[_A-Z][_A-Z0-9]*\Z', re.I)
+
+RESOURCE_KEYS = frozenset(('type', 'name', 'filters', 'resources'))
+FILTER_KEYS = frozenset(('name', 'args'))
+ARG_KEYS = frozenset(('name', 'value'))
+
+
+def format_path(path):
+    """Return a path (a tuple of keys and indexes) as a string.
+
+    Arguments
+    ---------
+    path : tuple
+        The keys and indexes to get from the root dict to the current one.
+
+    Returns
+    -------
+    str
+        The keys and indexes separated by "/", starting with a "/".
+
+    Example
+    -------
+
+    >>> format_path(())
+    '/'
+    >>> format_path(('resources', 2, 'filters', 0))
+    '/resources/2/filters/0'
+
+    """
+
+    return '/' + '/'.join(str(key) for key in path)
+
+
+class DictBuilder:
+    """Builder of resources trees from dicts following the schema described in this module.
+
+    The dicts are validated while being converted: a ``ValidationError`` is raised at the first
+    problem found.
+
+    Like for parsers, the classes to use to create the resources can be changed in subclasses.
+
+    Attributes
+    ----------
+    Field : class (class attribute)
+        The class to use as a ``Field`` resource. Default to ``dataql.resources.Field``.
+    Object : class (class attribute)
+        The class to use as a ``Object`` resource. Default to ``dataql.resources.Object``.
+    List : class (class attribute)
+        The class to use as a ``List`` resource. Default to ``dataql.resources.List``.
+    Filter : class (class attribute)
+        The class to use as a ``Filter``. Default to ``dataql.resources.Filter``.
+    SliceFilter : class (class attribute)
+        The class to use as a ``SliceFilter``. Default to ``dataql.resources.SliceFilter``.
+    NamedArg : class (class attribute)
+        The class to use as a ``NamedArg`` (named argument). Default to
+        ``dataql.resources.NamedArg``.
+    PosArg : class (class attribute)
+        The class to use as a ``PosArg`` (positioned argument). Default to
+        ``dataql.resources.PosArg``.
+    Variable : class (class attribute)
+        The class to use as a ``Variable``. Default to ``dataql.resources.Variable``.
+
+    Example
+    -------
+
+    >>> builder = DictBuilder()
+    >>> builder.build({'type': 'field', 'name': 'foo', 'filters': [
+    ...     {'name': 'bar', 'args': [{'value': 1}, {'name': 'baz', 'value': True}]}
+    ... ]})
+    <Field[foo] .bar(1, baz=True) />
+    >>> builder.build({'type': 'foo'}) # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...ValidationError: Invalid query at `/type`: Must be "field", "object" or "list"
+    >>> builder.build({'type': 'field', 'name': 'foo-bar'}) # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...ValidationError: Invalid query at `/name`: `'foo-bar'` is not a valid identifier
+    >>> builder.build({'type': 'field', 'name': 'foo', 'resources': []}) # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...ValidationError: Invalid query at `/`: Unknown key(s): resources
+    >>> builder.build({'type': 'list', 'name': 'foo', 'resources': []}) # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...ValidationError: Invalid query at `/resources`: Must be a non-empty list
+    >>> builder.build({'type': 'object', 'filters': [{'index': 1.5}], 'resources': [
+    ...     {'type': 'field', 'filters': [{'slice': [None, -1]}]}
+    ... ]})
+    <Object [1.5]>
+      <Field [:-1] />
+    </Object>
+    >>> builder.build({'type': 'field', 'filters': [
+    ...     {'name': 'foo'}, {'slice': [1, 'a']}
+    ... ]}) # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...ValidationError: Invalid query at `/filters/1/slice/1`: Must be a number or None
+    >>> builder.build({'type': 'field', 'filters': [
+    ...     {'name': 'foo', 'args': [{'value': [1]}]}
+    ... ]}) # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...ValidationError: Invalid query at `/filters/0/args/0/value`: Invalid value `[1]`
+
+    """
+
+    Field = resources.Field
+    List = resources.List
+    Object = resources.Object
+    Filter = resources.Filter
+    SliceFilter = resources.SliceFilter
+    NamedArg = resources.NamedArg
+    PosArg = resources.PosArg
+    Variable = resources.Variable
+
+    def build(self, data):
+        """Build the resources tree described by the given dict.
+
+        Arguments
+        ---------
+        data : dict
+            A dict describing a resource, following the schema described in this module.
+
+        Returns
+        -------
+        dataql.resources.Resource
+            The resource, with ``is_root`` set to ``True``.
+
+        Raises
+        ------
+        dataql.serializers.exceptions.ValidationError
+            If the dict does not follow the schema.
+
+        """
+
+        resource = self.build_resource(data, ())
+        resource.is_root = True
+        return resource
+
+    @staticmethod
+    def check_dict(data, keys, path):
+        """Check that ``data`` is a dict with only the given keys."""
+        if not isinstance(data, dict):
+            raise ValidationError('Must be a dict', format_path(path))
+        if not keys.issuperset(data):
+            raise ValidationError(
+                'Unknown key(s): %s' % ', '.join(sorted(map(str, set(data) - keys))),
+                format_path(path)
+            )
+
+    @staticmethod
+    def check_list(data, path, allow_empty=True):
+        """Check that ``data`` is a list, not empty if ``allow_empty`` is ``False``."""
+        if not isinstance(data, list) or not (data or allow_empty):
+            raise ValidationError(
+                'Must be a list' if allow_empty else 'Must be a non-empty list',
+                format_path(path)
+            )
+
+    @staticmethod
+    def check_ident(name, path):
+        """Check that ``name`` is a valid identifier, and return it."""
+        if not isinstance(name, str) or not IDENT_RE.match(name):
+            raise ValidationError('`%r` is not a valid identifier' % (name, ), format_path(path))
+        return name
+
+    def build_resource(self, data, path, require_name=False):
+        """Build a resource, its filters and its sub-resources."""
+        self.check_dict(data, RESOURCE_KEYS, path)
+
+        resource_type = data.get('type')
+        if resource_type == 'field':
+            resource_class = self.Field
+        elif resource_type == 'object':
+            resource_class = self.Object
+        elif resource_type == 'list':
+            resource_class = self.List
+        else:
+            raise ValidationError('Must be "field", "object" or "list"',
+                                  format_path(path + ('type', )))
+
+        name = data.get('name')
+        if name is not None:
+            self.check_ident(name, path + ('name', ))
+
+        filters = data.get('filters')
+        if filters is not None:
+            filters_path = path + ('filters', )
+            self.check_list(filters, filters_path, allow_empty=False)
+            filters = [
+                self.build_filter(filter_, filters_path + (index, ))
+                for index, filter_ in enumerate(filters)
+            ]
+            if name is None:
+                name = getattr(filters[0], 'name', None)
+
+        if name is None and filters is None and (require_name or resource_class is self.Field):
+            raise ValidationError('A name or filters are required', format_path(path))
+
+        if resource_class is self.Field:
+            if 'resources' in data:
+                raise ValidationError('Unknown key(s): resources', format_path(path))
+            return resource_class(name, filters=filters)
+
+        sub_resources = data.get('resources')
+        resources_path = path + ('resources', )
+        self.check_list(sub_resources, resources_path, allow_empty=False)
+        require_names = resource_class is self.Object
+        return resource_class(name, filters=filters, resources=[
+            self.build_resource(sub_resource, resources_path + (index, ), require_names)
+            for index, sub_resource in enumerate(sub_resources)
+        ])
+
+    @staticmethod
+    def is_number(value):
+        """Tell if ``value`` is a number (an int or a float, but not a boolean)."""
+        return not isinstance(value, bool) and isinstance(value, (int, float))
+
+    def build_filter(self, data, path):
+        """Build a filter with its arguments, or a slice filter."""
+        if not isinstance(data, dict):
+            raise ValidationError('Must be a dict', format_path(path))
+
+        if 'name' in data:
+            self.check_dict(data, FILTER_KEYS, path)
+            name = self.check_ident(data['name'], path + ('name', ))
+            args = data.get('args')
+            if args is not None:
+                args_path = path + ('args', )
+                self.check_list(args, args_path)
+                args = [
+                    self.build_arg(arg, args_path + (index, )) for index, arg in enumerate(args)
+                ]
+            return self.Filter(name=name, args=args)
+
+        if 'index' in data:
+            self.check_dict(data, {'index'}, path)
+            index = data['index']
+            if not self.is_number(index):
+                raise ValidationError('Must be a number', format_path(path + ('index', )))
+            return self.SliceFilter(index)
+
+        if 'slice' in data:
+            self.check_dict(data, {'slice'}, path)
+            slice_path = path + ('slice', )
+            slice_info = data['slice']
+            if not isinstance(slice_info, list) or len(slice_info) not in (2, 3):
+                raise ValidationError('Must be a list of 2 or 3 entries', format_path(slice_path))
+            for index, entry in enumerate(slice_info):
+                if entry is not None and not self.is_number(entry):
+                    raise ValidationError('Must be a number or None',
+                                          format_path(slice_path + (index, )))
+            return self.SliceFilter(slice(*slice_info))
+
+        raise ValidationError('Must have a `name`, an `index` or a `slice`', format_path(path))
+
+    def build_arg(self, data, path):
+        """Build a named or positioned argument with its value."""
+        self.check_dict(data, ARG_KEYS, path)
+        if 'value' not in data:
+            raise ValidationError('A value is required', format_path(path))
+        value = self.build_value(data['value'], path + ('value', ))
+        if 'name' in data:
+            name = self.check_ident(data['name'], path + ('name', ))
+            return self.NamedArg(arg=name, arg_type='=', value=value)
+        return self.PosArg(value=value)
+
+    def build_value(self, data, path):
+        """Build a value: return it as is, or build a variable."""
+        if data is None or isinstance(data, (bool, int, float, str)):
+            return data
+        if isinstance(data, dict) and len(data) == 1 and 'variable' in data:
+            return self.Variable(self.check_ident(data['variable'], path + ('variable', )))
+        raise ValidationError('Invalid value `%r`' % (data, ), format_path(path))
+
+
+class DictDumper:
+    """Dumper of resources trees to dicts following the schema described in this module.
+
+    Names and filters of resources are always set, even if they are the default ones.
+
+    Example
+    -------
+
+    >>> from dataql.resources import Field, Filter, NamedArg, Variable
+    >>> dumper = DictDumper()
+    >>> dumper.dump(Field('foo'))
+    {'type': 'field', 'name': 'foo', 'filters': [{'name': 'foo'}]}
+    >>> dumper.dump_filter(Filter('bar', args=[NamedArg('baz', '=', Variable('qux'))]))
+    {'name': 'bar', 'args': [{'name': 'baz', 'value': {'variable': 'qux'}}]}
+
+    """
+
+    def dump(self, resource):
+        """Return the given resource, and everything it holds, as a dict.
+
+        Arguments
+        ---------
+        resource : dataql.resources.Resource
+            The resource to dump, usually a root one.
+
+        Returns
+        -------
+        dict
+            A dict describing the resource, that can be converted to JSON.
+
+        """
+
+        if isinstance(resource, resources.Field):
+            resource_type = 'field'
+        elif isinstance(resource, resources.Object):
+            resource_type = 'object'
+        else:
+            resource_type = 'list'
+
+        result = {'type': resource_type}
+        if resource.name is not None:
+            result['name'] = resource.name
+        if resource.filters:
+            result['filters'] = [self.dump_filter(filter_) for filter_ in resource.filters]
+        if resource_type != 'field':
+            result['resources'] = [self.dump(sub_resource) for sub_resource in resource.resources]
+        return result
+
+    def dump_filter(self, filter_):
+        """Return a filter, with its arguments, or a slice filter, as a dict."""
+        if isinstance(filter_, resources.SliceFilter):
+            if filter_.slice is None:
+                return {'index': filter_.index}
+            return {'slice': [filter_.slice.start, filter_.slice.stop, filter_.slice.step]}
+
+        result = {'name': filter_.name}
+        if filter_.args is not None:
+            result['args'] = [self.dump_arg(arg) for arg in filter_.args]
+        return result
+
+    def dump_arg(self, arg):
+        """Return a named or positioned argument as a dict."""
+        value = arg.value
+        if isinstance(value, resources.Variable):
+            value = {'variable': value.name}
+        if arg.is_named:
+            return {'name': arg.arg, 'value': value}
+        return {'value': value}
+
+
+def from_dict(data):
+    """Build resources from a dict with a ``DictBuilder``. See ``DictBuilder.build``."""
+    return DictBuilder().build(data)
+
+
+def to_dict(resource):
+    """Dump resources to a dict with a ``DictDumper``. See ``DictDumper.dump``."""
+    return DictDumper().dump(resource)
@@ -0,0 +1,104 @@
+"""``exceptions`` module of ``dataql.serializers``.
+
+It holds all the exception that may be raised by this module.
+
+"""
+
+from dataql.exceptions import DataQLException
+
+
+class DecodeError(DataQLException):
+    """Exception raised when some data cannot be decoded into resources.
+
+    The exception string exposes the reason of the failure, and the position in the data.
+
+    Attributes
+    ----------
+    reason : str
+        Why the data cannot be decoded.
+    pos : int
+        The position in the data where the problem was found.
+
+    Example
+    -------
+
+    >>> raise DecodeError('Unknown value type 9', 12) # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...DecodeError: Cannot decode data at position 12: Unknown value type 9
+
+    """
+
+    def __init__(self, reason, pos):
+        self.reason = reason
+        self.pos = pos
+        super().__init__(str(self))
+
+    def __str__(self):
+        return 'Cannot decode data at position %s: %s' % (self.pos, self.reason)
+
+
+class EncodeError(DataQLException):
+    """Exception raised when something in a resources tree cannot be encoded.
+
+    The exception string exposes the object that cannot be encoded.
+
+    Attributes
+    ----------
+    obj : ?
+        The object that cannot be encoded (a resource, a filter, a value...)
+    reason : str or None
+        Why the object cannot be encoded, if not only because of its type. In this case, only
+        the class of the object is in the exception string.
+
+    Example
+    -------
+
+    >>> raise EncodeError({'foo': 1})
+    Traceback (most recent call last):
+    dataql.serializers.exceptions.EncodeError: Cannot encode `{'foo': 1}` (dict)
+    >>> raise EncodeError({'foo': 1}, 'Too many keys')
+    Traceback (most recent call last):
+    dataql.serializers.exceptions.EncodeError: Cannot encode this `dict`: Too many keys
+
+    """
+
+    def __init__(self, obj, reason=None):
+        self.obj = obj
+        self.reason = reason
+        super().__init__(str(self))
+
+    def __str__(self):
+        if self.reason is not None:
+            return 'Cannot encode this `%s`: %s' % (self.obj.__class__.__name__, self.reason)
+        return 'Cannot encode `%r` (%s)' % (self.obj, self.obj.__class__.__name__)
+
+
+class ValidationError(DataQLException):
+    """Exception raised when a dict describing a query does not follow the expected schema.
+
+    The exception string exposes the reason of the failure, and where it was found.
+
+    Attributes
+    ----------
+    reason : str
+        Why the dict is not valid.
+    path : str
+        Where the problem was found, as a "/" separated list of keys and indexes, for example
+        ``/resources/2/filters/0``.
+
+    Example
+    -------
+
+    >>> raise ValidationError('Unknown key `foo`', '/resources/2') # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...ValidationError: Invalid query at `/resources/2`: Unknown key `foo`
+
+    """
+
+    def __init__(self, reason, path):
+        self.reason = reason
+        self.path = path
+        super().__init__(str(self))
+
+    def __str__(self):
+        return 'Invalid query at `%s`: %s' % (self.path, self.reason)
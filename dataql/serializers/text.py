@@ -0,0 +1,191 @@
+"""``text`` module of ``dataql.serializers``.
+
+It provides a way to render resources trees as the text of a DataQL query, to log queries,
+report slow ones, or export persisted ones. Unlike ``repr``, which walks the chain of parents
+of each resource to indent it, rendering takes a time linear in the size of the tree, even for
+deep ones.
+
+The text is minimal: no spaces, no trailing commas, and resource names only when they are not
+the default ones. Named arguments always use ``=``, and strings double quotes.
+
+Example
+-------
+
+>>> from dataql.parsers import DataQLParser
+>>> resource = DataQLParser(r'''
+... User.get("Elon Musk") {
+...     name,
+...     companies[{
+...         year: created_year.add(-1, nb: $nb),
+...     }],
+...     first: companies.0.name,
+... }
+... ''').data
+>>> text = to_text(resource)
+>>> print(text)
+User.get("Elon Musk"){name,companies[{year:created_year.add(-1,nb=$nb)}],first:companies[0].name}
+>>> repr(DataQLParser(text).data) == repr(resource)
+True
+
+"""
+
+from dataql.resources import Filter, List, MultiResources, SliceFilter, Variable
+from dataql.serializers.exceptions import EncodeError
+
+
+class TextSerializer:
+    """Serializer of resources trees to the text of DataQL queries.
+
+    Example
+    -------
+
+    >>> from dataql.resources import *
+    >>> serializer = TextSerializer()
+    >>> serializer.serialize(List('foo', filters=[
+    ...     Filter('foo'),
+    ...     SliceFilter(slice(None, 10, 2)),
+    ...     Filter('bar', args=[PosArg(None), PosArg(True), NamedArg('baz', ':', 1.5)]),
+    ... ], resources=[
+    ...     Field('id'),
+    ...     List(None, resources=[Field('qux', filters=[SliceFilter(0)])]),
+    ... ]))
+    'foo[:10:2].bar(null,true,baz=1.5)[id,[0]]'
+    >>> serializer.serialize(Field('foo', filters=[Filter('bar', args=[])]))
+    'foo:bar()'
+    >>> serializer.serialize(Object(None, resources=[Field('foo')])) # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...EncodeError: Cannot encode this `Object`: Only objects and lists in a list can be...
+    >>> print(serializer.format_value('a "quoted" \\\\ backslash'))
+    "a \\"quoted\\" \\\\ backslash"
+
+    A list with only an index in it is written with a trailing comma, else it would be read as
+    an index:
+
+    >>> from dataql.parsers import DataQLParser
+    >>> text = serializer.serialize(DataQLParser('foo{a:[1:2][.5,]}').data)
+    >>> text
+    'foo{a:[1:2][0.5,]}'
+    >>> DataQLParser(text).data
+    <Object[foo]>
+      <List[a] [1:2]>
+        <Field [0.5] />
+      </List[a]>
+    </Object[foo]>
+
+    """
+
+    def serialize(self, resource):
+        """Return the text of a query for the given resource, and everything it holds.
+
+        Arguments
+        ---------
+        resource : dataql.resources.Resource
+            The resource to serialize, usually a root one.
+
+        Returns
+        -------
+        str
+            The text of the query, that can be parsed to get the same resource back (with
+            named arguments using ``=``).
+
+        Raises
+        ------
+        dataql.serializers.exceptions.EncodeError
+            If a resource cannot be written as valid DataQL: a resource without filters (and so
+            without name), except for objects and lists in a list.
+
+        """
+
+        parts = []
+        # Resources still to write, with a flag telling if they are in a list, or strings to
+        # write as is (commas and closing brackets), in reverse order.
+        stack = [(resource, False)]
+
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+                continue
+
+            current, in_list = item
+
+            if not current.filters and not (in_list and isinstance(current, MultiResources)):
+                raise EncodeError(current, 'Only objects and lists in a list can be written '
+                                           'without filters')
+
+            # Names are not used in lists, and cannot be written.
+            if not in_list and current.name is not None and (
+                    not current.filters
+                    or not isinstance(current.filters[0], Filter)
+                    or current.filters[0].name != current.name):
+                parts.append('%s:' % current.name)
+
+            self.write_filters(parts, current.filters)
+
+            if isinstance(current, MultiResources):
+                if isinstance(current, List):
+                    parts.append('[')
+                    stack.append(']')
+                    if current.filters and len(current.resources) == 1 and (
+                            self.starts_with_index(current.resources[0])):
+                        # ``foo[0.5]`` would be an index: ``foo[0.5,]`` is a list.
+                        stack.append(',')
+                else:
+                    parts.append('{')
+                    stack.append('}')
+                sub_in_list = isinstance(current, List)
+                for index in range(len(current.resources) - 1, -1, -1):
+                    stack.append((current.resources[index], sub_in_list))
+                    if index:
+                        stack.append(',')
+
+        return ''.join(parts)
+
+    @staticmethod
+    def starts_with_index(resource):
+        """Tell if the first filter of the resource is an index, like ``0`` in ``0.name``."""
+        return bool(resource.filters) and isinstance(resource.filters[0], SliceFilter) and (
+            resource.filters[0].slice is None)
+
+    def write_filters(self, parts, filters):
+        """Append the texts of the given filters to ``parts``."""
+        for index, filter_ in enumerate(filters):
+            if isinstance(filter_, SliceFilter):
+                if filter_.slice is None and not index:
+                    # ``[0]`` alone in a list would be a list.
+                    parts.append(self.format_value(filter_.index))
+                else:
+                    parts.append(str(filter_))
+                continue
+
+            if index:
+                parts.append('.')
+            parts.append(filter_.name)
+            if filter_.args is not None:
+                parts.append('(%s)' % ','.join(self.format_arg(arg) for arg in filter_.args))
+
+    def format_arg(self, arg):
+        """Return the text of a named or positioned argument."""
+        if arg.is_named:
+            return '%s=%s' % (arg.arg, self.format_value(arg.value))
+        return self.format_value(arg.value)
+
+    @staticmethod
+    def format_value(value):
+        """Return the text of a value of an argument, or of an index."""
+        if value is None:
+            return 'null'
+        if value is True:
+            return 'true'
+        if value is False:
+            return 'false'
+        if isinstance(value, str):
+            return '"%s"' % value.replace('\\', '\\\\').replace('"', '\\"')
+        if isinstance(value, Variable):
+            return '$%s' % value.name
+        return repr(value)
+
+
+def to_text(resource):
+    """Render resources as the text of a query with a ``TextSerializer``. See ``serialize``."""
+    return TextSerializer().serialize(resource)
@@ -1,6 +1,7 @@
 """``exceptions`` module of ``dataql.solvers``.
 
-It holds all the exception that may be raised by this module.
+It holds all the exception that may be raised by this module, and ``DECLINED``, to be returned
+by solvers instead of raising ``CannotSolve``.
 
 """
 
@@ -15,12 +16,14 @@ __all__ = (
     'AttributeNotFound',
     'CallableError',
     'CannotSolve',
+    'DECLINED',
     'InvalidSource',
     'NotIterable',
     'NotSolvable',
     'SolveFailure',
     'SolverNotFound',
     'SourceNotFound',
+    'VariableNotFound',
 )
 
 
@@ -34,10 +37,35 @@ class SolverObjectException(SolversException, metaclass=ABCMeta):
     pass
 
 
+class Declined:
+    """Class of ``DECLINED``, to be returned by a solver not able to solve a resource or filter.
+
+    Like raising a ``CannotSolve`` exception, it lets the registry try the next solver, but
+    without the cost of an exception.
+
+    Example
+    -------
+
+    >>> DECLINED
+    DECLINED
+
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'DECLINED'
+
+
+DECLINED = Declined()
+
+
 class CannotSolve(SolverObjectException):
     """Exception raised when a solver accepts to solve a resource but is not able to do it.
 
-    This exception string exposes the name and class of the solver and the resource.
+    This exception string exposes the name and class of the solver and the resource. It's only
+    computed when needed, as this exception is usually caught by the registry, to try the next
+    solver. Returning ``DECLINED`` instead of raising this exception is faster.
 
     Attributes
     ---------
@@ -54,7 +82,7 @@ class CannotSolve(SolverObjectException):
         self.solver = solver
         self.resource = resource
         self.value = value
-        super().__init__(str(self))
+        super().__init__(solver, resource, value)
 
     def __str__(self):
         return 'Solver `%s` was not able to solve resource `%s`.' % (
@@ -63,6 +91,46 @@ class CannotSolve(SolverObjectException):
         )
 
 
+class FilterSolverException(SolverObjectException, metaclass=ABCMeta):
+    """Base for exceptions raised by a ``FilterSolver`` object."""
+    pass
+
+
+class VariableNotFound(FilterSolverException, KeyError):
+    """Exception raised when no value was given for a variable used in a filter.
+
+    The exception string exposes the name of the variable and the filter using it.
+
+    Attributes
+    ----------
+    name : str
+        The name of the variable without value.
+    filter_ : dataql.resources.Filter
+        The filter having an argument using this variable.
+
+    Example
+    -------
+
+    >>> from dataql.resources import Filter, PosArg, Variable
+    >>> filter_ = Filter('foo', args=[PosArg(Variable('bar'))])
+    >>> raise VariableNotFound('bar', filter_)  # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    dataql...VariableNotFound: The `$bar` variable used in `.foo($bar)` is not defined
+
+    """
+
+    def __init__(self, name, filter_):
+        self.name = name
+        self.filter_ = filter_
+        super().__init__(str(self))
+
+    def __str__(self):
+        return 'The `$%s` variable used in `%s` is not defined' % (
+            self.name,
+            self.filter_,
+        )
+
+
 class AttributeSolverException(SolverObjectException, metaclass=ABCMeta):
     """Base for exceptions raised by a ``AttributeSolver`` object."""
     pass
@@ -13,6 +13,7 @@ When we talk about "filters", we talk about subclasses of ``dataql.resources.Bas
 from abc import abstractmethod, ABCMeta
 
 from dataql.resources import Filter, SliceFilter
+from dataql.solvers.exceptions import VariableNotFound
 
 
 class Solver(metaclass=ABCMeta):
@@ -71,7 +72,7 @@ class Solver(metaclass=ABCMeta):
         return '<%s>' % self.__class__.__name__
 
     @abstractmethod
-    def solve(self, value, filter_):
+    def solve(self, value, filter_, variables=None):
         """Solve a filter with a value.
 
         Arguments
@@ -80,16 +81,20 @@ class Solver(metaclass=ABCMeta):
             A value to solve in combination with the given filter.
         filter_ : dataql.resource.BaseFilter
             An instance of a subclass of ``BaseFilter`` to solve with the given value.
+        variables : dict, optional
+            The values of the variables that may be used by the filter, by name.
 
         Returns
         -------
         (depends on the implementation of the ``solve`` method)
+        It can be ``dataql.solvers.exceptions.DECLINED`` if a solver accepts to solve a filter
+        but cannot finally solve it, to let ``Registry.solve_filter`` use the next available
+        solver.
 
         Raises
         ------
         CannotSolve
-            If a solver accepts to solve a filter but cannot finally solve it.
-            Allows ``Registry.solve_filter`` to use the next available solver.
+            Same as returning ``DECLINED``, but slower.
 
         Notes
         -----
@@ -150,7 +155,7 @@ class FilterSolver(Solver):
 
     solvable_filters = (Filter, )
 
-    def solve(self, value, filter_):
+    def solve(self, value, filter_, variables=None):
         """Returns the value of an attribute of the value, or the result of a call to a function.
 
         Arguments
@@ -159,6 +164,8 @@ class FilterSolver(Solver):
             A value to solve in combination with the given filter.
         filter_ : dataql.resource.Filter
             An instance of ``Filter`` to solve with the given value.
+        variables : dict, optional
+            The values to use for the arguments of the filter that are variables, by name.
 
         Returns
         -------
@@ -179,10 +186,23 @@ class FilterSolver(Solver):
         >>> from dataql.resources import PosArg
         >>> solver.solve(date(2015, 6, 1), Filter(name='strftime', args=[PosArg('%F')]))
         '2015-06-01'
+        >>> from dataql.resources import Variable
+        >>> filter_ = Filter(name='strftime', args=[PosArg(Variable('format'))])
+        >>> solver.solve(date(2015, 6, 1), filter_, {'format': '%F'})
+        '2015-06-01'
+        >>> solver.solve(date(2015, 6, 1), filter_) # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql...VariableNotFound: The `$format` variable used in `.strftime($format)`...
+        >>> from dataql.resources import freeze
+        >>> solver.solve(date(2015, 6, 1), freeze(Filter(name='strftime', args=[PosArg('%F')])))
+        '2015-06-01'
 
         """
 
-        args, kwargs = filter_.get_args_and_kwargs()
+        try:
+            args, kwargs = filter_.get_call_args(variables)
+        except KeyError as ex:
+            raise VariableNotFound(ex.args[0], filter_)
         source = self.registry[value]
         return source.solve(value, filter_.name, args, kwargs)
 
@@ -206,7 +226,7 @@ class SliceSolver(Solver):
 
     solvable_filters = (SliceFilter, )
 
-    def solve(self, value, filter_):
+    def solve(self, value, filter_, variables=None):
         """Get slice or entry defined by an index from the given value.
 
         Arguments
@@ -215,6 +235,8 @@ class SliceSolver(Solver):
             A value to solve in combination with the given filter.
         filter_ : dataql.resource.SliceFilter
             An instance of ``SliceFilter``to solve with the given value.
+        variables : dict, optional
+            Not used: slices cannot use variables.
 
         Example
         -------
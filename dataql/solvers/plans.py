@@ -0,0 +1,393 @@
+"""``plans`` module of ``dataql.solvers``.
+
+It provides the ``Plan`` class, returned by ``Registry.compile``: a resource compiled once to be
+solved many times, for many values, without finding again, for each resource and filter of the
+tree and each entry of each list, the solver to use and the arguments of the filters.
+
+A plan is made of steps, one for each resource and filter, each one bound at compile time to
+the solver(s) to use. Steps give the same results, and raise the same exceptions, as
+``Registry.solve_resource`` and ``Registry.solve_filter``. When a solver or the registry changes
+the default behavior (by overriding their ``solve`` methods), the step simply calls them.
+
+"""
+
+from abc import abstractmethod, ABCMeta
+from collections import Iterable
+
+from dataql.solvers.exceptions import (
+    CannotSolve,
+    DECLINED,
+    NotIterable,
+    SolveFailure,
+    VariableNotFound,
+)
+from dataql.utils import get_extra
+
+
+class Plan:
+    """A resource compiled by a registry, to be solved many times.
+
+    Plans hold no state about the values they solve, so they can be used by many threads at the
+    same time. As sources are got from the registry when solving, sources registered after the
+    creation of a plan are used by the plan.
+
+    Attributes
+    ----------
+    registry : dataql.solvers.registry.Registry
+        The registry that compiled the resource.
+    resource : dataql.resources.Resource
+        The compiled resource. It must not be modified after the compilation.
+    step : Step
+        The step to solve the resource.
+
+    Example
+    -------
+
+    >>> from datetime import date
+    >>> from dataql.resources import Field, Filter, List, PosArg
+    >>> from dataql.solvers.registry import Registry
+    >>> registry = Registry()
+    >>> registry.register(date, ['day', 'strftime'])
+    >>> plan = registry.compile(List(None, resources=[
+    ...     Field('day'),
+    ...     Field('date', filters=[Filter('strftime', args=[PosArg('%F')])]),
+    ... ]))
+    >>> plan
+    <Plan List>
+    >>> plan.solve([date(2015, 6, 1), date(2015, 6, 2)])
+    [[1, '2015-06-01'], [2, '2015-06-02']]
+
+    """
+
+    __slots__ = (
+        'registry',
+        'resource',
+        'step',
+    )
+
+    def __init__(self, registry, resource, step):
+        """Save attributes.
+
+        Arguments
+        ---------
+        registry : dataql.solvers.registry.Registry
+        resource : dataql.resources.Resource
+        step : Step
+
+        """
+
+        self.registry = registry
+        self.resource = resource
+        self.step = step
+
+    def __repr__(self):
+        """String representation of a ``Plan`` instance.
+
+        Returns
+        -------
+        str
+            The string representation of the current ``Plan`` instance.
+
+        """
+
+        return '<%s %s%s>' % (
+            self.__class__.__name__,
+            self.resource.__class__.__name__,
+            '' if self.resource.name is None else '[%s]' % self.resource.name,
+        )
+
+    def solve(self, value, variables=None):
+        """Solve the compiled resource for the given value, like ``Registry.solve_resource``.
+
+        Arguments
+        ---------
+        value : ?
+            A value to be solved with the compiled resource.
+        variables : dict, optional
+            The values to use for the variables used as arguments of filters, by name.
+
+        Returns
+        -------
+        The solved result.
+
+        """
+
+        return self.step.solve(value, variables)
+
+
+class Step(metaclass=ABCMeta):
+    """Base class for the steps of a plan, to solve a resource or a filter.
+
+    Attributes
+    ----------
+    registry : dataql.solvers.registry.Registry
+        The registry that compiled the resource or filter.
+    obj : dataql.resources.Resource or dataql.resources.BaseFilter
+        The resource or filter solved by this step.
+    solvers : list
+        The solvers that can solve ``obj``, as returned by ``get_resource_solvers`` or
+        ``get_filter_solvers`` of the registry. The first one is used, and the next ones only
+        if it returns ``DECLINED`` or raises a ``CannotSolve`` exception, like in the registry.
+
+    """
+
+    __slots__ = (
+        'registry',
+        'obj',
+        'solvers',
+    )
+
+    def __init__(self, registry, obj, solvers):
+        """Save attributes.
+
+        Arguments
+        ---------
+        registry : dataql.solvers.registry.Registry
+        obj : dataql.resources.Resource or dataql.resources.BaseFilter
+        solvers : list
+
+        """
+
+        self.registry = registry
+        self.obj = obj
+        self.solvers = solvers
+
+    def solve(self, value, variables=None):
+        """Solve the resource or filter of the step for the given value.
+
+        Raises
+        ------
+        dataql.solvers.exceptions.SolveFailure
+            If no solvers were able to solve the resource or filter.
+
+        """
+
+        try:
+            result = self.run(value, variables)
+        except CannotSolve:
+            pass
+        else:
+            if result is not DECLINED:
+                return result
+
+        for solver in self.solvers[1:]:
+            try:
+                result = solver.solve(value, self.obj, *get_extra(variables))
+            except CannotSolve:
+                continue
+            if result is not DECLINED:
+                return result
+
+        raise SolveFailure(self.registry, self.obj, value)
+
+    @abstractmethod
+    def run(self, value, variables):
+        """Do the work of the first solver. Must be implemented in subclasses."""
+
+        raise NotImplementedError()
+
+
+class SolverStep(Step):
+    """A step that simply calls the ``solve`` method of the solver."""
+
+    __slots__ = ()
+
+    def run(self, value, variables):
+        """Call the ``solve`` method of the first solver."""
+
+        return self.solvers[0].solve(value, self.obj, *get_extra(variables))
+
+
+class RegistryStep(Step):
+    """A step that lets the registry do all the work.
+
+    Used when the registry itself changes how resources or filters are solved, or when no
+    solvers were found (so that the ``SolverNotFound`` exception is raised when solving).
+
+    """
+
+    __slots__ = (
+        'function',
+    )
+
+    def __init__(self, registry, obj, function):
+        """Save attributes, ``function`` being ``solve_resource`` or ``solve_filter``."""
+
+        super().__init__(registry, obj, [])
+        self.function = function
+
+    def solve(self, value, variables=None):
+        """Call the method of the registry."""
+
+        return self.function(value, self.obj, *get_extra(variables))
+
+    def run(self, value, variables):
+        """Not used, as ``solve`` is overridden."""
+
+        return self.solve(value, variables)
+
+
+class FilterStep(Step):
+    """A step to solve a ``Filter`` like ``FilterSolver``, with the arguments ready if possible.
+
+    Attributes
+    ----------
+    call_args : tuple or None
+        The positioned and named arguments of the filter, in containers that cannot be
+        modified (see ``Filter.compute_call_args``), or ``None`` if it uses variables.
+
+    """
+
+    __slots__ = (
+        'call_args',
+    )
+
+    def __init__(self, registry, obj, solvers):
+        """Save attributes and prepare the arguments of the filter."""
+
+        super().__init__(registry, obj, solvers)
+        # The filter is final, as the compiled resource must not be modified.
+        self.call_args = obj.call_args if obj.call_args is not None else obj.compute_call_args()
+
+    def run(self, value, variables):
+        """Get the source of the value and solve the filter with it."""
+
+        if self.call_args is None:
+            try:
+                args, kwargs = self.obj.get_args_and_kwargs(variables)
+            except KeyError as ex:
+                raise VariableNotFound(ex.args[0], self.obj)
+        else:
+            args, kwargs = self.call_args
+
+        return self.registry[value].solve(value, self.obj.name, args, kwargs)
+
+
+class SliceStep(Step):
+    """A step to solve a ``SliceFilter`` like ``SliceSolver``."""
+
+    __slots__ = (
+        'key',
+    )
+
+    def __init__(self, registry, obj, solvers):
+        """Save attributes and the key to use to get the entry or entries."""
+
+        super().__init__(registry, obj, solvers)
+        self.key = obj.slice or obj.index
+
+    def run(self, value, variables):
+        """Get the entry or entries of the value."""
+
+        try:
+            return value[self.key]
+        except IndexError:
+            return None
+
+
+class ResourceStep(Step):
+    """A step to solve a resource by applying its filters then coercing the result.
+
+    It's used for resource solvers not overriding ``solve`` and ``solve_value``.
+
+    Attributes
+    ----------
+    filters : list
+        The steps for the filters of the resource.
+
+    """
+
+    __slots__ = (
+        'filters',
+    )
+
+    def __init__(self, registry, obj, solvers, filters):
+        """Save attributes.
+
+        Arguments
+        ---------
+        registry : dataql.solvers.registry.Registry
+        obj : dataql.resources.Resource
+        solvers : list
+        filters : list
+
+        """
+
+        super().__init__(registry, obj, solvers)
+        self.filters = filters
+
+    def run(self, value, variables):
+        """Apply the filters one by one, then coerce the result."""
+
+        result = value
+        if result is not None:
+            for step in self.filters:
+                result = step.solve(result, variables)
+                if result is None:
+                    break
+
+        return self.coerce(result, variables)
+
+    def coerce(self, value, variables):
+        """Coerce the value with the first solver."""
+
+        return self.solvers[0].coerce(value, self.obj, *get_extra(variables))
+
+
+class ObjectStep(ResourceStep):
+    """A step to solve an ``Object`` like ``ObjectSolver``.
+
+    Attributes
+    ----------
+    resources : list
+        The name and step of each sub-resource.
+
+    """
+
+    __slots__ = (
+        'resources',
+    )
+
+    def __init__(self, registry, obj, solvers, filters, resources):
+        """Save attributes, ``resources`` being the list of steps of the sub-resources."""
+
+        super().__init__(registry, obj, solvers, filters)
+        self.resources = [(step.obj.name, step) for step in resources]
+
+    def coerce(self, value, variables):
+        """Get a dict with the solved sub-resources by name."""
+
+        return {name: step.solve(value, variables) for name, step in self.resources}
+
+
+class ListStep(ResourceStep):
+    """A step to solve a ``List`` like ``ListSolver``.
+
+    Attributes
+    ----------
+    resources : list
+        The step of each sub-resource.
+
+    """
+
+    __slots__ = (
+        'resources',
+    )
+
+    def __init__(self, registry, obj, solvers, filters, resources):
+        """Save attributes, ``resources`` being the list of steps of the sub-resources."""
+
+        super().__init__(registry, obj, solvers, filters)
+        self.resources = resources
+
+    def coerce(self, value, variables):
+        """Get a list with the solved sub-resources for each entry of the value."""
+
+        if not isinstance(value, Iterable):
+            raise NotIterable(self.obj, self.registry[value])
+
+        if len(self.resources) == 1:
+            solve = self.resources[0].solve
+            return [solve(entry, variables) for entry in value]
+
+        return [[step.solve(entry, variables) for step in self.resources] for entry in value]
@@ -27,20 +27,31 @@ from abc import ABCMeta
 from collections import Mapping
 from inspect import isclass, isfunction, ismethod
 
-from dataql.solvers.filters import FilterSolver, SliceSolver
-from dataql.solvers.resources import AttributeSolver, ObjectSolver, ListSolver
+from dataql.solvers.filters import FilterSolver, SliceSolver, Solver as BaseFilterSolver
+from dataql.solvers.plans import (
+    FilterStep,
+    ListStep,
+    ObjectStep,
+    Plan,
+    RegistryStep,
+    ResourceStep,
+    SliceStep,
+    SolverStep,
+)
+from dataql.solvers.resources import AttributeSolver, ObjectSolver, ListSolver, Solver
 from dataql.solvers.exceptions import (
     AlreadyRegistered,
     AttributeNotFound,
     CallableError,
     CannotSolve,
+    DECLINED,
     InvalidSource,
     NotSolvable,
     SolveFailure,
     SolverNotFound,
     SourceNotFound,
 )
-from dataql.utils import class_repr
+from dataql.utils import class_repr, get_extra
 
 
 class Attribute:
@@ -640,6 +651,14 @@ class Source:
     parent_sources : set
         If ``inherit_attributes`` is ``True``, this set will hold all the sources that are
         parent of the current one.
+    attributes_table : dict
+        The ``Attribute`` instances by name of this source and of its parent sources, the ones
+        of the source first, then the ones of the parent sources in the order of the MRO of the
+        source class. Built by ``build_attributes_table``.
+    attributes_fallback : Attributes
+        The first ``Attributes`` instance, in the same order, allowing all attributes, used for
+        names not in ``attributes_table`` (without adding them to it), or ``None`` if there is
+        none.
     Attributes : class (class attribute)
         The class to use as for ``Attributes`` (to store the available attributes). Default to
         ``dataql.solvers.registry.Attributes``.
@@ -719,6 +738,7 @@ class Source:
         self.propagate_attributes = propagate_attributes
         self.inherit_attributes = inherit_attributes
         self.parent_sources = parent_sources or set()
+        self.build_attributes_table()
 
     def __repr__(self):
         """String representation of a ``Source`` instance.
@@ -801,17 +821,14 @@ class Source:
                 not self.allow_class or value is not self.source):
             raise NotSolvable(self, value)
 
-        attr = None
-        if attribute in self.attributes:
-            attr = self.attributes[attribute]
-        else:
-            for parent_source in self.parent_sources:
-                if attribute in parent_source.attributes:
-                    attr = parent_source.attributes[attribute]
-                    break
-
-            if attr is None:
+        try:
+            attr = self.attributes_table[attribute]
+        except KeyError:
+            # Private attributes are never allowed by ``allow_all``.
+            if self.attributes_fallback is None or attribute.startswith('_'):
                 raise AttributeNotFound(attribute, self)
+            # Not added to the table, so its size stays bounded by the declared attributes.
+            attr = self.attributes_fallback[attribute]
 
         try:
             return attr.solve(value, args, kwargs)
@@ -819,6 +836,64 @@ class Source:
             # Raise an ``AttributeError`` with ``self`` as source.
             raise AttributeNotFound(attr, self)
 
+    def build_attributes_table(self):
+        """Merge the attributes of the source and of its parent sources in one table.
+
+        Must be called when ``parent_sources`` changes (it's done by ``Registry.register``).
+
+        The attributes of the source come first, then the ones of the parent sources, in the
+        order of the MRO of the source class. When one of them allows all attributes, the public
+        attributes of the next ones are not used, as it's the one providing them.
+
+        Example
+        -------
+
+        >>> class Base1:
+        ...     pass
+        >>> class Base2:
+        ...     pass
+        >>> class Child(Base1, Base2):
+        ...     pass
+        >>> parents = {
+        ...     Source(Base2, [('foo', lambda value: 2), 'bar', '_baz']),
+        ...     Source(Base1, [('foo', lambda value: 1)]),
+        ... }
+        >>> s = Source(Child, ['qux'], parent_sources=parents)
+        >>> sorted(s.attributes_table), s.attributes_fallback
+        (['_baz', 'bar', 'foo', 'qux'], None)
+        >>> s.solve(Child(), 'foo')
+        1
+        >>> parents = {Source(Base2, ['bar', '_baz']), Source(Base1)}
+        >>> s = Source(Child, ['qux'], parent_sources=parents)
+        >>> sorted(s.attributes_table), s.attributes_fallback
+        (['_baz', 'qux'], <Attributes(allow all)>)
+
+        Attributes allowed by the fallback are not added to the table:
+
+        >>> Child.quux = 3
+        >>> s.solve(Child(), 'quux'), sorted(s.attributes_table)
+        (3, ['_baz', 'qux'])
+
+        """
+
+        mro = {klass: index for index, klass in enumerate(self.source.__mro__)}
+        parent_sources = sorted(
+            self.parent_sources,
+            key=lambda parent_source: mro.get(parent_source.source, len(mro))
+        )
+
+        table = {}
+        fallback = None
+        for source in [self] + parent_sources:
+            for name, attr in source.attributes.items():
+                if fallback is None or name.startswith('_'):
+                    table.setdefault(name, attr)
+            if fallback is None and source.attributes.allow_all:
+                fallback = source.attributes
+
+        self.attributes_table = table
+        self.attributes_fallback = fallback
+
 
 class Registry(Mapping):
     """Registry of allowed classes with their allowed attributes.
@@ -839,22 +914,35 @@ class Registry(Mapping):
     resource_solver_classes : tuple (class attribute)
         List of resource solver classes to use for solving a (value, resource) couple. The order
         is important because the first one that returns ``True`` to a call to its ``can_solve``
-        class method will be used (but if it then raise a ``CannotSolve`` exception during it
-        solve, the next solver will be used).
+        class method will be used (but if it then returns ``DECLINED`` or raise a
+        ``CannotSolve`` exception during it solve, the next solver will be used).
     filter_solver_classes : tuple (class attribute)
         List of filter solver classes to use for solving a (value, filter) couple. The order
         is important because the first one that returns ``True`` to a call to its ``can_solve``
-        class method will be used (but if it then raise a ``CannotSolve`` exception during it
-        solve, the next solver will be used).
+        class method will be used (but if it then returns ``DECLINED`` or raise a
+        ``CannotSolve`` exception during it solve, the next solver will be used).
     _resource_solvers_cache : dict
         To cache instances of resource solver classes. Each solver class only take the registry as
         argument, so one instance can be used for every value to solve.
     _filter_solvers_cache : dict
         To cache instances of filter solver classes. Each solver class only take the registry as
         argument, so one instance can be used for every value to solve.
+    _resource_solvers_by_class : dict
+        To cache, by class of resource, the list of resource solvers returned by
+        ``get_resource_solvers``. ``None`` if a solver class overrides ``can_solve``, that may
+        then depend on the resource itself and not only on its class.
+    _filter_solvers_by_class : dict
+        Same as ``_resource_solvers_by_class`` for filter solvers.
+    _sources_cache : dict
+        To cache, by class, the ``Source`` instance found by ``__getitem__`` for classes not
+        registered themselves (or ``None`` if none was found), to avoid going through their
+        ancestors each time. Entries that may change are removed by ``register``.
     Source : class (class attribute)
         The class to use as for ``Source`` (to store each registered source). Default to
         ``dataql.solvers.registry.Source``.
+    Plan : class (class attribute)
+        The class to use for plans returned by ``compile``. Default to
+        ``dataql.solvers.plans.Plan``.
 
     Example
     -------
@@ -877,6 +965,7 @@ class Registry(Mapping):
     filter_solver_classes = (FilterSolver, SliceSolver)
 
     Source = Source
+    Plan = Plan
 
     def __init__(self):
         """Init the attributes."""
@@ -884,6 +973,17 @@ class Registry(Mapping):
         self.sources = {}
         self._resource_solvers_cache = {}
         self._filter_solvers_cache = {}
+        self._sources_cache = {}
+
+        # Solvers are found by class only if they don't override ``can_solve``.
+        self._resource_solvers_by_class = {} if all(
+            solver_class.can_solve.__func__ is Solver.can_solve.__func__
+            for solver_class in self.resource_solver_classes
+        ) else None
+        self._filter_solvers_by_class = {} if all(
+            solver_class.can_solve.__func__ is BaseFilterSolver.can_solve.__func__
+            for solver_class in self.filter_solver_classes
+        ) else None
 
     def __repr__(self):
         """String representation of a ``Registry`` instance.
@@ -962,6 +1062,34 @@ class Registry(Mapping):
         >>> registry[date].solve(date, 'today') == date.today()
         True
 
+        Attributes are propagated to subclasses already registered, even when registered in
+        reverse order, except to the ones not inheriting attributes:
+
+        >>> from datetime import datetime
+        >>> registry = Registry()
+        >>> registry.register(datetime, ['hour'])
+        >>> registry.register(date, ['day'])
+        >>> registry[datetime].solve(datetime(2015, 6, 1, 12), 'day')
+        1
+        >>> class Parent:
+        ...     a, b, c = 1, 2, 3
+        >>> class Child(Parent):
+        ...     pass
+        >>> class GrandChild(Child):
+        ...     pass
+        >>> registry = Registry()
+        >>> registry.register(GrandChild, ['c'])
+        >>> registry.register(Child, ['b'])
+        >>> registry.register(Parent, ['a'])
+        >>> [registry[GrandChild].solve(GrandChild(), name) for name in 'abc']
+        [1, 2, 3]
+        >>> registry = Registry()
+        >>> registry.register(Child, ['b'], inherit_attributes=False)
+        >>> registry.register(Parent, ['a'])
+        >>> registry[Child].solve(Child(), 'a') # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql.solvers.exceptions.AttributeNotFound: `a` is not an allowed attribute for `...Child`
+
         """
 
         if source in self.sources:
@@ -985,7 +1113,12 @@ class Registry(Mapping):
             for src in self.sources.values():
                 if src.source != source and src.inherit_attributes\
                         and issubclass(src.source, source):
-                    src.parent_source.add(self.sources[source])
+                    src.parent_sources.add(self.sources[source])
+                    src.build_attributes_table()
+
+        # The new source may now be used for subclasses: forget what was found for them.
+        for klass in [klass for klass in self._sources_cache if issubclass(klass, source)]:
+            del self._sources_cache[klass]
 
     def __getitem__(self, source):
         """Get the ``Source`` instance for the given source class.
@@ -1026,6 +1159,24 @@ class Registry(Mapping):
         Traceback (most recent call last):
         dataql.solvers.exceptions.SourceNotFound: The `datetime.datetime` source is not...
 
+        The source found for a class not registered itself, or the lack of one, is cached, until
+        a parent class is registered:
+
+        >>> registry = Registry()
+        >>> registry[datetime] # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql.solvers.exceptions.SourceNotFound: The `datetime.datetime` source is not...
+        >>> registry._sources_cache
+        {<class 'datetime.datetime'>: None}
+        >>> registry.register(date, ['year', 'month', 'day'])
+        >>> registry._sources_cache
+        {}
+        >>> registry[datetime]
+        <Source 'datetime.date'>
+        >>> registry.register(datetime, ['timestamp'])
+        >>> registry[datetime]
+        <Source 'datetime.datetime'>
+
         """
 
         # Get the class if the source is an instance.
@@ -1033,22 +1184,35 @@ class Registry(Mapping):
             source = source.__class__
 
         # Best case: we have the source itself, so we return it.
-        if source in self.sources:
+        try:
             return self.sources[source]
+        except KeyError:
+            pass
 
-        # We don't have the source, we try to get one of its ancestors (only ancestors that
-        # allow subclasses)
-        for klass in source.mro()[1:]:  # "1:" to avoid using the source main class
-            try:
-                result = self.sources[klass]
-            except KeyError:
-                continue
-            else:
-                if result.allow_subclasses:
-                    return result
+        try:
+            result = self._sources_cache[source]
+        except KeyError:
+            # We don't have the source, we try to get one of its ancestors (only ancestors that
+            # allow subclasses)
+            result = None
+            for klass in source.mro()[1:]:  # "1:" to avoid using the source main class
+                try:
+                    parent = self.sources[klass]
+                except KeyError:
+                    continue
+                else:
+                    if parent.allow_subclasses:
+                        result = parent
+                        break
 
-        # Not found, return the default error of a ``__getitem__`` method.
-        raise SourceNotFound(self, source)
+            # Cached even if not found, to fail fast the next time.
+            self._sources_cache[source] = result
+
+        if result is None:
+            # Not found, return the default error of a ``__getitem__`` method.
+            raise SourceNotFound(self, source)
+
+        return result
 
     def __iter__(self):
         """Iterate over the sources in this registry.
@@ -1113,7 +1277,8 @@ class Registry(Mapping):
         Returns
         -------
         list
-            The list of resource solvers instances that can solve the given resource.
+            The list of resource solvers instances that can solve the given resource. It's
+            the same list for all resources of the same class, so it must not be modified.
 
         Raises
         ------
@@ -1135,12 +1300,15 @@ class Registry(Mapping):
 
         """
 
-        solvers_classes = [s for s in self.resource_solver_classes if s.can_solve(resource)]
+        by_class = self._resource_solvers_by_class
+        solvers = None if by_class is None else by_class.get(resource.__class__)
 
-        if solvers_classes:
+        if solvers is None:
             solvers = []
 
-            for solver_class in solvers_classes:
+            for solver_class in self.resource_solver_classes:
+                if not solver_class.can_solve(resource):
+                    continue
 
                 # Put the solver instance in the cache if not cached yet.
                 if solver_class not in self._resource_solvers_cache:
@@ -1148,6 +1316,10 @@ class Registry(Mapping):
 
                 solvers.append(self._resource_solvers_cache[solver_class])
 
+            if by_class is not None:
+                by_class[resource.__class__] = solvers
+
+        if solvers:
             return solvers
 
         raise SolverNotFound(self, resource)
@@ -1164,7 +1336,8 @@ class Registry(Mapping):
         Returns
         -------
         list
-            The list of filter solvers instances that can solve the given resource.
+            The list of filter solvers instances that can solve the given resource. It's
+            the same list for all filters of the same class, so it must not be modified.
 
         Raises
         ------
@@ -1184,12 +1357,15 @@ class Registry(Mapping):
 
         """
 
-        solvers_classes = [s for s in self.filter_solver_classes if s.can_solve(filter_)]
+        by_class = self._filter_solvers_by_class
+        solvers = None if by_class is None else by_class.get(filter_.__class__)
 
-        if solvers_classes:
+        if solvers is None:
             solvers = []
 
-            for solver_class in solvers_classes:
+            for solver_class in self.filter_solver_classes:
+                if not solver_class.can_solve(filter_):
+                    continue
 
                 # Put the solver instance in the cache if not cached yet.
                 if solver_class not in self._filter_solvers_cache:
@@ -1197,16 +1373,20 @@ class Registry(Mapping):
 
                 solvers.append(self._filter_solvers_cache[solver_class])
 
+            if by_class is not None:
+                by_class[filter_.__class__] = solvers
+
+        if solvers:
             return solvers
 
         raise SolverNotFound(self, filter_)
 
-    def solve_resource(self, value, resource):
+    def solve_resource(self, value, resource, variables=None):
         """Solve the given resource for the given value.
 
         The solving is done by the first resource solver class that returns ``True`` when calling
-        its ``can_solve`` method for the given resource, and that doesn't raise a ``CannotSolve``
-         exception.
+        its ``can_solve`` method for the given resource, and that doesn't return ``DECLINED`` (or
+        raise a ``CannotSolve`` exception).
 
         Arguments
         ---------
@@ -1214,6 +1394,9 @@ class Registry(Mapping):
             A value to be solved with the given resource.
         resource : dataql.resources.Resource
             An instance of a subclass of ``Resource`` to be solved with the given value.
+        variables : dict, optional
+            The values to use for the variables used as arguments of filters, by name. This
+            allows to solve many times a resource with different arguments.
 
         Returns
         -------
@@ -1224,7 +1407,7 @@ class Registry(Mapping):
         dataql.solvers.exceptions.SolveFailure
             If no solvers were able to solve the resource. This happen if a solver says that
             it can solve a resource (by returning ``True`` when calling its ``can_solve`` method,
-            but raises a ``CannotSolve`` exception during solving).
+            but returns ``DECLINED`` or raises a ``CannotSolve`` exception during solving).
 
         Example
         -------
@@ -1285,6 +1468,19 @@ class Registry(Mapping):
         ... ))
         [{'date': '2015-06-02'}, {'date': '2015-06-03'}]
 
+        # With variables
+        >>> from dataql.resources import Variable
+        >>> resource = List('dates',
+        ...     filters=[Filter('dates'), SliceFilter(slice(1, None, None))],
+        ...     resources=[Field('date', filters=[
+        ...         Filter('strftime', args=[PosArg(Variable('f'))])
+        ...     ])]
+        ... )
+        >>> registry.solve_resource(obj, resource, {'f': '%F'})
+        ['2015-06-02', '2015-06-03']
+        >>> registry.solve_resource(obj, resource, {'f': '%d/%m'})
+        ['02/06', '03/06']
+
         # List of list
         >>> pprint(registry.solve_resource(
         ...     obj,
@@ -1317,6 +1513,22 @@ class Registry(Mapping):
         dataql...AttributeNotFound: `qux` is not an allowed attribute for `...MyDict`
 
 
+        # A solver can decline to solve a resource, to let the next one solve it.
+        >>> from dataql.solvers.exceptions import DECLINED
+        >>> class DecliningSolver(AttributeSolver):
+        ...     def solve(self, value, resource, variables=None):
+        ...         return DECLINED
+        >>> class MyRegistry(Registry):
+        ...     resource_solver_classes = (DecliningSolver, AttributeSolver)
+        >>> my_registry = MyRegistry()
+        >>> my_registry.register(date, ['day'])
+        >>> my_registry.get_resource_solvers(Field('day'))
+        [<DecliningSolver>, <AttributeSolver>]
+        >>> my_registry.solve_resource(date(2015, 6, 1), Field('day'))
+        1
+        >>> my_registry.compile(Field('day')).solve(date(2015, 6, 1))
+        1
+
         # Example of ``SolveFailure`` exception.
         >>> from dataql.solvers.exceptions import CannotSolve
         >>> raise SolveFailure(registry, Field('fromtimestamp'), date)
@@ -1325,20 +1537,23 @@ class Registry(Mapping):
 
         """
 
+        extra = get_extra(variables)
         for solver in self.get_resource_solvers(resource):
             try:
-                return solver.solve(value, resource)
+                result = solver.solve(value, resource, *extra)
             except CannotSolve:
                 continue
+            if result is not DECLINED:
+                return result
 
         raise SolveFailure(self, resource, value)
 
-    def solve_filter(self, value, filter_):
+    def solve_filter(self, value, filter_, variables=None):
         """Solve the given filter for the given value.
 
         The solving is done by the first filter solver class that returns ``True`` when calling
-        its ``can_solve`` method for the given filter, and that doesn't raise a ``CannotSolve``
-         exception.
+        its ``can_solve`` method for the given filter, and that doesn't return ``DECLINED`` (or
+        raise a ``CannotSolve`` exception).
 
         Arguments
         ---------
@@ -1347,6 +1562,8 @@ class Registry(Mapping):
         filter_ : dataql.resources.BaseFilter
             An instance of a subclass of ``dataql.resources.BaseFilter`` to be solved
             with the given value.
+        variables : dict, optional
+            The values to use for the variables used as arguments of the filter, by name.
 
         Returns
         -------
@@ -1357,7 +1574,7 @@ class Registry(Mapping):
         dataql.solvers.exceptions.SolveFailure
             If no solvers were able to solve the filter. This happen if a solver says that
             it can solve a filter (by returning ``True`` when calling its ``can_solve`` method,
-            but raises a ``CannotSolve`` exception during solving).
+            but returns ``DECLINED`` or raises a ``CannotSolve`` exception during solving).
 
         Example
         -------
@@ -1378,10 +1595,139 @@ class Registry(Mapping):
 
         """
 
+        extra = get_extra(variables)
         for solver in self.get_filter_solvers(filter_):
             try:
-                return solver.solve(value, filter_)
+                result = solver.solve(value, filter_, *extra)
             except CannotSolve:
                 continue
+            if result is not DECLINED:
+                return result
 
         raise SolveFailure(self, filter_, value)
+
+    def compile(self, resource):
+        """Compile the given resource into a plan, to solve it many times.
+
+        The solvers to use for each resource and filter, the arguments of the filters (if they
+        don't use variables), and the names of the sub-resources of objects, are found once, so
+        solving the resource with the plan is faster than with ``solve_resource``, especially
+        for lists. But the results, and the exceptions, are the same.
+
+        Arguments
+        ---------
+        resource : dataql.resources.Resource
+            An instance of a subclass of ``Resource`` to compile. It must not be modified
+            after the compilation.
+
+        Returns
+        -------
+        dataql.solvers.plans.Plan
+            The plan, with a ``solve(value, variables=None)`` method.
+
+        Example
+        -------
+
+        >>> from datetime import date
+        >>> registry = Registry()
+        >>> registry.register(date, ['day', 'month', 'strftime'])
+        >>> from dataql.resources import *
+        >>> from dataql.resources import SliceFilter
+        >>> obj = EntryPoints(registry,
+        ...     dates = [date(2015, 6, 1), date(2015, 6, 2)],
+        ... )
+        >>> plan = registry.compile(Object(None, resources=[
+        ...     List('dates', resources=[Object(None, resources=[
+        ...         Field('day'),
+        ...         Field('date', filters=[Filter('strftime', args=[PosArg(Variable('f'))])]),
+        ...     ])]),
+        ...     Field('first', filters=[Filter('dates'), SliceFilter(0), Filter('month')]),
+        ... ]))
+        >>> from pprint import pprint  # will sort the dicts by keys
+        >>> pprint(plan.solve(obj, {'f': '%F'}))
+        {'dates': [{'date': '2015-06-01', 'day': 1}, {'date': '2015-06-02', 'day': 2}],
+         'first': 6}
+        >>> plan.solve(obj) # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql...VariableNotFound: The `$f` variable used in `.strftime($f)` is not defined
+        >>> registry.compile(Field('year')).solve(date(2015, 6, 1))  # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        dataql...AttributeNotFound: `year` is not an allowed attribute for `datetime.date`
+
+        """
+
+        return self.Plan(self, resource, self.compile_resource(resource))
+
+    def compile_resource(self, resource):
+        """Return the step of a plan to solve the given resource. See ``compile``.
+
+        Arguments
+        ---------
+        resource : dataql.resources.Resource
+            An instance of a subclass of ``Resource`` to compile, with its sub-resources.
+
+        Returns
+        -------
+        dataql.solvers.plans.Step
+            The step to solve the resource.
+
+        """
+
+        if type(self).solve_resource is not Registry.solve_resource:
+            return RegistryStep(self, resource, self.solve_resource)
+
+        try:
+            solvers = self.get_resource_solvers(resource)
+        except SolverNotFound:
+            # Will be raised when solving, like with ``solve_resource``.
+            return RegistryStep(self, resource, self.solve_resource)
+
+        solver_class = type(solvers[0])
+        if solver_class.solve is not Solver.solve \
+                or solver_class.solve_value is not Solver.solve_value:
+            return SolverStep(self, resource, solvers)
+
+        filters = [self.compile_filter(filter_) for filter_ in resource.filters]
+
+        if solver_class.coerce is ObjectSolver.coerce:
+            return ObjectStep(self, resource, solvers, filters, [
+                self.compile_resource(sub_resource) for sub_resource in resource.resources
+            ])
+
+        if solver_class.coerce is ListSolver.coerce:
+            return ListStep(self, resource, solvers, filters, [
+                self.compile_resource(sub_resource) for sub_resource in resource.resources
+            ])
+
+        return ResourceStep(self, resource, solvers, filters)
+
+    def compile_filter(self, filter_):
+        """Return the step of a plan to solve the given filter. See ``compile``.
+
+        Arguments
+        ---------
+        filter_ : dataql.resources.BaseFilter
+            An instance of a subclass of ``dataql.resources.BaseFilter`` to compile.
+
+        Returns
+        -------
+        dataql.solvers.plans.Step
+            The step to solve the filter.
+
+        """
+
+        if type(self).solve_filter is not Registry.solve_filter:
+            return RegistryStep(self, filter_, self.solve_filter)
+
+        try:
+            solvers = self.get_filter_solvers(filter_)
+        except SolverNotFound:
+            # Will be raised when solving, like with ``solve_filter``.
+            return RegistryStep(self, filter_, self.solve_filter)
+
+        solver_class = type(solvers[0])
+        if solver_class.solve is FilterSolver.solve:
+            return FilterStep(self, filter_, solvers)
+        if solver_class.solve is SliceSolver.solve:
+            return SliceStep(self, filter_, solvers)
+        return SolverStep(self, filter_, solvers)
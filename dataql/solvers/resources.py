@@ -15,7 +15,8 @@ from abc import abstractmethod, ABCMeta
 from collections import Iterable
 
 from dataql.resources import Field, List, Object
-from dataql.solvers.exceptions import NotIterable
+from dataql.solvers.exceptions import DECLINED, NotIterable
+from dataql.utils import get_extra
 
 
 class Solver(metaclass=ABCMeta):
@@ -77,7 +78,7 @@ class Solver(metaclass=ABCMeta):
 
         return '<%s>' % self.__class__.__name__
 
-    def solve(self, value, resource):
+    def solve(self, value, resource, variables=None):
         """Solve a resource with a value.
 
         Arguments
@@ -88,28 +89,49 @@ class Solver(metaclass=ABCMeta):
             filter).
         resource : dataql.resources.Resource
             An instance of a subclass of ``Resource`` to solve with the given value.
+        variables : dict, optional
+            The values of the variables that may be used by the filters, by name.
 
         Returns
         -------
         (depends on the implementation of the ``coerce`` method)
+        It can be ``dataql.solvers.exceptions.DECLINED`` if a solver accepts to solve a resource
+        but cannot finally solve it, to let ``Registry.solve_resource`` use the next available
+        solver.
 
         Raises
         ------
         CannotSolve
-            If a solver accepts to solve a resource but cannot finally solve it.
-            Allows ``Registry.solve_resource`` to use the next available solver.
+            Same as returning ``DECLINED``, but slower.
 
         Notes
         -----
-        This method simply calls ``solve_value``, then ``coerce`` with the result.
+        This method simply calls ``solve_value``, then ``coerce`` with the result (except if
+        ``solve_value`` returns ``DECLINED``).
         To change the behavior, simply override at least one of these two methods.
+        ``variables`` is only passed to them if defined, so they may not expect it.
+
+        Example
+        -------
+
+        >>> from dataql.solvers.registry import Registry
+        >>> registry = Registry()
+        >>> from datetime import date
+        >>> registry.register(date, ['day'])
+        >>> class MySolver(Solver):
+        ...     def coerce(self, value, resource): return 'coerced %s' % value
+        >>> MySolver(registry).solve(date(2015, 6, 1), Field('day'))
+        'coerced 1'
 
         """
 
-        result = self.solve_value(value, resource)
-        return self.coerce(result, resource)
+        extra = get_extra(variables)
+        result = self.solve_value(value, resource, *extra)
+        if result is DECLINED:
+            return result
+        return self.coerce(result, resource, *extra)
 
-    def solve_value(self, value, resource):
+    def solve_value(self, value, resource, variables=None):
         """Solve a resource with a value, without coercing.
 
         Arguments
@@ -120,6 +142,8 @@ class Solver(metaclass=ABCMeta):
             filter).
         resource : dataql.resources.Resource
             An instance of a subclass of ``Resource`` to solve with the given value.
+        variables : dict, optional
+            The values of the variables that may be used by the filters, by name.
 
         Returns
         -------
@@ -184,15 +208,16 @@ class Solver(metaclass=ABCMeta):
 
         # Apply filters one by one on the previous result.
         if result is not None:
+            extra = get_extra(variables)
             for filter_ in resource.filters:
-                result = self.registry.solve_filter(result, filter_)
+                result = self.registry.solve_filter(result, filter_, *extra)
                 if result is None:
                     break
 
         return result
 
     @abstractmethod
-    def coerce(self, value, resource):
+    def coerce(self, value, resource, variables=None):
         """Convert the value got after ``solve_value``.
 
         Must be implemented in subclasses.
@@ -258,7 +283,7 @@ class AttributeSolver(Solver):
 
     solvable_resources = (Field,)
 
-    def coerce(self, value, resource):
+    def coerce(self, value, resource, variables=None):
         """Coerce the value to an acceptable one.
 
         Only these kinds of values are returned as is:
@@ -278,6 +303,8 @@ class AttributeSolver(Solver):
             The value to be coerced.
         resource : dataql.resources.Resource
             The ``Resource`` object used to obtain this value from the original one.
+        variables : dict, optional
+            Not used: a field has no sub-resources.
 
         Returns
         -------
@@ -379,7 +406,7 @@ class ObjectSolver(Solver):
 
     solvable_resources = (Object,)
 
-    def coerce(self, value, resource):
+    def coerce(self, value, resource, variables=None):
         """Get a dict with attributes from ``value``.
 
         Arguments
@@ -388,6 +415,8 @@ class ObjectSolver(Solver):
             The value to get some resources from.
         resource : dataql.resources.Object
             The ``Object`` object used to obtain this value from the original one.
+        variables : dict, optional
+            The values of the variables that may be used by the sub-resources, by name.
 
         Returns
         -------
@@ -397,7 +426,8 @@ class ObjectSolver(Solver):
 
         """
 
-        return {r.name: self.registry.solve_resource(value, r) for r in resource.resources}
+        extra = get_extra(variables)
+        return {r.name: self.registry.solve_resource(value, r, *extra) for r in resource.resources}
 
 
 class ListSolver(Solver):
@@ -466,7 +496,7 @@ class ListSolver(Solver):
 
     solvable_resources = (List,)
 
-    def coerce(self, value, resource):
+    def coerce(self, value, resource, variables=None):
         """Convert a list of objects in a list of dicts.
 
         Arguments
@@ -475,6 +505,8 @@ class ListSolver(Solver):
             The list (or other iterable) to get values to get some resources from.
         resource : dataql.resources.List
             The ``List`` object used to obtain this value from the original one.
+        variables : dict, optional
+            The values of the variables that may be used by the sub-resources, by name.
 
         Returns
         -------
@@ -495,15 +527,17 @@ class ListSolver(Solver):
         if not isinstance(value, Iterable):
             raise NotIterable(resource, self.registry[value])
 
+        extra = get_extra(variables)
+
         # Case #1: we only have one sub-resource, so we return a list with this item for
         # each iteration
         if len(resource.resources) == 1:
             res = resource.resources[0]
-            return [self.registry.solve_resource(v, res) for v in value]
+            return [self.registry.solve_resource(v, res, *extra) for v in value]
 
         # Case #2: we have many sub-resources, we return a list with, for each iteration, a
         # list with all entries
         return [
-            [self.registry.solve_resource(v, res) for res in resource.resources]
+            [self.registry.solve_resource(v, res, *extra) for res in resource.resources]
             for v in value
         ]
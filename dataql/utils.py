@@ -29,3 +29,28 @@ def class_repr(value):
     if not isinstance(value, type):
         klass = klass.__class__
     return '.'.join([klass.__module__, klass.__name__])
+
+
+def get_extra(variables):
+    """Return the arguments to add to calls of solvers and registries for the given variables.
+
+    ``variables`` is only passed if defined, for solvers and registries not expecting it.
+
+    Arguments
+    ---------
+    variables : dict or None
+        The values of the variables, if any.
+
+    Returns
+    -------
+    tuple
+        Empty if ``variables`` is ``None``, else a tuple with ``variables`` as only entry.
+
+    Example
+    -------
+    >>> get_extra(None)
+    ()
+    >>> get_extra({'foo': 1})
+    ({'foo': 1},)
+    """
+    return () if variables is None else (variables, )